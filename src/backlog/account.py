@@ -0,0 +1,76 @@
+from typing import Awaitable, Callable
+from cache.async_cache import AsyncCache
+from cache.error import MissingCacheEntryError
+from steamid.custom_id_resolver import CustomIDResolver
+from steamid.steamid import SteamID
+from steamlib.get_owned_games import iter_owned_games
+from steamlib.owned_games import OwnedGames
+from .index import BacklogIndex
+from .sync import OwnedGamesSync, owned_games_cache_key
+
+# Resolves a Steam ID and loads its owned games. A loader may return a
+# BacklogIndex it keeps up to date instead, so the games are not indexed again
+# for every pick.
+OwnedGamesLoader = Callable[
+    [SteamID, str, CustomIDResolver | None],
+    Awaitable[tuple[str, OwnedGames | BacklogIndex]],
+]
+
+
+async def load_owned_games(
+    steam_id: SteamID,
+    steam_api_key: str,
+    resolver: CustomIDResolver | None = None,
+) -> tuple[str, OwnedGames]:
+    """Resolves a Steam ID to a Steam ID 64 and retrieves the games owned by
+    that account.
+
+    Args:
+        steam_id (SteamID): The Steam ID to load owned games for.
+        steam_api_key (str): The Steam API key to use to retrieve owned games.
+        resolver (CustomIDResolver | None, optional): The resolver to resolve
+        custom names and custom URLs with. Defaults to None.
+
+    Raises:
+        InvalidCustomIDError: Raised if the custom id is not associated with a
+        steam profile.
+        AuthFailedError: Raised if the owned games could not be retrieved due
+        to an invalid Steam API key or a non-public profile.
+
+    Returns:
+        tuple[str, OwnedGames]: The Steam ID 64 and the games it owns.
+    """
+    steam_id_64 = await steam_id.to_steam_id_64(resolver)
+    owned_games = OwnedGames()
+    async for game in iter_owned_games(steam_id_64, steam_api_key):
+        owned_games.append(game)
+    return (steam_id_64, owned_games)
+
+
+def cached_owned_games_loader(cache: AsyncCache) -> OwnedGamesLoader:
+    """Creates a ``load_owned_games`` replacement that never downloads owned
+    games, reading the snapshots stored by ``OwnedGamesSync`` instead, however
+    old they are. Pair it with an offline ``CustomIDResolver`` to make no
+    requests at all.
+
+    Args:
+        cache (AsyncCache): The cache the snapshots are stored in.
+
+    Returns:
+        OwnedGamesLoader: The loader. It raises ``MissingCacheEntryError`` if
+        the account has no stored snapshot.
+    """
+    sync = OwnedGamesSync(cache)
+
+    async def load_cached_owned_games(
+        steam_id: SteamID,
+        steam_api_key: str,
+        resolver: CustomIDResolver | None = None,
+    ) -> tuple[str, OwnedGames]:
+        steam_id_64 = await steam_id.to_steam_id_64(resolver)
+        snapshot = await sync.snapshot(steam_id_64)
+        if snapshot is None:
+            raise MissingCacheEntryError(owned_games_cache_key(steam_id_64))
+        return (steam_id_64, snapshot[1])
+
+    return load_cached_owned_games
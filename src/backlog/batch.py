@@ -0,0 +1,272 @@
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    TextIO,
+    TypedDict,
+    TypeVar,
+)
+from cache.error import MissingCacheEntryError
+from steamid.custom_id_resolver import CustomIDResolver
+from steamid.resolve_custom_id import InvalidCustomIDError
+from steamid.steamid import SteamID
+from steamlib.error import AuthFailedError
+from steamlib.get_app_hover import AppHoverResponse
+from steamlib.get_owned_games import OwnedGame
+from .account import OwnedGamesLoader, load_owned_games
+from .index import BacklogIndex, Weight, uniform_weight
+import aiohttp
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Exit codes shared with the single account mode of main.py. An unexpected
+# error exits with 1, as an uncaught exception does.
+EXIT_OK = 0
+EXIT_UNEXPECTED_ERROR = 1
+EXIT_AUTH_FAILED = 2
+EXIT_INVALID_STEAM_ID = 3
+EXIT_REQUEST_FAILED = 4
+EXIT_NOT_CACHED = 5
+
+ResultT = TypeVar("ResultT")
+
+
+class BatchResult(TypedDict, total=False):
+    """The outcome of picking a game for one account in a batch. ``pick`` is
+    ``None`` when the account has no eligible games. ``error`` is only set when
+    ``exit_code`` is not ``EXIT_OK``. ``hover`` is only set by the service
+    when the store hover data for the pick was asked for.
+    """
+
+    steam_id: str
+    steam_id_64: str
+    exit_code: int
+    error: str
+    eligible: int
+    pick: OwnedGame | None
+    hover: AppHoverResponse | None
+
+
+def read_steam_ids(file: TextIO) -> list[str]:
+    """Reads one Steam ID per line, skipping blank lines and lines starting
+    with ``#``.
+
+    Args:
+        file (TextIO): The file to read from.
+
+    Returns:
+        list[str]: The Steam IDs, in order.
+    """
+    steam_ids: list[str] = []
+    for line in file:
+        steam_id = line.strip()
+        if steam_id and not steam_id.startswith("#"):
+            steam_ids.append(steam_id)
+    return steam_ids
+
+
+async def pick_for_account(
+    steam_id: str,
+    steam_api_key: str,
+    resolver: CustomIDResolver | None = None,
+    max_playtime: int = 60,
+    loader: OwnedGamesLoader = load_owned_games,
+    weight: Weight = uniform_weight,
+) -> BatchResult:
+    """Picks a random game with less than ``max_playtime`` minutes of playtime
+    for one account. Failures are reported in the result instead of raised.
+
+    Args:
+        steam_id (str): The Steam ID to pick a game for, in any supported
+        format.
+        steam_api_key (str): The Steam API key to use to retrieve owned games.
+        resolver (CustomIDResolver | None, optional): The resolver to resolve
+        custom names and custom URLs with. Defaults to None.
+        max_playtime (int, optional): The exclusive playtime threshold, in
+        minutes, for a game to be eligible. Defaults to 60.
+        loader (OwnedGamesLoader, optional): The function used to resolve the
+        Steam ID and retrieve its owned games. Defaults to
+        ``load_owned_games``.
+        weight (Weight, optional): The function weighing each eligible game.
+        Defaults to ``uniform_weight``.
+
+    Returns:
+        BatchResult: The pick, or the error that prevented one.
+    """
+    result: BatchResult = {"steam_id": steam_id}
+    try:
+        parsed_steam_id = SteamID(steam_id)
+    except ValueError:
+        return {**result, "exit_code": EXIT_INVALID_STEAM_ID, "error": "invalid_steam_id"}
+    try:
+        steam_id_64, loaded = await loader(parsed_steam_id, steam_api_key, resolver)
+    except InvalidCustomIDError:
+        return {**result, "exit_code": EXIT_INVALID_STEAM_ID, "error": "custom_id_not_found"}
+    except AuthFailedError:
+        return {**result, "exit_code": EXIT_AUTH_FAILED, "error": "auth_failed"}
+    except MissingCacheEntryError:
+        return {**result, "exit_code": EXIT_NOT_CACHED, "error": "not_cached"}
+    except (aiohttp.ClientError, ValueError):
+        return {**result, "exit_code": EXIT_REQUEST_FAILED, "error": "request_failed"}
+
+    index = loaded if isinstance(loaded, BacklogIndex) else BacklogIndex(loaded)
+    picks = index.sample(1, max_playtime, weight)
+    return {
+        **result,
+        "steam_id_64": steam_id_64,
+        "exit_code": EXIT_OK,
+        "eligible": index.count_below(max_playtime),
+        "pick": picks[0] if picks else None,
+    }
+
+
+def timed_out_result(steam_id: str) -> BatchResult:
+    """Makes the result reported for an account that was given up on.
+
+    Args:
+        steam_id (str): The Steam ID that timed out.
+
+    Returns:
+        BatchResult: The failed result.
+    """
+    return {"steam_id": steam_id, "exit_code": EXIT_REQUEST_FAILED, "error": "timeout"}
+
+
+def failed_result(steam_id: str, error: Exception) -> BatchResult:
+    """Makes the result reported for an account whose work raised an error
+    it does not report itself.
+
+    Args:
+        steam_id (str): The Steam ID that failed.
+        error (Exception): The error raised.
+
+    Returns:
+        BatchResult: The failed result.
+    """
+    return {
+        "steam_id": steam_id,
+        "exit_code": EXIT_UNEXPECTED_ERROR,
+        "error": "unexpected_error",
+    }
+
+
+async def run_for_each(
+    steam_ids: Iterable[str],
+    work: Callable[[str], Awaitable[ResultT]],
+    timed_out: Callable[[str], ResultT],
+    failed: Callable[[str, Exception], ResultT],
+    concurrency: int = 16,
+    timeout: float | None = None,
+) -> AsyncIterator[ResultT]:
+    """Runs ``work`` for each of many accounts, working on at most
+    ``concurrency`` accounts at a time. Results are yielded in the order they
+    complete, so a slow account only ever holds up its own result. ``work``
+    should report expected failures in its result. Any other error it raises
+    is logged and reported with ``failed``, so one account never stops the
+    rest.
+
+    Args:
+        steam_ids (Iterable[str]): The Steam IDs to work on. Consumed lazily.
+        work (Callable[[str], Awaitable[ResultT]]): The work to do for one
+        Steam ID.
+        timed_out (Callable[[str], ResultT]): Makes the result reported for a
+        Steam ID that was given up on, such as ``timed_out_result``.
+        failed (Callable[[str, Exception], ResultT]): Makes the result
+        reported for a Steam ID whose work raised, such as ``failed_result``.
+        concurrency (int, optional): The maximum number of accounts worked on
+        at once. Defaults to 16.
+        timeout (float | None, optional): The number of seconds after which an
+        account is given up on and reported with ``timed_out``. Defaults to
+        None.
+
+    Raises:
+        ValueError: Raised if ``concurrency`` is less than 1.
+
+    Yields:
+        ResultT: The result for each account.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    steam_id_iterator = iter(steam_ids)
+    pending: dict[asyncio.Task[ResultT], str] = {}
+
+    def fill() -> None:
+        while len(pending) < concurrency:
+            steam_id = next(steam_id_iterator, None)
+            if steam_id is None:
+                return
+            task = asyncio.create_task(asyncio.wait_for(work(steam_id), timeout))
+            pending[task] = steam_id
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            completed = [(pending.pop(task), task) for task in done]
+            fill()
+            for steam_id, task in completed:
+                try:
+                    result = task.result()
+                except asyncio.TimeoutError:
+                    result = timed_out(steam_id)
+                except Exception as e:
+                    logger.error("Working on %s failed", steam_id, exc_info=e)
+                    result = failed(steam_id, e)
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_batch(
+    steam_ids: Iterable[str],
+    steam_api_key: str,
+    resolver: CustomIDResolver | None = None,
+    concurrency: int = 16,
+    timeout: float | None = None,
+    max_playtime: int = 60,
+    loader: OwnedGamesLoader = load_owned_games,
+    weight: Weight = uniform_weight,
+) -> AsyncIterator[BatchResult]:
+    """Picks a game for each of many accounts, working on at most
+    ``concurrency`` accounts at a time. Results are yielded in the order they
+    complete, so a slow account only ever holds up its own result.
+
+    Args:
+        steam_ids (Iterable[str]): The Steam IDs to pick games for. Consumed
+        lazily.
+        steam_api_key (str): The Steam API key to use to retrieve owned games.
+        resolver (CustomIDResolver | None, optional): The resolver to resolve
+        custom names and custom URLs with. Defaults to None.
+        concurrency (int, optional): The maximum number of accounts worked on
+        at once. Defaults to 16.
+        timeout (float | None, optional): The number of seconds after which an
+        account is given up on and reported as failed. Defaults to None.
+        max_playtime (int, optional): The exclusive playtime threshold, in
+        minutes, for a game to be eligible. Defaults to 60.
+        loader (OwnedGamesLoader, optional): The function used to resolve each
+        Steam ID and retrieve its owned games. Defaults to
+        ``load_owned_games``.
+        weight (Weight, optional): The function weighing each eligible game.
+        Defaults to ``uniform_weight``.
+
+    Raises:
+        ValueError: Raised if ``concurrency`` is less than 1.
+
+    Yields:
+        BatchResult: The result for each account.
+    """
+
+    def pick(steam_id: str) -> Awaitable[BatchResult]:
+        return pick_for_account(
+            steam_id, steam_api_key, resolver, max_playtime, loader, weight
+        )
+
+    async for result in run_for_each(
+        steam_ids, pick, timed_out_result, failed_result, concurrency, timeout
+    ):
+        yield result
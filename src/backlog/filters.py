@@ -0,0 +1,210 @@
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from steamlib.cached_app_hover import CachedAppHover
+    from steamlib.get_app_hover import AppHoverResponse
+
+
+def normalize_token(token: str) -> str:
+    """Normalizes a genre or category name so matching ignores case and
+    surrounding whitespace."""
+    return token.strip().casefold()
+
+
+def genre_tokens(hover: "AppHoverResponse") -> list[str]:
+    """Gets the normalized genres listed in ``strGenres``, which separates
+    them with commas."""
+    return [
+        normalize_token(genre)
+        for genre in hover["strGenres"].split(",")
+        if genre.strip()
+    ]
+
+
+def category_tokens(hover: "AppHoverResponse") -> list[str]:
+    """Gets the normalized names of the categories in ``rgCategories``."""
+    return [
+        normalize_token(category["strDisplayName"])
+        for category in hover["rgCategories"]
+    ]
+
+
+def hover_filter(
+    genres: Iterable[str] = (),
+    categories: Iterable[str] = (),
+    min_score: int | None = None,
+) -> Callable[["AppHoverResponse"], bool]:
+    """Creates a check of one app's hover data against the same filters as
+    ``HoverIndex.matching``, for callers that see hover data one app at a time.
+
+    Args:
+        genres (Iterable[str], optional): Genres an app must all have.
+        Defaults to none.
+        categories (Iterable[str], optional): Categories an app must all have.
+        Defaults to none.
+        min_score (int | None, optional): The lowest ``nReviewScore`` an app
+        may have. Defaults to None.
+
+    Returns:
+        Callable[[AppHoverResponse], bool]: The check, which is True for hover
+        data matching every filter.
+    """
+    wanted_genres = {normalize_token(genre) for genre in genres}
+    wanted_categories = {normalize_token(category) for category in categories}
+
+    def matches(hover: "AppHoverResponse") -> bool:
+        if (
+            min_score is not None
+            and hover["ReviewSummary"]["nReviewScore"] < min_score
+        ):
+            return False
+        return wanted_genres.issubset(genre_tokens(hover)) and (
+            wanted_categories.issubset(category_tokens(hover))
+        )
+
+    return matches
+
+
+class HoverIndex:
+    """An inverted index over app hover data, answering multi-filter queries
+    with set intersections instead of parsing hover data again.
+
+    Every indexed app gets a slot, and each genre and category maps to a
+    bitset, held in an int, of the slots of the apps it applies to. Review
+    scores are kept sorted alongside their slots, so apps rated at least a
+    score are found with a binary search.
+    """
+
+    def __init__(self) -> None:
+        """Create a new, empty HoverIndex."""
+        self._slots: dict[int, int] = {}
+        self._appids = array("q")
+        self._tokens: list[tuple[list[str], list[str]]] = []
+        self._genres: dict[str, int] = {}
+        self._categories: dict[str, int] = {}
+        self._scores = array("q")
+        self._score_slots = array("q")
+        self._indexed = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, appid: object) -> bool:
+        return appid in self._slots
+
+    def add(self, appid: int, hover: "AppHoverResponse") -> None:
+        """Index an app's hover data, replacing any indexed before.
+
+        Args:
+            appid (int): The app id.
+            hover (AppHoverResponse): The app's hover data.
+        """
+        genres = genre_tokens(hover)
+        categories = category_tokens(hover)
+        score = hover["ReviewSummary"]["nReviewScore"]
+        slot = self._slots.get(appid)
+        if slot is None:
+            slot = len(self._appids)
+            self._slots[appid] = slot
+            self._appids.append(appid)
+            self._tokens.append((genres, categories))
+        else:
+            self._unlink(slot)
+            self._tokens[slot] = (genres, categories)
+        bit = 1 << slot
+        for genre in genres:
+            self._genres[genre] = self._genres.get(genre, 0) | bit
+        for category in categories:
+            self._categories[category] = self._categories.get(category, 0) | bit
+        position = bisect_left(self._scores, score)
+        self._scores.insert(position, score)
+        self._score_slots.insert(position, slot)
+        self._indexed |= bit
+
+    def genres(self) -> list[str]:
+        """Get every indexed genre, normalized, in order."""
+        return sorted(genre for genre, bits in self._genres.items() if bits)
+
+    def categories(self) -> list[str]:
+        """Get every indexed category, normalized, in order."""
+        return sorted(
+            category for category, bits in self._categories.items() if bits
+        )
+
+    def matching(
+        self,
+        genres: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        min_score: int | None = None,
+    ) -> set[int]:
+        """Find the indexed apps matching every filter.
+
+        Args:
+            genres (Iterable[str], optional): Genres an app must all have.
+            Defaults to none.
+            categories (Iterable[str], optional): Categories an app must all
+            have. Defaults to none.
+            min_score (int | None, optional): The lowest ``nReviewScore`` an
+            app may have. Defaults to None.
+
+        Returns:
+            set[int]: The appids of the matching apps.
+        """
+        bits = self._indexed
+        for genre in genres:
+            bits &= self._genres.get(normalize_token(genre), 0)
+        for category in categories:
+            bits &= self._categories.get(normalize_token(category), 0)
+        if min_score is not None and bits:
+            bits &= self._scored_at_least(min_score)
+        appids: set[int] = set()
+        # Walk the set bits a byte at a time, as shifting a bitset of
+        # thousands of apps once per match would be quadratic.
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        for offset, byte in enumerate(data):
+            while byte:
+                lowest = byte & -byte
+                appids.add(self._appids[offset * 8 + lowest.bit_length() - 1])
+                byte ^= lowest
+        return appids
+
+    def _scored_at_least(self, min_score: int) -> int:
+        """Get the bitset of the apps with an ``nReviewScore`` of at least
+        ``min_score``."""
+        bitmap = bytearray((len(self._appids) + 7) // 8)
+        for slot in self._score_slots[bisect_left(self._scores, min_score) :]:
+            bitmap[slot >> 3] |= 1 << (slot & 7)
+        return int.from_bytes(bitmap, "little")
+
+    def _unlink(self, slot: int) -> None:
+        """Remove the app in ``slot`` from every bitset and the scores."""
+        mask = ~(1 << slot)
+        genres, categories = self._tokens[slot]
+        for genre in genres:
+            self._genres[genre] &= mask
+        for category in categories:
+            self._categories[category] &= mask
+        position = self._score_slots.index(slot)
+        del self._score_slots[position]
+        del self._scores[position]
+
+
+async def index_hover(
+    index: HoverIndex, app_hover: "CachedAppHover", appids: Iterable[int]
+) -> None:
+    """Add the hover data of every appid not yet in ``index``, fetching it
+    with ``app_hover``. Appids whose hover data cannot be retrieved, or is not
+    cached when ``app_hover`` is offline, are left out, so they never match a
+    filter.
+
+    Args:
+        index (HoverIndex): The index to add to.
+        app_hover (CachedAppHover): The cached hover lookups to use.
+        appids (Iterable[int]): The appids to index.
+    """
+    missing = [appid for appid in appids if appid not in index]
+    async for appid, result in app_hover.get_many(missing):
+        if not isinstance(result, Exception):
+            index.add(appid, result)
@@ -0,0 +1,436 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Container, Iterator, Mapping
+from steamlib.owned_games import OwnedGame, OwnedGames, OwnedGamesView
+import random
+
+if TYPE_CHECKING:
+    from .sync import SnapshotDiff
+
+Weight = Callable[[OwnedGame], float]
+
+
+def uniform_weight(game: OwnedGame) -> float:
+    """Weighs every game equally."""
+    return 1.0
+
+
+def low_playtime_weight(game: OwnedGame) -> float:
+    """Favors games with less playtime. A game is weighed by the inverse of
+    its playtime in hours, plus one, so an unplayed game is twice as likely to
+    be picked as one played for an hour.
+    """
+    return 60 / (60 + game["playtime_forever"])
+
+
+def review_score_weight(scores: Mapping[int, int], default: int = 5) -> Weight:
+    """Creates a weight favoring games with a higher review score.
+
+    Args:
+        scores (Mapping[int, int]): The ``nReviewScore`` of each game by appid,
+        as reported in ``AppHoverResponse.ReviewSummary``.
+        default (int, optional): The score used for games missing from
+        ``scores``. Defaults to 5, a middling score.
+
+    Returns:
+        Weight: The weight function.
+    """
+
+    def weight(game: OwnedGame) -> float:
+        return max(scores.get(game["appid"], default), 0) + 1
+
+    return weight
+
+
+# The weights that can be chosen by name from the command line.
+weights: dict[str, Weight] = {
+    "uniform": uniform_weight,
+    "playtime": low_playtime_weight,
+}
+
+
+class FenwickTree:
+    """A Fenwick (binary indexed) tree of non-negative weights, supporting
+    weight updates and finding the position of a running total in O(log n).
+    """
+
+    def __init__(self, weights: list[float]) -> None:
+        """Create a new tree holding the given weights, in O(n).
+
+        Args:
+            weights (list[float]): The initial weights.
+        """
+        self._weights = list(weights)
+        tree = [0.0] + self._weights
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def weight(self, index: int) -> float:
+        """Get the weight at ``index``."""
+        return self._weights[index]
+
+    def total(self) -> float:
+        """Get the sum of every weight."""
+        return self.prefix_sum(len(self._weights))
+
+    def prefix_sum(self, count: int) -> float:
+        """Get the sum of the first ``count`` weights."""
+        tree = self._tree
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def append(self, weight: float) -> None:
+        """Add a weight after the last one, in O(log n)."""
+        position = len(self._weights) + 1
+        # The new node covers itself and the nodes just before it that its
+        # lowest set bit spans.
+        covered = self.prefix_sum(position - 1) - self.prefix_sum(
+            position - (position & -position)
+        )
+        self._weights.append(weight)
+        self._tree.append(covered + weight)
+
+    def copy(self) -> "FenwickTree":
+        """Get an independent copy of the tree, in O(n) without
+        rebuilding it."""
+        tree = FenwickTree([])
+        tree._weights = list(self._weights)
+        tree._tree = list(self._tree)
+        return tree
+
+    def set(self, index: int, weight: float) -> None:
+        """Change the weight at ``index``."""
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def find(self, target: float) -> int:
+        """Find the first index whose prefix sum, including itself, exceeds
+        ``target``. Indices with no weight are never returned unless every
+        weight is zero.
+
+        Args:
+            target (float): A running total, from 0 up to ``total()``.
+
+        Returns:
+            int: The index.
+        """
+        tree = self._tree
+        position = 0
+        step = 1 << (len(self._weights).bit_length() - 1) if self._weights else 0
+        while step:
+            next_position = position + step
+            if next_position < len(tree) and tree[next_position] <= target:
+                position = next_position
+                target -= tree[next_position]
+            step >>= 1
+        # Rounding after many updates can land on, or past, an index with no
+        # weight. Fall back to the nearest weighted index.
+        weights = self._weights
+        position = min(position, len(weights) - 1)
+        for candidate in range(position, -1, -1):
+            if weights[candidate] > 0:
+                return candidate
+        for candidate in range(position + 1, len(weights)):
+            if weights[candidate] > 0:
+                return candidate
+        return max(position, 0)
+
+
+class BacklogIndex:
+    """An index over an account's games, sorted by playtime, so any playtime
+    threshold is found with a binary search instead of a scan of the library.
+
+    Weighted picks use a ``FenwickTree`` over every game, with the games that
+    are not eligible weighing nothing. The tree for each playtime threshold
+    and weight is built once, kept up to date by ``apply``, and has the
+    weights of picked games restored after each ``sample``, so every pick
+    from a warm index costs O(log n). The trees of the
+    ``MAX_SAMPLERS`` most recently used thresholds and weights are kept.
+    """
+
+    MAX_SAMPLERS = 8
+
+    def __init__(self, games: OwnedGames) -> None:
+        """Create a new index over ``games``, in O(n log n). The index takes
+        ownership of ``games``: ``apply`` appends added games to it, and
+        removed games stay in it but are no longer indexed.
+
+        Args:
+            games (OwnedGames): The games to index.
+        """
+        playtimes = games.playtimes
+        self._games = games
+        # Games with the same playtime are kept in index order, so any game is
+        # found with a binary search.
+        self._order = array("q", sorted(range(len(games)), key=playtimes.__getitem__))
+        self._playtimes = array("q", (playtimes[i] for i in self._order))
+        self._positions = dict(zip(games.appids, range(len(games))))
+        self._samplers: OrderedDict[tuple[int, Weight], FenwickTree] = OrderedDict()
+
+    def apply(self, diff: "SnapshotDiff") -> None:
+        """Update the index with the changes from an ``OwnedGamesSync``
+        rather than rebuilding it. Each changed game costs O(log n) per kept
+        sampling tree, plus binary searches and an array shift in the sorted
+        order.
+
+        Args:
+            diff (SnapshotDiff): The changes to apply.
+        """
+        games = self._games
+        changed: list[int] = []
+        for game in diff["removed"]:
+            index = self._positions.pop(game["appid"], None)
+            if index is not None:
+                self._unlink(index)
+                changed.append(index)
+        for game in diff["playtime_changed"]:
+            index = self._positions.get(game["appid"])
+            if index is not None:
+                self._unlink(index)
+                games.set_playtime(index, game["playtime_forever"])
+                self._link(index)
+                changed.append(index)
+        for game in diff["added"]:
+            if game["appid"] not in self._positions:
+                games.append(game)
+                self._positions[game["appid"]] = len(games) - 1
+                self._link(len(games) - 1)
+                changed.append(len(games) - 1)
+        for key, tree in list(self._samplers.items()):
+            try:
+                self._update_sampler(tree, *key, changed)
+            except ValueError:
+                # A negative weight is reported by the next sample instead.
+                del self._samplers[key]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def count_below(self, minutes: int) -> int:
+        """Count the games with a ``playtime_forever`` below ``minutes``.
+
+        Args:
+            minutes (int): The exclusive playtime threshold.
+
+        Returns:
+            int: The number of matching games.
+        """
+        return bisect_left(self._playtimes, minutes)
+
+    def below(self, minutes: int) -> OwnedGamesView:
+        """Select the games with a ``playtime_forever`` below ``minutes``.
+
+        Args:
+            minutes (int): The exclusive playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games, from least to most
+            played.
+        """
+        return self.between(0, minutes)
+
+    def between(self, minimum: int, maximum: int) -> OwnedGamesView:
+        """Select the games with a ``playtime_forever`` of at least
+        ``minimum`` and below ``maximum``.
+
+        Args:
+            minimum (int): The inclusive lower playtime threshold.
+            maximum (int): The exclusive upper playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games, from least to most
+            played.
+        """
+        start = bisect_left(self._playtimes, minimum)
+        end = max(bisect_left(self._playtimes, maximum), start)
+        return OwnedGamesView(self._games, self._order[start:end])
+
+    def _position(self, index: int) -> int:
+        """Find where the game at ``index`` is, or belongs, in the sorted
+        order, with binary searches."""
+        playtime = self._games.playtimes[index]
+        return bisect_left(
+            self._order,
+            index,
+            bisect_left(self._playtimes, playtime),
+            bisect_right(self._playtimes, playtime),
+        )
+
+    def _link(self, index: int) -> None:
+        """Insert the game at ``index`` into the sorted order."""
+        position = self._position(index)
+        self._order.insert(position, index)
+        self._playtimes.insert(position, self._games.playtimes[index])
+
+    def _unlink(self, index: int) -> None:
+        """Remove the game at ``index`` from the sorted order."""
+        position = self._position(index)
+        del self._order[position]
+        del self._playtimes[position]
+
+    def _sampler(self, max_playtime: int, weight: Weight) -> FenwickTree:
+        """Get the sampling tree for a threshold and weight, building it in
+        O(n) if it is not kept.
+
+        Raises:
+            ValueError: Raised if a weight is negative.
+        """
+        key = (max_playtime, weight)
+        tree = self._samplers.get(key)
+        if tree is not None:
+            self._samplers.move_to_end(key)
+            return tree
+        game_weights = [0.0] * len(self._games)
+        for index in self._order[: self.count_below(max_playtime)]:
+            game_weights[index] = self._weigh(weight, index)
+        tree = FenwickTree(game_weights)
+        self._samplers[key] = tree
+        if len(self._samplers) > self.MAX_SAMPLERS:
+            self._samplers.popitem(last=False)
+        return tree
+
+    def _update_sampler(
+        self, tree: FenwickTree, max_playtime: int, weight: Weight, indices: list[int]
+    ) -> None:
+        """Update the weights of the games at ``indices`` in a sampling tree
+        after they changed.
+
+        Raises:
+            ValueError: Raised if a weight is negative.
+        """
+        while len(tree) < len(self._games):
+            tree.append(0.0)
+        for index in indices:
+            eligible = (
+                self._positions.get(self._games.appids[index]) == index
+                and self._games.playtimes[index] < max_playtime
+            )
+            tree.set(index, self._weigh(weight, index) if eligible else 0.0)
+
+    def _weigh(self, weight: Weight, index: int) -> float:
+        """Weigh the game at ``index``.
+
+        Raises:
+            ValueError: Raised if the weight is negative.
+        """
+        game_weight = float(weight(self._games[index]))
+        if game_weight < 0:
+            raise ValueError("weights must not be negative")
+        return game_weight
+
+    def _draw(
+        self, tree: FenwickTree, rng: random.Random | None
+    ) -> Iterator[int]:
+        """Draw indices from a tree without replacement, zeroing the weight
+        of each one drawn."""
+        uniform = rng.random if rng is not None else random.random
+        while True:
+            total = tree.total()
+            if total <= 0:
+                return
+            index = tree.find(uniform() * total)
+            if tree.weight(index) == 0:
+                return
+            tree.set(index, 0.0)
+            yield index
+
+    def sample(
+        self,
+        count: int,
+        max_playtime: int,
+        weight: Weight = uniform_weight,
+        rng: random.Random | None = None,
+        appids: Container[int] | None = None,
+    ) -> list[OwnedGame]:
+        """Pick up to ``count`` different games with a ``playtime_forever``
+        below ``max_playtime``, each with a probability proportional to its
+        ``weight``. Games with no weight are never picked.
+
+        Args:
+            count (int): The number of games to pick.
+            max_playtime (int): The exclusive playtime threshold, in minutes,
+            for a game to be eligible.
+            weight (Weight, optional): The function weighing each eligible
+            game. Defaults to ``uniform_weight``.
+            rng (random.Random | None, optional): The random number generator
+            to use. Defaults to the ``random`` module's.
+            appids (Container[int] | None, optional): If given, only games
+            with these appids are eligible, such as those matching a
+            ``HoverIndex`` query. Defaults to None.
+
+        Raises:
+            ValueError: Raised if a weight is negative.
+
+        Returns:
+            list[OwnedGame]: The picked games, in the order they were picked.
+            Fewer than ``count`` are returned if not enough games are
+            eligible.
+        """
+        if appids is not None:
+            return list(
+                islice(self.iter_picks(max_playtime, weight, rng, appids), count)
+            )
+        tree = self._sampler(max_playtime, weight)
+        picked = list(islice(self._draw(tree, rng), count))
+        picks = [self._games[index] for index in picked]
+        # Restore the kept tree for the next pick rather than rebuilding it.
+        for index in picked:
+            tree.set(index, self._weigh(weight, index))
+        return picks
+
+    def iter_picks(
+        self,
+        max_playtime: int,
+        weight: Weight = uniform_weight,
+        rng: random.Random | None = None,
+        appids: Container[int] | None = None,
+    ) -> Iterator[OwnedGame]:
+        """Lazily pick every game with a ``playtime_forever`` below
+        ``max_playtime``, without replacement, each pick with a probability
+        proportional to its ``weight``. The first ``count`` games yielded are
+        what ``sample`` would return, so callers can keep drawing until a game
+        passes checks that are too slow to run on every game up front.
+
+        Args:
+            max_playtime (int): The exclusive playtime threshold, in minutes,
+            for a game to be eligible.
+            weight (Weight, optional): The function weighing each eligible
+            game. Defaults to ``uniform_weight``.
+            rng (random.Random | None, optional): The random number generator
+            to use. Defaults to the ``random`` module's.
+            appids (Container[int] | None, optional): If given, only games
+            with these appids are eligible. Defaults to None.
+
+        Raises:
+            ValueError: Raised if a weight is negative.
+
+        Yields:
+            OwnedGame: The picked games, in the order they were picked. Games
+            with no weight are never yielded.
+        """
+        if appids is None:
+            # A copy, as the picks may be drawn lazily while others sample.
+            tree = self._sampler(max_playtime, weight).copy()
+            for index in self._draw(tree, rng):
+                yield self._games[index]
+            return
+        eligible = self.below(max_playtime).where_appid_in(appids)
+        tree = FenwickTree([self._weigh(weight, index) for index in eligible.indices])
+        for position in self._draw(tree, rng):
+            yield eligible[position]
@@ -0,0 +1,184 @@
+from typing import AsyncIterator, Callable, Container, Iterable
+from cache.error import MissingCacheEntryError
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.error import InvalidResponseError
+from steamlib.get_app_hover import AppHoverResponse
+from steamlib.get_owned_games import OwnedGame
+import aiohttp
+import asyncio
+
+# A checked candidate: its position in the pick order, the game, and whether
+# it passed. The end of the candidates is marked by a game of None.
+_Checked = tuple[int, OwnedGame | None, bool]
+
+
+class PickPipeline:
+    """Picks games that pass a check on their hover data, streaming candidates
+    through asyncio queues instead of fetching every game's hover data first.
+
+    A producer feeds candidates, in the order they would be picked, into a
+    bounded queue. ``concurrency`` workers fetch each candidate's hover data
+    through a ``CachedAppHover`` and check it. The consumer puts the checked
+    candidates back in order, yielding a pick as soon as every candidate
+    ahead of it is known to have failed, so the picks are the same as if
+    every candidate had been checked up front. Once enough games are picked,
+    the work still in flight is cancelled.
+
+    Hover data that cannot be retrieved, is not cached when the
+    ``CachedAppHover`` is offline, or whose lookup is cancelled elsewhere
+    counts as failing the check.
+    """
+
+    def __init__(
+        self,
+        app_hover: CachedAppHover,
+        check: Callable[[AppHoverResponse], bool],
+        concurrency: int = 8,
+        lookahead: int | None = None,
+    ) -> None:
+        """Create a new PickPipeline.
+
+        Args:
+            app_hover (CachedAppHover): The cached hover lookups to use.
+            check (Callable[[AppHoverResponse], bool]): The check a game's
+            hover data must pass, such as one made by ``hover_filter``.
+            concurrency (int, optional): The maximum number of hover lookups
+            in flight at once. Defaults to 8.
+            lookahead (int | None, optional): The maximum number of candidates
+            taken past the earliest one not yet checked, bounding the work
+            wasted when a pick is confirmed. Defaults to four times
+            ``concurrency``.
+
+        Raises:
+            ValueError: Raised if ``concurrency`` or ``lookahead`` is less
+            than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if lookahead is None:
+            lookahead = 4 * concurrency
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        self._app_hover = app_hover
+        self._check = check
+        self._concurrency = concurrency
+        self._lookahead = lookahead
+        self.fetched = 0
+        self.failed = 0
+
+    async def picks(
+        self,
+        candidates: Iterable[OwnedGame],
+        count: int = 1,
+        matched: Container[int] = frozenset(),
+    ) -> AsyncIterator[OwnedGame]:
+        """Pick up to ``count`` of the candidates passing the check, in
+        candidate order. ``fetched`` and ``failed`` count the hover lookups
+        that succeeded and failed.
+
+        Args:
+            candidates (Iterable[OwnedGame]): The games to pick from, in the
+            order they would be picked, such as from
+            ``BacklogIndex.iter_picks``. Consumed lazily.
+            count (int, optional): The number of games to pick. Defaults to 1.
+            matched (Container[int], optional): The appids already known to
+            pass the check, such as from ``HoverIndex.matching``, which are
+            picked without a lookup. Defaults to none.
+
+        Yields:
+            OwnedGame: Each pick, as soon as it is confirmed.
+        """
+        if count < 1:
+            return
+        queue: asyncio.Queue[tuple[int, OwnedGame]] = asyncio.Queue(self._concurrency)
+        checked: asyncio.Queue[_Checked | Exception] = asyncio.Queue()
+        window = asyncio.Semaphore(self._lookahead)
+        fetching: set[int] = set()
+        closing = False
+
+        async def produce() -> None:
+            position = 0
+            try:
+                for game in candidates:
+                    await window.acquire()
+                    if game["appid"] in matched:
+                        checked.put_nowait((position, game, True))
+                    else:
+                        await queue.put((position, game))
+                    position += 1
+            except Exception as e:
+                checked.put_nowait(e)
+                return
+            checked.put_nowait((position, None, False))
+
+        async def work() -> None:
+            try:
+                while True:
+                    position, game = await queue.get()
+                    try:
+                        passed = await self._fetch_and_check(game["appid"], fetching)
+                    except asyncio.CancelledError:
+                        # Lookups are shared through the CachedAppHover, so one
+                        # can be cancelled by another of its callers while this
+                        # worker is still needed.
+                        if closing:
+                            raise
+                        fetching.discard(game["appid"])
+                        self.failed += 1
+                        passed = False
+                    checked.put_nowait((position, game, passed))
+            except Exception as e:
+                checked.put_nowait(e)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(self._concurrency)]
+        buffered: dict[int, tuple[OwnedGame | None, bool]] = {}
+        next_position = 0
+        try:
+            while True:
+                item = await checked.get()
+                if isinstance(item, Exception):
+                    raise item
+                position, game, passed = item
+                buffered[position] = (game, passed)
+                while next_position in buffered:
+                    game, passed = buffered.pop(next_position)
+                    if game is None:
+                        return
+                    next_position += 1
+                    window.release()
+                    if passed:
+                        yield game
+                        count -= 1
+                        if count == 0:
+                            return
+        finally:
+            closing = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for appid in fetching:
+                self._app_hover.cancel(appid)
+
+    async def _fetch_and_check(self, appid: int, fetching: set[int]) -> bool:
+        """Fetch an app's hover data and check it, tracking the appid in
+        ``fetching`` until its lookup finishes. A cancelled lookup stays in
+        ``fetching``, so its request can be cancelled too.
+
+        Args:
+            appid (int): The app id to check.
+            fetching (set[int]): The appids with lookups in flight.
+
+        Returns:
+            bool: Whether the hover data was retrieved and passed the check.
+        """
+        fetching.add(appid)
+        try:
+            hover = await self._app_hover.get(appid)
+        except (InvalidResponseError, MissingCacheEntryError, aiohttp.ClientError):
+            fetching.discard(appid)
+            self.failed += 1
+            return False
+        fetching.discard(appid)
+        self.fetched += 1
+        return self._check(hover)
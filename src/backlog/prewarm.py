@@ -0,0 +1,176 @@
+from typing import AsyncIterator, Awaitable, Iterable, TypedDict
+from cache.async_cache import AsyncCache
+from steamid.custom_id_resolver import CustomIDResolver
+from steamid.resolve_custom_id import InvalidCustomIDError
+from steamid.steamid import SteamID
+from steamlib.cached_app_hover import CachedAppHover, app_hover_cache_key
+from steamlib.error import AuthFailedError
+from .batch import (
+    EXIT_AUTH_FAILED,
+    EXIT_INVALID_STEAM_ID,
+    EXIT_OK,
+    EXIT_REQUEST_FAILED,
+    EXIT_UNEXPECTED_ERROR,
+    run_for_each,
+)
+from .sync import OwnedGamesSync
+import aiohttp
+
+
+class PrewarmResult(TypedDict, total=False):
+    """The outcome of prewarming the cache for one account. ``games`` is the
+    number of owned games stored and ``added`` the number new since the last
+    sync. Of the games that could be picked, ``hover`` is the number whose
+    hover data is cached and ``hover_missing`` the number whose is not, such
+    as games without a store page. ``error`` is only set when ``exit_code`` is
+    not ``EXIT_OK``.
+    """
+
+    steam_id: str
+    steam_id_64: str
+    exit_code: int
+    error: str
+    games: int
+    added: int
+    hover: int
+    hover_missing: int
+
+
+async def prewarm_account(
+    steam_id: str,
+    steam_api_key: str,
+    resolver: CustomIDResolver,
+    sync: OwnedGamesSync,
+    cache: AsyncCache,
+    app_hover: CachedAppHover,
+    max_playtime: int | None = 60,
+) -> PrewarmResult:
+    """Stores everything an offline pick for one account needs in the cache:
+    the custom ID resolution, if any, a fresh owned games snapshot, and the
+    hover data of every game that could be picked. ``sync`` fetches it for
+    the added games, and any other game still missing it, such as one synced
+    by an online pick or whose fetch failed before, is fetched after. Failures
+    are reported in the result instead of raised.
+
+    Args:
+        steam_id (str): The Steam ID to prewarm, in any supported format.
+        steam_api_key (str): The Steam API key to use to retrieve owned games.
+        resolver (CustomIDResolver): The resolver to resolve custom names and
+        custom URLs with.
+        sync (OwnedGamesSync): The snapshot store to sync owned games into,
+        fetching hover data for the added games.
+        cache (AsyncCache): The cache hover data is stored in.
+        app_hover (CachedAppHover): The cached hover lookups to fetch missing
+        hover data with.
+        max_playtime (int | None, optional): Only games played for fewer than
+        this many minutes are counted in ``hover`` and ``hover_missing``. If
+        None, every game is. Defaults to 60.
+
+    Returns:
+        PrewarmResult: The counts of what was stored, or the error that
+        stopped it.
+    """
+    result: PrewarmResult = {"steam_id": steam_id}
+    try:
+        parsed_steam_id = SteamID(steam_id)
+    except ValueError:
+        return {**result, "exit_code": EXIT_INVALID_STEAM_ID, "error": "invalid_steam_id"}
+    try:
+        steam_id_64 = await parsed_steam_id.to_steam_id_64(resolver)
+        owned_games, diff = await sync.sync(steam_id_64, steam_api_key)
+        games = (
+            owned_games
+            if max_playtime is None
+            else owned_games.where_playtime_below(max_playtime)
+        )
+        cached = await cache.get_many(app_hover_cache_key(game["appid"]) for game in games)
+        # The added games were just fetched by ``sync``, so only the rest are
+        # fetched here.
+        added = {game["appid"] for game in diff["added"]}
+        missing = [
+            game["appid"]
+            for game in games
+            if app_hover_cache_key(game["appid"]) not in cached
+            and game["appid"] not in added
+        ]
+        fetched = 0
+        async for _, response in app_hover.get_many(missing):
+            if not isinstance(response, Exception):
+                fetched += 1
+    except InvalidCustomIDError:
+        return {**result, "exit_code": EXIT_INVALID_STEAM_ID, "error": "custom_id_not_found"}
+    except AuthFailedError:
+        return {**result, "exit_code": EXIT_AUTH_FAILED, "error": "auth_failed"}
+    except (aiohttp.ClientError, ValueError):
+        return {**result, "exit_code": EXIT_REQUEST_FAILED, "error": "request_failed"}
+
+    return {
+        **result,
+        "steam_id_64": steam_id_64,
+        "exit_code": EXIT_OK,
+        "games": len(owned_games),
+        "added": len(diff["added"]),
+        "hover": len(cached) + fetched,
+        "hover_missing": len(games) - len(cached) - fetched,
+    }
+
+
+async def run_prewarm(
+    steam_ids: Iterable[str],
+    steam_api_key: str,
+    cache: AsyncCache,
+    concurrency: int = 4,
+    timeout: float | None = None,
+    max_playtime: int | None = 60,
+) -> AsyncIterator[PrewarmResult]:
+    """Prewarms the cache for each of many accounts, working on at most
+    ``concurrency`` accounts at a time, so later picks for them can be made
+    offline. Results are yielded in the order they complete.
+
+    Args:
+        steam_ids (Iterable[str]): The Steam IDs to prewarm. Consumed lazily.
+        steam_api_key (str): The Steam API key to use to retrieve owned games.
+        cache (AsyncCache): The cache to store everything in.
+        concurrency (int, optional): The maximum number of accounts worked on
+        at once. Each fetches hover data with several requests in flight, so
+        this is lower than the batch default. Defaults to 4.
+        timeout (float | None, optional): The number of seconds after which an
+        account is given up on and reported as failed. Defaults to None.
+        max_playtime (int | None, optional): Hover data is only fetched for
+        added games played for fewer than this many minutes. If None, it is
+        fetched for every added game. Defaults to 60.
+
+    Raises:
+        ValueError: Raised if ``concurrency`` is less than 1.
+
+    Yields:
+        PrewarmResult: The result for each account.
+    """
+    resolver = CustomIDResolver(cache)
+    # Stale hover data is refreshed in the background rather than waited on,
+    # so every refresh is finished before the cache is handed back.
+    app_hover = CachedAppHover(cache)
+    sync = OwnedGamesSync(cache, app_hover, max_playtime)
+
+    def prewarm(steam_id: str) -> Awaitable[PrewarmResult]:
+        return prewarm_account(
+            steam_id, steam_api_key, resolver, sync, cache, app_hover, max_playtime
+        )
+
+    def timed_out(steam_id: str) -> PrewarmResult:
+        return {"steam_id": steam_id, "exit_code": EXIT_REQUEST_FAILED, "error": "timeout"}
+
+    def failed(steam_id: str, error: Exception) -> PrewarmResult:
+        return {
+            "steam_id": steam_id,
+            "exit_code": EXIT_UNEXPECTED_ERROR,
+            "error": "unexpected_error",
+        }
+
+    try:
+        async for result in run_for_each(
+            steam_ids, prewarm, timed_out, failed, concurrency, timeout
+        ):
+            yield result
+    finally:
+        await app_hover.wait_for_refreshes()
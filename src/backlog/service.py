@@ -0,0 +1,281 @@
+from collections import OrderedDict
+from functools import partial
+from typing import Callable
+from aiohttp import web
+from cache.async_cache import AsyncCache
+from cache.async_tiered_cache import AsyncTieredCache
+from cache.instrumented_cache import InstrumentedAsyncCache
+from metrics.exposition import format_prometheus
+from steamid.custom_id_resolver import CustomIDResolver
+from steamid.steamid import SteamID
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.error import InvalidResponseError
+from steamlib.session import create_session, shared_session
+from .batch import (
+    EXIT_AUTH_FAILED,
+    EXIT_INVALID_STEAM_ID,
+    EXIT_OK,
+    BatchResult,
+    pick_for_account,
+)
+from .index import BacklogIndex
+from .sync import OwnedGamesSync, decode_owned_games, owned_games_cache_key
+from time import time
+import aiohttp
+import asyncio
+
+# HTTP status returned for each exit code of a pick.
+exit_code_statuses = {
+    EXIT_OK: 200,
+    EXIT_AUTH_FAILED: 403,
+    EXIT_INVALID_STEAM_ID: 400,
+}
+
+
+class BacklogService:
+    """Serves backlog picks from a long-running process. Custom ID
+    resolutions, owned games and hover data are kept warm in memory and in the
+    given AsyncCache between requests, and every request shares one pooled
+    HTTP session.
+
+    Owned games are remembered for ``owned_games_ttl`` seconds, after which the
+    next pick for that account downloads them again. Each remembered account
+    keeps its ``BacklogIndex``, which is updated with the changes each sync
+    finds rather than rebuilt, and hover data is fetched in the background for
+    added games only.
+    """
+
+    def __init__(
+        self,
+        steam_api_key: str,
+        cache: AsyncCache,
+        owned_games_ttl: float = 10 * 60,
+        max_accounts: int = 1024,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        """Create a new BacklogService. ``start`` must be called before it
+        serves requests.
+
+        Args:
+            steam_api_key (str): The Steam API key to retrieve owned games with.
+            cache (AsyncCache): The persistent cache to keep data in between
+            runs. It is closed when the service is.
+            owned_games_ttl (float, optional): The number of seconds an
+            account's owned games are reused for. Defaults to 10 minutes.
+            max_accounts (int, optional): The number of accounts whose owned
+            games are kept decoded in memory. Defaults to 1024.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.time``.
+        """
+        self._steam_api_key = steam_api_key
+        self._cache = InstrumentedAsyncCache(AsyncTieredCache(cache), "tiered")
+        self._resolver = CustomIDResolver(self._cache)
+        self._app_hover = CachedAppHover(self._cache)
+        self._sync = OwnedGamesSync(self._cache, self._app_hover, background=True)
+        self._owned_games_ttl = owned_games_ttl
+        self._max_accounts = max_accounts
+        self._clock = clock
+        self._owned_games: OrderedDict[str, tuple[float, BacklogIndex]] = OrderedDict()
+        self._owned_games_in_flight: dict[str, asyncio.Task[BacklogIndex]] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        """Open the pooled HTTP session shared by every request."""
+        if self._session is None:
+            self._session = create_session()
+
+    async def close(self) -> None:
+        """Close the HTTP session and the cache."""
+        await self._sync.cancel_prefetches()
+        await self._app_hover.wait_for_refreshes()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        await self._cache.close()
+
+    async def load_owned_games(
+        self,
+        steam_id: SteamID,
+        steam_api_key: str,
+        resolver: CustomIDResolver | None = None,
+    ) -> tuple[str, BacklogIndex]:
+        """A ``load_owned_games`` replacement that serves owned games from
+        memory, then from the cache, before downloading them. Concurrent loads
+        of the same account share one download.
+
+        Args:
+            steam_id (SteamID): The Steam ID to load owned games for.
+            steam_api_key (str): The Steam API key to use to retrieve owned
+            games.
+            resolver (CustomIDResolver | None, optional): The resolver to
+            resolve custom names and custom URLs with. Defaults to None.
+
+        Returns:
+            tuple[str, BacklogIndex]: The Steam ID 64 and the index over the
+            games it owns.
+        """
+        steam_id_64 = await steam_id.to_steam_id_64(resolver)
+        remembered = self._owned_games.get(steam_id_64)
+        if remembered is not None and self._is_fresh(remembered[0]):
+            self._owned_games.move_to_end(steam_id_64)
+            return (steam_id_64, remembered[1])
+        task = self._owned_games_in_flight.get(steam_id_64)
+        if task is None:
+            task = asyncio.create_task(
+                self._load_owned_games(steam_id_64, steam_api_key)
+            )
+            self._owned_games_in_flight[steam_id_64] = task
+            task.add_done_callback(partial(self._on_load_done, steam_id_64))
+        return (steam_id_64, await asyncio.shield(task))
+
+    async def pick(
+        self, steam_id: str, max_playtime: int = 60, include_hover: bool = False
+    ) -> BatchResult:
+        """Pick a random backlog game for an account.
+
+        Args:
+            steam_id (str): The Steam ID to pick a game for, in any supported
+            format.
+            max_playtime (int, optional): The exclusive playtime threshold, in
+            minutes, for a game to be eligible. Defaults to 60.
+            include_hover (bool, optional): Whether to add the store hover
+            data for the picked game as ``hover``. Defaults to False.
+
+        Returns:
+            BatchResult: The pick, or the error that prevented one.
+        """
+        async with shared_session(self._session):
+            result = await pick_for_account(
+                steam_id,
+                self._steam_api_key,
+                self._resolver,
+                max_playtime,
+                loader=self.load_owned_games,
+            )
+            pick = result.get("pick")
+            if include_hover and pick is not None:
+                try:
+                    hover = await self._app_hover.get(pick["appid"])
+                except (InvalidResponseError, aiohttp.ClientError):
+                    hover = None
+                result["hover"] = hover
+        return result
+
+    def app(self) -> web.Application:
+        """Build the web application serving ``GET /pick``, ``GET /health``
+        and ``GET /metrics``. ``/pick`` takes ``steam_id``, and optionally
+        ``max_playtime`` and ``hover=1``, as query parameters. ``/metrics``
+        serves the recorded metrics in the Prometheus text format.
+
+        Returns:
+            web.Application: The web application.
+        """
+        app = web.Application()
+        app.router.add_get("/pick", self._handle_pick)
+        app.router.add_get("/health", self._handle_health)
+        app.router.add_get("/metrics", self._handle_metrics)
+        return app
+
+    async def _handle_pick(self, request: web.Request) -> web.Response:
+        steam_id = request.query.get("steam_id")
+        if not steam_id:
+            return web.json_response({"error": "steam_id is required"}, status=400)
+        try:
+            max_playtime = int(request.query.get("max_playtime", "60"))
+        except ValueError:
+            return web.json_response(
+                {"error": "max_playtime must be an integer"}, status=400
+            )
+        include_hover = request.query.get("hover") == "1"
+        result = await self.pick(steam_id, max_playtime, include_hover)
+        status = exit_code_statuses.get(result["exit_code"], 502)
+        return web.json_response(result, status=status)
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=format_prometheus(), content_type="text/plain", charset="utf-8"
+        )
+
+    def _is_fresh(self, updated: float) -> bool:
+        return self._clock() - updated <= self._owned_games_ttl
+
+    def _remember(self, steam_id_64: str, updated: float, index: BacklogIndex) -> None:
+        """Keep the index over an account's owned games in memory, forgetting
+        the least recently used account if there are too many.
+        """
+        self._owned_games[steam_id_64] = (updated, index)
+        self._owned_games.move_to_end(steam_id_64)
+        while len(self._owned_games) > self._max_accounts:
+            self._owned_games.popitem(last=False)
+
+    def _on_load_done(self, steam_id_64: str, task: asyncio.Task[BacklogIndex]) -> None:
+        if self._owned_games_in_flight.get(steam_id_64) is task:
+            del self._owned_games_in_flight[steam_id_64]
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_owned_games(
+        self, steam_id_64: str, steam_api_key: str
+    ) -> BacklogIndex:
+        """Read an account's owned games from the cache if they are fresh,
+        otherwise sync them. A remembered index is updated with the sync's
+        changes, as it was built from the snapshot the sync diffs against;
+        the service is the only writer of snapshots while it runs.
+
+        Args:
+            steam_id_64 (str): The Steam ID 64 of the account.
+            steam_api_key (str): The Steam API key to use to retrieve owned
+            games.
+
+        Returns:
+            BacklogIndex: The index over the games the account owns.
+        """
+        key = owned_games_cache_key(steam_id_64)
+        cache_entry = await self._cache.get(key)
+        if cache_entry is not None and self._is_fresh(cache_entry["updated"]):
+            index = BacklogIndex(decode_owned_games(cache_entry["value"]))
+            self._remember(steam_id_64, cache_entry["updated"], index)
+            return index
+        owned_games, diff = await self._sync.sync(steam_id_64, steam_api_key)
+        remembered = self._owned_games.get(steam_id_64)
+        if remembered is not None:
+            index = remembered[1]
+            index.apply(diff)
+        else:
+            index = BacklogIndex(owned_games)
+        self._remember(steam_id_64, self._clock(), index)
+        return index
+
+
+async def serve(
+    service: BacklogService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    unix_socket: str | None = None,
+) -> None:
+    """Serve backlog picks until cancelled, then close the service.
+
+    Args:
+        service (BacklogService): The service to serve.
+        host (str, optional): The host to listen on. Defaults to 127.0.0.1.
+        port (int, optional): The port to listen on. Defaults to 8080.
+        unix_socket (str | None, optional): A Unix socket path to listen on
+        instead of a TCP host and port. Defaults to None.
+    """
+    await service.start()
+    runner = web.AppRunner(service.app())
+    await runner.setup()
+    try:
+        site: web.BaseSite
+        if unix_socket is not None:
+            site = web.UnixSite(runner, unix_socket)
+        else:
+            site = web.TCPSite(runner, host, port)
+        await site.start()
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await service.close()
@@ -0,0 +1,216 @@
+from typing import TypedDict
+from cache.async_cache import AsyncCache
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.get_owned_games import OwnedGame, iter_owned_games
+from steamlib.owned_games import OwnedGames
+import asyncio
+import json
+
+
+class SnapshotDiff(TypedDict):
+    """The changes between two snapshots of an account's owned games.
+    ``playtime_changed`` holds the games with their new playtime.
+    """
+
+    added: list[OwnedGame]
+    removed: list[OwnedGame]
+    playtime_changed: list[OwnedGame]
+
+
+def owned_games_cache_key(steam_id_64: str) -> str:
+    """Formats the cache key an account's owned games snapshot is stored
+    under.
+
+    Args:
+        steam_id_64 (str): The Steam ID 64 of the account.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"owned_games:{steam_id_64}"
+
+
+def encode_owned_games(owned_games: OwnedGames) -> str:
+    """Encodes owned games compactly as a JSON array of
+    ``[appid, playtime_forever, name]`` rows.
+
+    Args:
+        owned_games (OwnedGames): The games to encode.
+
+    Returns:
+        str: The encoded games.
+    """
+    return json.dumps(
+        list(zip(owned_games.appids, owned_games.playtimes, owned_games.names)),
+        separators=(",", ":"),
+    )
+
+
+def decode_owned_games(value: str) -> OwnedGames:
+    """Decodes owned games encoded by ``encode_owned_games``.
+
+    Args:
+        value (str): The encoded games.
+
+    Returns:
+        OwnedGames: The decoded games.
+    """
+    return OwnedGames(
+        {"appid": appid, "playtime_forever": playtime_forever, "name": name}
+        for appid, playtime_forever, name in json.loads(value)
+    )
+
+
+def diff_owned_games(old: OwnedGames, new: OwnedGames) -> SnapshotDiff:
+    """Compare two snapshots of an account's owned games, by appid.
+
+    Args:
+        old (OwnedGames): The previous snapshot.
+        new (OwnedGames): The current snapshot.
+
+    Returns:
+        SnapshotDiff: The games added, removed, and played since ``old``.
+    """
+    old_playtimes = dict(zip(old.appids, old.playtimes))
+    diff: SnapshotDiff = {"added": [], "removed": [], "playtime_changed": []}
+    new_appids: set[int] = set()
+    for index, appid in enumerate(new.appids):
+        new_appids.add(appid)
+        old_playtime = old_playtimes.get(appid)
+        if old_playtime is None:
+            diff["added"].append(new[index])
+        elif old_playtime != new.playtimes[index]:
+            diff["playtime_changed"].append(new[index])
+    for index, appid in enumerate(old.appids):
+        if appid not in new_appids:
+            diff["removed"].append(old[index])
+    return diff
+
+
+def is_empty_diff(diff: SnapshotDiff) -> bool:
+    """Check whether a diff has no changes."""
+    return not (diff["added"] or diff["removed"] or diff["playtime_changed"])
+
+
+class OwnedGamesSync:
+    """Keeps a snapshot of each account's owned games in an AsyncCache. Every
+    sync downloads the current owned games, diffs them against the stored
+    snapshot and replaces it, so callers only have to process what changed.
+
+    If a ``CachedAppHover`` is given, hover data is fetched for added games
+    only, as every other game's was fetched by an earlier sync. With
+    ``background``, syncs return without waiting for it, so a first sync of a
+    large library is not held up by a request per game.
+    """
+
+    def __init__(
+        self,
+        cache: AsyncCache,
+        app_hover: CachedAppHover | None = None,
+        max_playtime: int | None = None,
+        background: bool = False,
+    ) -> None:
+        """Create a new OwnedGamesSync.
+
+        Args:
+            cache (AsyncCache): The cache to store snapshots in.
+            app_hover (CachedAppHover | None, optional): The hover data cache to
+            fetch added games into. Defaults to None.
+            max_playtime (int | None, optional): If given, hover data is only
+            fetched for added games played for fewer than this many minutes.
+            Defaults to None.
+            background (bool, optional): Whether to fetch hover data in the
+            background instead of waiting for it. ``wait_for_prefetches``
+            waits for it to finish. Defaults to False.
+        """
+        self._cache = cache
+        self._app_hover = app_hover
+        self._max_playtime = max_playtime
+        self._background = background
+        self._prefetches: set[asyncio.Task[None]] = set()
+
+    async def snapshot(self, steam_id_64: str) -> tuple[float, OwnedGames] | None:
+        """Get the stored snapshot of an account's owned games.
+
+        Args:
+            steam_id_64 (str): The Steam ID 64 of the account.
+
+        Returns:
+            tuple[float, OwnedGames] | None: The time the snapshot was taken
+            and its games, or None if the account has never been synced.
+        """
+        cache_entry = await self._cache.get(owned_games_cache_key(steam_id_64))
+        if cache_entry is None:
+            return None
+        return (cache_entry["updated"], decode_owned_games(cache_entry["value"]))
+
+    async def sync(
+        self, steam_id_64: str, steam_api_key: str
+    ) -> tuple[OwnedGames, SnapshotDiff]:
+        """Download an account's owned games and diff them against its stored
+        snapshot, which is then replaced. On the first sync, every game is
+        reported as added.
+
+        Args:
+            steam_id_64 (str): The Steam ID 64 of the account.
+            steam_api_key (str): The Steam API key to use to retrieve owned
+            games.
+
+        Raises:
+            AuthFailedError: Raised if the owned games could not be retrieved
+            due to an invalid Steam API key or a non-public profile.
+
+        Returns:
+            tuple[OwnedGames, SnapshotDiff]: The current owned games and the
+            changes since the stored snapshot.
+        """
+        previous = await self.snapshot(steam_id_64)
+        owned_games = OwnedGames()
+        async for game in iter_owned_games(steam_id_64, steam_api_key):
+            owned_games.append(game)
+        diff = diff_owned_games(
+            previous[1] if previous is not None else OwnedGames(), owned_games
+        )
+        await self._cache.set(
+            owned_games_cache_key(steam_id_64), encode_owned_games(owned_games)
+        )
+        if self._app_hover is not None:
+            appids = [
+                game["appid"]
+                for game in diff["added"]
+                if self._max_playtime is None
+                or game["playtime_forever"] < self._max_playtime
+            ]
+            if appids and self._background:
+                task = asyncio.create_task(self._prefetch(self._app_hover, appids))
+                self._prefetches.add(task)
+                task.add_done_callback(self._on_prefetch_done)
+            elif appids:
+                await self._prefetch(self._app_hover, appids)
+        return (owned_games, diff)
+
+    async def wait_for_prefetches(self) -> None:
+        """Wait for every background hover fetch currently running to
+        finish."""
+        while self._prefetches:
+            await asyncio.gather(*self._prefetches, return_exceptions=True)
+
+    async def cancel_prefetches(self) -> None:
+        """Cancel every background hover fetch currently running."""
+        for task in self._prefetches:
+            task.cancel()
+        await self.wait_for_prefetches()
+
+    async def _prefetch(self, app_hover: CachedAppHover, appids: list[int]) -> None:
+        """Fetch hover data for appids into the cache, ignoring the results."""
+        async for _ in app_hover.get_many(appids):
+            pass
+
+    def _on_prefetch_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished background fetch. Errors are retrieved here so
+        a failed fetch, which only leaves hover data uncached, is not reported
+        as an unhandled exception.
+        """
+        self._prefetches.discard(task)
+        if not task.cancelled():
+            task.exception()
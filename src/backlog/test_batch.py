@@ -0,0 +1,180 @@
+import unittest
+import asyncio
+import io
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from steamid.custom_id_resolver import CustomIDResolver
+from steamlib.error import AuthFailedError
+from steamlib.owned_games import OwnedGames
+from .account import cached_owned_games_loader
+from .batch import (
+    EXIT_AUTH_FAILED,
+    EXIT_INVALID_STEAM_ID,
+    EXIT_NOT_CACHED,
+    EXIT_OK,
+    EXIT_REQUEST_FAILED,
+    EXIT_UNEXPECTED_ERROR,
+    pick_for_account,
+    read_steam_ids,
+    run_batch,
+)
+from .sync import encode_owned_games, owned_games_cache_key
+
+games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+]
+
+
+class FakeIterOwnedGames:
+    def __init__(self, delays: dict[str, float] | None = None) -> None:
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, steam_id_64, steam_api_key, session=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(steam_id_64, 0))
+            if steam_id_64 == "76561197960287931":
+                raise AuthFailedError()
+            for game in games:
+                yield game
+        finally:
+            self.in_flight -= 1
+
+
+class TestReadSteamIDs(unittest.TestCase):
+    def test_skips_blank_and_comments(self):
+        file = io.StringIO("# accounts\n76561197960287930\n\n  STEAM_0:0:11101  \n")
+        self.assertEqual(read_steam_ids(file), ["76561197960287930", "STEAM_0:0:11101"])
+
+
+class TestPickForAccount(unittest.IsolatedAsyncioTestCase):
+    async def test_pick(self):
+        with patch("backlog.account.iter_owned_games", FakeIterOwnedGames()):
+            result = await pick_for_account("STEAM_0:0:11101", "key")
+        self.assertEqual(
+            result,
+            {
+                "steam_id": "STEAM_0:0:11101",
+                "steam_id_64": "76561197960287930",
+                "exit_code": EXIT_OK,
+                "eligible": 1,
+                "pick": games[0],
+            },
+        )
+
+    async def test_no_eligible(self):
+        with patch("backlog.account.iter_owned_games", FakeIterOwnedGames()):
+            result = await pick_for_account("76561197960287930", "key", max_playtime=0)
+        self.assertEqual(result["exit_code"], EXIT_OK)
+        self.assertEqual(result["eligible"], 0)
+        self.assertIs(result["pick"], None)
+
+    async def test_invalid_steam_id(self):
+        result = await pick_for_account("   ", "key")
+        self.assertEqual(result["exit_code"], EXIT_INVALID_STEAM_ID)
+
+    async def test_weight(self):
+        def weight(game):
+            return 0 if game["appid"] == 10 else 1
+
+        with patch("backlog.account.iter_owned_games", FakeIterOwnedGames()):
+            result = await pick_for_account(
+                "76561197960287930", "key", max_playtime=200, weight=weight
+            )
+        self.assertEqual(result["eligible"], 2)
+        self.assertEqual(result["pick"], games[1])
+
+    async def test_auth_failed(self):
+        with patch("backlog.account.iter_owned_games", FakeIterOwnedGames()):
+            result = await pick_for_account("76561197960287931", "key")
+        self.assertEqual(result["exit_code"], EXIT_AUTH_FAILED)
+
+    async def test_offline(self):
+        cache = AsyncCacheAdapter(DictionaryCache())
+        await cache.set(
+            owned_games_cache_key("76561197960287930"),
+            encode_owned_games(OwnedGames(games)),
+        )
+        loader = cached_owned_games_loader(cache)
+        resolver = CustomIDResolver(cache, offline=True)
+        with patch("backlog.account.iter_owned_games", FakeIterOwnedGames()) as fake:
+            result = await pick_for_account(
+                "76561197960287930", "", resolver, loader=loader
+            )
+            uncached = await pick_for_account(
+                "76561197960287932", "", resolver, loader=loader
+            )
+            unresolved = await pick_for_account(
+                "gabelogannewell", "", resolver, loader=loader
+            )
+        self.assertEqual(result["exit_code"], EXIT_OK)
+        self.assertEqual(result["pick"], games[0])
+        self.assertEqual(fake.max_in_flight, 0)
+        for failed in (uncached, unresolved):
+            self.assertEqual(failed["exit_code"], EXIT_NOT_CACHED)
+            self.assertEqual(failed["error"], "not_cached")
+
+
+class TestRunBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_and_order(self):
+        fake = FakeIterOwnedGames(delays={"76561197960287930": 0.05})
+        steam_ids = ["76561197960287930"] + [str(76561197960287932 + i) for i in range(5)]
+        with patch("backlog.account.iter_owned_games", fake):
+            results = [
+                result async for result in run_batch(steam_ids, "key", concurrency=2)
+            ]
+        self.assertEqual(len(results), len(steam_ids))
+        self.assertEqual(results[-1]["steam_id"], "76561197960287930")
+        self.assertEqual(fake.max_in_flight, 2)
+
+    async def test_timeout(self):
+        fake = FakeIterOwnedGames(delays={"76561197960287930": 10})
+        with patch("backlog.account.iter_owned_games", fake):
+            results = [
+                result
+                async for result in run_batch(
+                    ["76561197960287930", "76561197960287932"], "key", timeout=0.05
+                )
+            ]
+        self.assertEqual(results[0]["exit_code"], EXIT_OK)
+        self.assertEqual(
+            results[1],
+            {
+                "steam_id": "76561197960287930",
+                "exit_code": EXIT_REQUEST_FAILED,
+                "error": "timeout",
+            },
+        )
+
+    async def test_unexpected_error(self):
+        async def loader(steam_id, steam_api_key, resolver):
+            steam_id_64 = await steam_id.to_steam_id_64()
+            if steam_id_64 == "76561197960287930":
+                raise KeyError("playtime_forever")
+            return (steam_id_64, OwnedGames(games))
+
+        steam_ids = ["76561197960287930", "76561197960287932"]
+        with self.assertLogs("backlog.batch", "ERROR"):
+            results = [
+                result async for result in run_batch(steam_ids, "key", loader=loader)
+            ]
+        self.assertCountEqual(
+            [result["exit_code"] for result in results], [EXIT_OK, EXIT_UNEXPECTED_ERROR]
+        )
+        self.assertIn(
+            {
+                "steam_id": "76561197960287930",
+                "exit_code": EXIT_UNEXPECTED_ERROR,
+                "error": "unexpected_error",
+            },
+            results,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import AsyncMock
+from steamlib.error import InvalidResponseError
+from .filters import HoverIndex, genre_tokens, hover_filter, index_hover
+
+
+def hover(genres: str, categories: list[str], score: int) -> dict:
+    return {
+        "strReleaseDate": "Nov 1, 2000",
+        "strDescription": "",
+        "rgScreenshots": [],
+        "rgCategories": [{"strDisplayName": category} for category in categories],
+        "strGenres": genres,
+        "strMicroTrailerURL": "",
+        "ReviewSummary": {
+            "strReviewSummary": "",
+            "cReviews": 0,
+            "cRecommendationsPositive": 0,
+            "cRecommendationsNegative": 0,
+            "nReviewScore": score,
+        },
+    }
+
+
+hovers = {
+    10: hover("Action", ["Multi-player", "Online Co-op"], 9),
+    220: hover("Action, RPG", ["Single-player"], 8),
+    620: hover("Adventure, Indie", ["Single-player", "Online Co-op"], 9),
+    570: hover("Action, Strategy, Free to Play", ["Multi-player", "Online Co-op"], 7),
+}
+
+
+class TestHoverIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = HoverIndex()
+        for appid, response in hovers.items():
+            self.index.add(appid, response)
+
+    def test_genre_tokens(self):
+        self.assertEqual(genre_tokens(hover(" Action,  RPG ", [], 0)), ["action", "rpg"])
+        self.assertEqual(genre_tokens(hover("", [], 0)), [])
+
+    def test_no_filters(self):
+        self.assertEqual(self.index.matching(), set(hovers))
+
+    def test_intersections(self):
+        self.assertEqual(self.index.matching(genres=["action"]), {10, 220, 570})
+        self.assertEqual(
+            self.index.matching(genres=["Action"], categories=["online co-op"]), {10, 570}
+        )
+        self.assertEqual(
+            self.index.matching(categories=["Online Co-op"], min_score=8), {10, 620}
+        )
+        self.assertEqual(self.index.matching(genres=["Action", "RPG"]), {220})
+        self.assertEqual(self.index.matching(genres=["Roguelike"]), set())
+        self.assertEqual(self.index.matching(min_score=10), set())
+
+    def test_replace(self):
+        self.index.add(10, hover("Puzzle", ["Single-player"], 5))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.matching(genres=["action"]), {220, 570})
+        self.assertEqual(self.index.matching(genres=["puzzle"], min_score=5), {10})
+        self.assertEqual(self.index.matching(min_score=9), {620})
+        self.assertEqual(self.index.matching(categories=["multi-player"]), {570})
+        self.assertIn("puzzle", self.index.genres())
+
+    def test_many_apps(self):
+        index = HoverIndex()
+        for appid in range(5_000):
+            index.add(appid, hover("Action" if appid % 3 == 0 else "RPG", [], appid % 10))
+        matching = index.matching(genres=["action"], min_score=9)
+        self.assertEqual(matching, {appid for appid in range(5_000) if appid % 30 == 9})
+
+    def test_hover_filter_agrees(self):
+        queries = [
+            {},
+            {"genres": ["action"]},
+            {"genres": ["Action"], "categories": ["online co-op"]},
+            {"categories": ["Online Co-op"], "min_score": 8},
+            {"genres": ["Roguelike"]},
+        ]
+        for query in queries:
+            check = hover_filter(**query)
+            self.assertEqual(
+                {appid for appid, response in hovers.items() if check(response)},
+                self.index.matching(**query),
+            )
+
+
+class TestIndexHover(unittest.IsolatedAsyncioTestCase):
+    async def test_skips_failures_and_indexed_apps(self):
+        index = HoverIndex()
+        index.add(10, hovers[10])
+        requested: list[int] = []
+
+        async def get_many(appids):
+            requested.extend(appids)
+            yield (220, hovers[220])
+            yield (620, InvalidResponseError())
+
+        app_hover = AsyncMock()
+        app_hover.get_many = get_many
+        await index_hover(index, app_hover, [10, 220, 620])
+        self.assertEqual(requested, [220, 620])
+        self.assertIn(220, index)
+        self.assertNotIn(620, index)
+
+
+if __name__ == "__main__":
+    unittest.main()
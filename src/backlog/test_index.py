@@ -0,0 +1,130 @@
+import unittest
+import random
+from collections import Counter
+from steamlib.owned_games import OwnedGames
+from .index import (
+    BacklogIndex,
+    FenwickTree,
+    low_playtime_weight,
+    review_score_weight,
+)
+
+games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+    {"name": "Portal 2", "playtime_forever": 30, "appid": 620},
+    {"name": "Dota 2", "playtime_forever": 60, "appid": 570},
+]
+
+
+class TestFenwickTree(unittest.TestCase):
+    def test_prefix_sums(self):
+        weights = [3.0, 0.0, 1.0, 2.0, 5.0]
+        tree = FenwickTree(weights)
+        for count in range(len(weights) + 1):
+            self.assertEqual(tree.prefix_sum(count), sum(weights[:count]))
+        tree.set(4, 1.0)
+        self.assertEqual(tree.total(), 7.0)
+
+    def test_find(self):
+        tree = FenwickTree([3.0, 0.0, 1.0, 2.0])
+        self.assertEqual(tree.find(0.0), 0)
+        self.assertEqual(tree.find(2.9), 0)
+        self.assertEqual(tree.find(3.0), 2)
+        self.assertEqual(tree.find(4.5), 3)
+        tree.set(0, 0.0)
+        self.assertEqual(tree.find(0.0), 2)
+
+    def test_append(self):
+        weights = [3.0, 0.0, 1.0, 2.0, 5.0, 4.0, 1.0, 2.0, 6.0]
+        tree = FenwickTree([])
+        for weight in weights:
+            tree.append(weight)
+        for count in range(len(weights) + 1):
+            self.assertEqual(tree.prefix_sum(count), sum(weights[:count]))
+        copy = tree.copy()
+        copy.set(0, 0.0)
+        self.assertEqual(tree.total(), sum(weights))
+
+
+class TestBacklogIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = BacklogIndex(OwnedGames(games))
+
+    def test_thresholds(self):
+        self.assertEqual(self.index.count_below(60), 2)
+        self.assertEqual(self.index.count_below(61), 3)
+        self.assertEqual(list(self.index.below(60)), [games[0], games[2]])
+        self.assertEqual(list(self.index.between(30, 126)), [games[2], games[3], games[1]])
+        self.assertEqual(list(self.index.between(100, 50)), [])
+
+    def test_sample_without_replacement(self):
+        picks = self.index.sample(10, 100, rng=random.Random(1))
+        self.assertEqual(len(picks), 3)
+        self.assertCountEqual(picks, [games[0], games[2], games[3]])
+
+    def test_sample_appids(self):
+        picks = self.index.sample(10, 100, rng=random.Random(1), appids={220, 570})
+        self.assertEqual(picks, [games[3]])
+
+    def test_sample_skips_zero_weight(self):
+        weight = review_score_weight({10: -1, 620: 9})
+        rng = random.Random(1)
+        for _ in range(20):
+            self.assertEqual(
+                self.index.sample(1, 60, lambda game: weight(game) - 1, rng), [games[2]]
+            )
+
+    def test_sample_weighted(self):
+        rng = random.Random(1)
+        counts = Counter(
+            self.index.sample(1, 100, low_playtime_weight, rng)[0]["appid"]
+            for _ in range(3000)
+        )
+        # Weights are 1, 2/3 and 1/2.
+        self.assertGreater(counts[10], counts[620])
+        self.assertGreater(counts[620], counts[570])
+
+    def test_iter_picks_continues_sample(self):
+        picks = list(self.index.iter_picks(100, low_playtime_weight, random.Random(7)))
+        self.assertCountEqual(picks, [games[0], games[2], games[3]])
+        self.assertEqual(
+            self.index.sample(2, 100, low_playtime_weight, random.Random(7)), picks[:2]
+        )
+
+    def test_warm_sample_reuses_tree(self):
+        calls = 0
+
+        def weight(game):
+            nonlocal calls
+            calls += 1
+            return 1.0
+
+        self.index.sample(1, 100, weight)
+        # Every eligible game is weighed to build the tree, then only the
+        # picked games are weighed again, to restore them.
+        self.assertEqual(calls, 3 + 1)
+        for _ in range(10):
+            self.assertEqual(len(self.index.sample(2, 100, weight)), 2)
+        self.assertEqual(calls, 3 + 1 + 10 * 2)
+        self.assertEqual(len(self.index.sample(10, 100, weight)), 3)
+
+    def test_apply_updates_kept_tree(self):
+        self.index.sample(1, 100)
+        self.index.apply(
+            {
+                "added": [{"name": "Portal", "playtime_forever": 5, "appid": 400}],
+                "removed": [games[0]],
+                "playtime_changed": [{**games[2], "playtime_forever": 500}],
+            }
+        )
+        picks = self.index.sample(10, 100, rng=random.Random(1))
+        self.assertCountEqual([game["appid"] for game in picks], [400, 570])
+
+    def test_negative_weight(self):
+        with self.assertRaises(ValueError):
+            self.index.sample(1, 100, lambda game: -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
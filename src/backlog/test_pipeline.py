@@ -0,0 +1,119 @@
+import unittest
+import asyncio
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.error import InvalidResponseError
+from .filters import hover_filter
+from .pipeline import PickPipeline
+from .test_filters import hover
+
+candidates = [
+    {"name": f"Game {appid}", "playtime_forever": 0, "appid": appid}
+    for appid in range(1, 9)
+]
+
+
+class FakeGetAppHover:
+    def __init__(self, delays: dict[int, float], genres: dict[int, str]) -> None:
+        self.delays = delays
+        self.genres = genres
+        self.calls: list[int] = []
+        self.cancelled: list[int] = []
+
+    async def __call__(self, appid, session=None, fast_validation=False):
+        self.calls.append(appid)
+        try:
+            await asyncio.sleep(self.delays.get(appid, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(appid)
+            raise
+        if appid == 2:
+            raise InvalidResponseError()
+        return hover(self.genres.get(appid, "Casual"), [], 7)
+
+
+class TestPickPipeline(unittest.IsolatedAsyncioTestCase):
+    async def pick(self, fake, count=1, concurrency=4, lookahead=None):
+        app_hover = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        pipeline = PickPipeline(
+            app_hover, hover_filter(genres=["RPG"]), concurrency, lookahead
+        )
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            picks = [game async for game in pipeline.picks(candidates, count)]
+            await app_hover.wait_for_refreshes()
+        return (pipeline, picks)
+
+    async def test_picks_in_candidate_order(self):
+        fake = FakeGetAppHover({3: 0.05}, {3: "RPG", 4: "RPG", 6: "RPG"})
+        pipeline, picks = await self.pick(fake, count=2)
+        self.assertEqual(picks, [candidates[2], candidates[3]])
+        self.assertEqual(pipeline.failed, 1)
+
+    async def test_cancels_work_in_flight(self):
+        fake = FakeGetAppHover({5: 10, 6: 10}, {1: "RPG"})
+        _, picks = await asyncio.wait_for(self.pick(fake), 1)
+        self.assertEqual(picks, [candidates[0]])
+        self.assertCountEqual(fake.cancelled, [5, 6])
+
+    async def test_runs_out_of_candidates(self):
+        fake = FakeGetAppHover({}, {7: "RPG"})
+        pipeline, picks = await self.pick(fake, count=3, concurrency=2)
+        self.assertEqual(picks, [candidates[6]])
+        self.assertEqual(sorted(fake.calls), list(range(1, 9)))
+        self.assertEqual((pipeline.fetched, pipeline.failed), (7, 1))
+
+    async def test_lookahead_bounds_work(self):
+        fake = FakeGetAppHover({1: 0.05}, {1: "RPG"})
+        _, picks = await self.pick(fake, concurrency=4, lookahead=2)
+        self.assertEqual(picks, [candidates[0]])
+        self.assertEqual(fake.calls, [1, 2])
+
+    async def test_matched_picked_without_lookup(self):
+        fake = FakeGetAppHover({}, {})
+        app_hover = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        pipeline = PickPipeline(app_hover, hover_filter(genres=["RPG"]), 1, 1)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            picks = [
+                game
+                async for game in pipeline.picks(candidates[2:], 2, matched={3, 5})
+            ]
+        self.assertEqual(picks, [candidates[2], candidates[4]])
+        self.assertEqual(fake.calls, [4])
+
+    async def test_lookup_cancelled_elsewhere_fails_check(self):
+        fake = FakeGetAppHover({1: 10}, {1: "RPG", 2: "RPG", 3: "RPG"})
+        app_hover = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        pipeline = PickPipeline(app_hover, hover_filter(genres=["RPG"]), 2)
+
+        async def pick():
+            return [game async for game in pipeline.picks(candidates)]
+
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            task = asyncio.create_task(pick())
+            while 1 not in fake.calls:
+                await asyncio.sleep(0)
+            app_hover._in_flight[1].cancel()
+            picks = await asyncio.wait_for(task, 1)
+        self.assertEqual(picks, [candidates[2]])
+        self.assertEqual(pipeline.failed, 2)
+
+    async def test_check_errors_propagate(self):
+        def check(response):
+            raise KeyError("strGenres")
+
+        app_hover = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        with patch("steamlib.cached_app_hover.get_app_hover", FakeGetAppHover({}, {})):
+            with self.assertRaises(KeyError):
+                async for _ in PickPipeline(app_hover, check).picks(candidates):
+                    pass
+
+    def test_invalid_concurrency(self):
+        app_hover = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        with self.assertRaises(ValueError):
+            PickPipeline(app_hover, hover_filter(), concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
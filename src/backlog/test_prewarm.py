@@ -0,0 +1,122 @@
+import unittest
+import asyncio
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from steamid.custom_id_resolver import CustomIDResolver
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.error import AuthFailedError, InvalidResponseError
+from steamlib.test_get_app_hover import valid_response
+from .account import cached_owned_games_loader
+from .batch import EXIT_AUTH_FAILED, EXIT_OK, pick_for_account
+from .prewarm import run_prewarm
+from .sync import OwnedGamesSync
+
+games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+    {"name": "Portal 2", "playtime_forever": 30, "appid": 620},
+]
+
+
+async def fake_iter_owned_games(steam_id_64, steam_api_key, session=None):
+    if steam_id_64 == "76561197960287931":
+        raise AuthFailedError()
+    for game in games:
+        yield game
+
+
+async def fake_resolve_custom_id(id, session=None):
+    return "76561197960287930"
+
+
+class FakeGetAppHover:
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    async def __call__(self, appid, session=None, fast_validation=False):
+        self.calls.append(appid)
+        await asyncio.sleep(0)
+        if appid == 620:
+            raise InvalidResponseError()
+        return valid_response
+
+
+class TestRunPrewarm(unittest.IsolatedAsyncioTestCase):
+    async def test_prewarm_then_offline(self):
+        cache = AsyncCacheAdapter(DictionaryCache())
+        fake = FakeGetAppHover()
+        with patch("backlog.sync.iter_owned_games", fake_iter_owned_games), patch(
+            "steamid.custom_id_resolver.resolve_custom_id", fake_resolve_custom_id
+        ), patch("steamlib.cached_app_hover.get_app_hover", fake):
+            results = [
+                result
+                async for result in run_prewarm(
+                    ["gabelogannewell", "76561197960287931"], "key", cache
+                )
+            ]
+        self.assertEqual(
+            sorted(results, key=lambda result: result["exit_code"]),
+            [
+                {
+                    "steam_id": "gabelogannewell",
+                    "steam_id_64": "76561197960287930",
+                    "exit_code": EXIT_OK,
+                    "games": 3,
+                    "added": 3,
+                    "hover": 1,
+                    "hover_missing": 1,
+                },
+                {
+                    "steam_id": "76561197960287931",
+                    "exit_code": EXIT_AUTH_FAILED,
+                    "error": "auth_failed",
+                },
+            ],
+        )
+        self.assertEqual(sorted(fake.calls), [10, 620])
+
+        with patch("backlog.sync.iter_owned_games", fake_iter_owned_games), patch(
+            "steamlib.cached_app_hover.get_app_hover", fake
+        ):
+            results = [
+                result async for result in run_prewarm(["76561197960287930"], "key", cache)
+            ]
+        self.assertEqual(results[0]["added"], 0)
+        self.assertEqual(results[0]["hover_missing"], 1)
+        # Hover data that failed to fetch before is tried again.
+        self.assertEqual(sorted(fake.calls), [10, 620, 620])
+
+        resolver = CustomIDResolver(cache, offline=True)
+        result = await pick_for_account(
+            "gabelogannewell",
+            "",
+            resolver,
+            max_playtime=1,
+            loader=cached_owned_games_loader(cache),
+        )
+        self.assertEqual(result["pick"], games[0])
+        self.assertEqual(
+            await CachedAppHover(cache, offline=True).get(10), valid_response
+        )
+
+    async def test_fetches_hover_for_games_synced_without_it(self):
+        cache = AsyncCacheAdapter(DictionaryCache())
+        fake = FakeGetAppHover()
+        with patch("backlog.sync.iter_owned_games", fake_iter_owned_games), patch(
+            "steamlib.cached_app_hover.get_app_hover", fake
+        ):
+            await OwnedGamesSync(cache).sync("76561197960287930", "key")
+            results = [
+                result
+                async for result in run_prewarm(
+                    ["76561197960287930"], "key", cache, max_playtime=None
+                )
+            ]
+        self.assertEqual(results[0]["added"], 0)
+        self.assertEqual((results[0]["hover"], results[0]["hover_missing"]), (2, 1))
+        self.assertEqual(sorted(fake.calls), [10, 220, 620])
+
+
+if __name__ == "__main__":
+    unittest.main()
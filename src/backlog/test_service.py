@@ -0,0 +1,152 @@
+import unittest
+from unittest.mock import patch
+from aiohttp.test_utils import TestClient, TestServer
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from steamlib.owned_games import OwnedGames
+from steamlib.test_get_app_hover import valid_response
+from steamid.steamid import SteamID
+from .batch import EXIT_INVALID_STEAM_ID, EXIT_OK
+from .service import BacklogService
+from .sync import encode_owned_games, owned_games_cache_key
+from time import time
+
+games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+]
+
+
+class FakeIterOwnedGames:
+    def __init__(self, games=games) -> None:
+        self.calls = 0
+        self.games = games
+
+    async def __call__(self, steam_id_64, steam_api_key, session=None):
+        self.calls += 1
+        for game in self.games:
+            yield game
+
+
+class FakeGetAppHover:
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    async def __call__(self, appid, session=None, fast_validation=False):
+        self.calls.append(appid)
+        return valid_response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBacklogService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = DictionaryCache()
+        self.clock = FakeClock()
+        self.get_app_hover = FakeGetAppHover()
+        patcher = patch("steamlib.cached_app_hover.get_app_hover", self.get_app_hover)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = BacklogService(
+            "key", AsyncCacheAdapter(self.cache), owned_games_ttl=60, clock=self.clock
+        )
+        self.client = TestClient(TestServer(self.service.app()))
+        await self.service.start()
+        await self.client.start_server()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.service.close()
+
+    async def test_health(self):
+        response = await self.client.get("/health")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {"status": "ok"})
+
+    async def test_metrics(self):
+        with patch("backlog.sync.iter_owned_games", FakeIterOwnedGames()):
+            await self.client.get("/pick", params={"steam_id": "76561197960287930"})
+        response = await self.client.get("/metrics")
+        self.assertEqual(response.status, 200)
+        self.assertIn('cache_sets_total{backend="tiered"}', await response.text())
+
+    async def test_pick_reuses_owned_games(self):
+        fake = FakeIterOwnedGames()
+        with patch("backlog.sync.iter_owned_games", fake):
+            for _ in range(3):
+                response = await self.client.get(
+                    "/pick", params={"steam_id": "STEAM_0:0:11101"}
+                )
+                self.assertEqual(response.status, 200)
+                result = await response.json()
+                self.assertEqual(result["exit_code"], EXIT_OK)
+                self.assertEqual(result["steam_id_64"], "76561197960287930")
+                self.assertEqual(result["pick"], games[0])
+        self.assertEqual(fake.calls, 1)
+        self.assertIsNotNone(
+            self.cache.get(owned_games_cache_key("76561197960287930"))
+        )
+
+    async def test_owned_games_expire(self):
+        fake = FakeIterOwnedGames()
+        with patch("backlog.sync.iter_owned_games", fake):
+            await self.service.pick("76561197960287930")
+            self.clock.now += 61
+            await self.service.pick("76561197960287930")
+        self.assertEqual(fake.calls, 2)
+
+    async def test_sync_updates_index_and_prefetches_added(self):
+        fake = FakeIterOwnedGames()
+        with patch("backlog.sync.iter_owned_games", fake):
+            await self.service.pick("76561197960287930")
+            _, index = await self.service.load_owned_games(
+                SteamID("76561197960287930"), "key"
+            )
+            await self.service._sync.wait_for_prefetches()
+            self.assertEqual(sorted(self.get_app_hover.calls), [10, 220])
+            fake.games = [*games, {"name": "Portal 2", "playtime_forever": 5, "appid": 620}]
+            self.clock.now += 61
+            result = await self.service.pick("76561197960287930", max_playtime=60)
+            await self.service._sync.wait_for_prefetches()
+        _, updated_index = await self.service.load_owned_games(
+            SteamID("76561197960287930"), "key"
+        )
+        self.assertIs(updated_index, index)
+        self.assertEqual(result["eligible"], 2)
+        self.assertEqual(sorted(self.get_app_hover.calls), [10, 220, 620])
+
+    async def test_owned_games_from_cache(self):
+        self.cache.set(
+            owned_games_cache_key("76561197960287930"),
+            encode_owned_games(OwnedGames(games)),
+        )
+        fake = FakeIterOwnedGames()
+        with patch("backlog.sync.iter_owned_games", fake):
+            result = await self.service.pick("76561197960287930", max_playtime=200)
+        self.assertEqual(fake.calls, 0)
+        self.assertEqual(result["eligible"], 2)
+
+    async def test_invalid_steam_id(self):
+        response = await self.client.get("/pick", params={"steam_id": "   "})
+        self.assertEqual(response.status, 400)
+        self.assertEqual((await response.json())["exit_code"], EXIT_INVALID_STEAM_ID)
+
+    async def test_missing_steam_id(self):
+        response = await self.client.get("/pick")
+        self.assertEqual(response.status, 400)
+
+    async def test_bad_max_playtime(self):
+        response = await self.client.get(
+            "/pick", params={"steam_id": "76561197960287930", "max_playtime": "x"}
+        )
+        self.assertEqual(response.status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
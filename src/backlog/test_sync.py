@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from steamlib.owned_games import OwnedGames
+from .index import BacklogIndex
+from .sync import (
+    OwnedGamesSync,
+    decode_owned_games,
+    diff_owned_games,
+    encode_owned_games,
+    is_empty_diff,
+)
+
+games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+    {"name": "Portal 2", "playtime_forever": 30, "appid": 620},
+]
+
+later_games = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Portal 2", "playtime_forever": 90, "appid": 620},
+    {"name": "Dota 2", "playtime_forever": 5, "appid": 570},
+]
+
+
+class FakeIterOwnedGames:
+    def __init__(self, games) -> None:
+        self.games = games
+
+    async def __call__(self, steam_id_64, steam_api_key, session=None):
+        for game in self.games:
+            yield game
+
+
+class TestDiffOwnedGames(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(list(decode_owned_games(encode_owned_games(OwnedGames(games)))), games)
+
+    def test_diff(self):
+        diff = diff_owned_games(OwnedGames(games), OwnedGames(later_games))
+        self.assertEqual(
+            diff,
+            {
+                "added": [later_games[2]],
+                "removed": [games[1]],
+                "playtime_changed": [later_games[1]],
+            },
+        )
+        self.assertFalse(is_empty_diff(diff))
+        self.assertTrue(is_empty_diff(diff_owned_games(OwnedGames(games), OwnedGames(games))))
+
+    def test_index_apply(self):
+        index = BacklogIndex(OwnedGames(games))
+        index.apply(diff_owned_games(OwnedGames(games), OwnedGames(later_games)))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(
+            list(index.below(1000)),
+            sorted(later_games, key=lambda game: game["playtime_forever"]),
+        )
+        self.assertEqual(index.count_below(60), 2)
+
+
+class TestOwnedGamesSync(unittest.IsolatedAsyncioTestCase):
+    async def test_sync(self):
+        cache = DictionaryCache()
+        sync = OwnedGamesSync(AsyncCacheAdapter(cache))
+        self.assertIsNone(await sync.snapshot("76561197960287930"))
+        with patch("backlog.sync.iter_owned_games", FakeIterOwnedGames(games)):
+            owned_games, diff = await sync.sync("76561197960287930", "key")
+        self.assertEqual(list(owned_games), games)
+        self.assertEqual(diff["added"], games)
+        with patch("backlog.sync.iter_owned_games", FakeIterOwnedGames(later_games)):
+            owned_games, diff = await sync.sync("76561197960287930", "key")
+        self.assertEqual(diff["added"], [later_games[2]])
+        self.assertEqual(diff["removed"], [games[1]])
+        _, snapshot = await sync.snapshot("76561197960287930")
+        self.assertEqual(list(snapshot), later_games)
+
+    async def test_hover_only_for_added(self):
+        class FakeAppHover:
+            def __init__(self) -> None:
+                self.appids: list[int] = []
+
+            async def get_many(self, appids):
+                for appid in appids:
+                    self.appids.append(appid)
+                    yield (appid, {})
+
+        app_hover = FakeAppHover()
+        sync = OwnedGamesSync(AsyncCacheAdapter(DictionaryCache()), app_hover)
+        with patch("backlog.sync.iter_owned_games", FakeIterOwnedGames(games)):
+            await sync.sync("76561197960287930", "key")
+        with patch("backlog.sync.iter_owned_games", FakeIterOwnedGames(later_games)):
+            await sync.sync("76561197960287930", "key")
+        self.assertEqual(app_hover.appids, [10, 220, 620, 570])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Compares the ways an app hover response can be validated: rebuilding a
+validator for every response with ``jsonschema.validate`` (the previous
+approach), the validator compiled once, and the hand-written structural check.
+
+Run from the ``src`` directory with
+``python -m benchmarks.bench_app_hover_validation``.
+"""
+from jsonschema import validate
+from steamlib.get_app_hover import (
+    app_hover_response_schema,
+    is_app_hover_response,
+    validate_app_hover_response,
+)
+from timeit import timeit
+
+# A typical response, with a paragraph of description and eight screenshots.
+valid_response = {
+    "strReleaseDate": "Released: Oct 17, 2013",
+    "strDescription": (
+        "The Stanley Parable is a first person exploration game. You will play"
+        " as Stanley, and you will not play as Stanley. You will follow a"
+        " story, you will not follow a story. You will have a choice, you will"
+        " have no choice. The game will end, the game will never end."
+    ),
+    "rgScreenshots": [
+        {
+            "appid": 221910,
+            "id": id,
+            "filename": f"ss_{id:040x}.jpg",
+            "all_ages": "1" if id == 7 else "",
+        }
+        for id in range(8)
+    ],
+    "rgCategories": [{"strDisplayName": "Single-player"}],
+    "strGenres": "Adventure, Indie",
+    "strMicroTrailerURL": (
+        "https://cdn.akamai.steamstatic.com/steam/apps/2029779/microtrailer.webm"
+        "?t=1447359219"
+    ),
+    "ReviewSummary": {
+        "strReviewSummary": "Very Positive",
+        "cReviews": 39046,
+        "cRecommendationsPositive": 36101,
+        "cRecommendationsNegative": 2945,
+        "nReviewScore": 8,
+    },
+}
+
+
+def main(count: int = 2_000, repeat: int = 5) -> None:
+    def best(operation) -> float:
+        return min(timeit(operation, number=count) for _ in range(repeat))
+
+    per_call = best(
+        lambda: validate(instance=valid_response, schema=app_hover_response_schema)
+    )
+    compiled = best(lambda: validate_app_hover_response(valid_response))
+    structural = best(lambda: is_app_hover_response(valid_response))
+    print(f"Validated {count} app hover responses (best of {repeat})")
+    print(f"  jsonschema.validate: {per_call * 1000:8.1f} ms")
+    print(f"  compiled validator:  {compiled * 1000:8.1f} ms")
+    print(f"  structural check:    {structural * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compares the single-pass Steam ID classifier used by ``SteamID`` and
+``parse_many`` against the previous approach of trying each format's regex in
+turn and matching again to convert.
+
+Run from the ``src`` directory with ``python -m benchmarks.bench_steamid``.
+"""
+from steamid.steamid import (
+    SteamIDType,
+    parse_many,
+    steam_id_64_identifier,
+    steam_id_regex,
+)
+from timeit import timeit
+import re
+
+sample_ids = [
+    "STEAM_0:0:11101",
+    "[U:1:22202]",
+    "76561197960287930",
+    "https://steamcommunity.com/profiles/76561197960287930",
+    "https://steamcommunity.com/id/gabelogannewell",
+    "gabelogannewell",
+]
+
+
+def sequential_parse(steam_id: str) -> str | None:
+    """The previous approach: up to six uncompiled matches to identify the
+    format, then one more to extract its groups.
+
+    Args:
+        steam_id (str): The string to convert.
+
+    Returns:
+        str | None: The Steam ID 64, or None if it needs a web request.
+    """
+    stripped_steam_id = steam_id.strip()
+    for steam_id_type in [
+        SteamIDType.STEAM_ID,
+        SteamIDType.STEAM_ID_3,
+        SteamIDType.STEAM_ID_64,
+        SteamIDType.STANDARD_URL,
+        SteamIDType.CUSTOM_URL,
+        SteamIDType.CUSTOM_NAME,
+    ]:
+        if re.match(steam_id_regex[steam_id_type], stripped_steam_id):
+            break
+    else:
+        return None
+    matches = re.match(steam_id_regex[steam_id_type], stripped_steam_id)
+    assert matches is not None
+    match steam_id_type:
+        case SteamIDType.STEAM_ID:
+            return str(
+                int(matches.group(3)) * 2
+                + steam_id_64_identifier
+                + int(matches.group(2))
+            )
+        case SteamIDType.STEAM_ID_3:
+            return str(int(matches.group(2)) + steam_id_64_identifier)
+        case SteamIDType.STEAM_ID_64 | SteamIDType.STANDARD_URL:
+            return matches.group(1)
+    return None
+
+
+def main(count: int = 100_000, repeat: int = 5) -> None:
+    steam_ids = (sample_ids * (count // len(sample_ids) + 1))[:count]
+    assert parse_many(steam_ids) == [sequential_parse(i) for i in steam_ids]
+    sequential = min(
+        timeit(lambda: [sequential_parse(i) for i in steam_ids], number=1)
+        for _ in range(repeat)
+    )
+    single_pass = min(timeit(lambda: parse_many(steam_ids), number=1) for _ in range(repeat))
+    print(f"Parsed {count} mixed-format Steam IDs (best of {repeat})")
+    print(f"  sequential matches: {sequential * 1000:8.1f} ms")
+    print(f"  parse_many:         {single_pass * 1000:8.1f} ms")
+    print(f"  speedup:            {sequential / single_pass:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
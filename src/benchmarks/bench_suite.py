@@ -0,0 +1,316 @@
+"""Measures end-to-end latency and throughput against a local fake Steam
+server: single account picks, bulk hover fetches, cache hits and Steam ID
+parsing. Results are written as JSON, and can be compared with an earlier
+results file to catch regressions. The fake server shares the benchmark's event
+loop, so its own work is included in the timings; compare results taken with
+the same parameters on the same machine.
+
+Run from the ``src`` directory with ``python -m benchmarks.bench_suite``. Pass
+``--help`` for the options.
+"""
+from typing import Any, Awaitable, Callable, TypedDict
+from backlog.account import load_owned_games
+from backlog.index import BacklogIndex
+from benchmarks.bench_steamid import sample_ids
+from benchmarks.fake_steam import fake_steam
+from cache.async_sqlite_cache import AsyncSQLiteCache
+from cache.async_tiered_cache import AsyncTieredCache
+from steamid.steamid import SteamID, parse_many
+from steamlib.cached_app_hover import CachedAppHover
+from steamlib.get_app_hover import get_app_hover_many
+from steamlib.rate_limit import RateLimiter, set_rate_limiter
+from steamlib.session import shared_session
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+from timeit import timeit
+from os import path
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+
+
+class BenchmarkResult(TypedDict):
+    """One benchmark's headline number. ``higher_is_better`` tells a
+    comparison which direction is a regression. ``details`` holds any other
+    measurements.
+    """
+
+    value: float
+    unit: str
+    higher_is_better: bool
+    details: dict[str, float]
+
+
+def latency_result(samples: list[float]) -> BenchmarkResult:
+    """Summarize latency samples, in seconds, as a median in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "value": statistics.median(ordered) * 1000,
+        "unit": "ms",
+        "higher_is_better": False,
+        "details": {
+            "mean_ms": statistics.fmean(ordered) * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "samples": len(ordered),
+        },
+    }
+
+
+async def time_each(operation: Callable[[], Awaitable[Any]], count: int) -> list[float]:
+    """Time ``count`` sequential runs of ``operation``, in seconds."""
+    samples: list[float] = []
+    for _ in range(count):
+        start = perf_counter()
+        await operation()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+async def bench_single_account(args: argparse.Namespace) -> BenchmarkResult:
+    """A full single account pick from a custom ID: resolve it, stream the
+    owned games, index them and pick one.
+    """
+
+    async def pick() -> None:
+        _, owned_games = await load_owned_games(SteamID("gabelogannewell"), "key")
+        BacklogIndex(owned_games).sample(1, 60)
+
+    return latency_result(await time_each(pick, args.repeat))
+
+
+async def bench_bulk_hover(args: argparse.Namespace) -> BenchmarkResult:
+    """Uncached hover fetches for many apps at the default concurrency."""
+    start = perf_counter()
+    failures = 0
+    async for _, result in get_app_hover_many(range(1, args.hover_count + 1)):
+        if isinstance(result, Exception):
+            failures += 1
+    elapsed = perf_counter() - start
+    return {
+        "value": args.hover_count / elapsed,
+        "unit": "requests/s",
+        "higher_is_better": True,
+        "details": {"elapsed_s": elapsed, "failures": failures},
+    }
+
+
+async def bench_cache_hits(args: argparse.Namespace) -> BenchmarkResult:
+    """Hover lookups served from a warm cache, through the in-memory tier and
+    from SQLite alone.
+    """
+    appids = list(range(1, args.hover_count + 1))
+    with TemporaryDirectory() as directory:
+        sqlite_cache = AsyncSQLiteCache(path.join(directory, "bench.db"))
+        try:
+            tiered = CachedAppHover(AsyncTieredCache(sqlite_cache))
+            async for _ in tiered.get_many(appids):
+                pass
+            details: dict[str, float] = {}
+            for name, app_hover in (
+                ("memory", tiered),
+                ("sqlite", CachedAppHover(sqlite_cache)),
+            ):
+                samples = await time_each(
+                    lambda: asyncio.gather(*(app_hover.get(appid) for appid in appids)),
+                    args.repeat,
+                )
+                details[f"{name}_us_per_get"] = (
+                    statistics.median(samples) / len(appids) * 1_000_000
+                )
+                start = perf_counter()
+                async for _ in app_hover.get_many(appids):
+                    pass
+                details[f"{name}_us_per_get_many_item"] = (
+                    (perf_counter() - start) / len(appids) * 1_000_000
+                )
+        finally:
+            await sqlite_cache.close()
+    return {
+        "value": details["memory_us_per_get"],
+        "unit": "us/get",
+        "higher_is_better": False,
+        "details": details,
+    }
+
+
+async def bench_steamid_parsing(args: argparse.Namespace) -> BenchmarkResult:
+    """Offline parsing of mixed-format Steam IDs with ``parse_many``."""
+    steam_ids = (sample_ids * (args.parse_count // len(sample_ids) + 1))[
+        : args.parse_count
+    ]
+    elapsed = min(
+        timeit(lambda: parse_many(steam_ids), number=1) for _ in range(args.repeat)
+    )
+    return {
+        "value": len(steam_ids) / elapsed,
+        "unit": "ids/s",
+        "higher_is_better": True,
+        "details": {"elapsed_s": elapsed},
+    }
+
+
+benchmarks: dict[
+    str, Callable[[argparse.Namespace], Awaitable[BenchmarkResult]]
+] = {
+    "single_account": bench_single_account,
+    "bulk_hover": bench_bulk_hover,
+    "cache_hits": bench_cache_hits,
+    "steamid_parsing": bench_steamid_parsing,
+}
+
+
+def find_regressions(
+    results: dict[str, BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    tolerance: float,
+) -> list[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results (dict[str, BenchmarkResult]): The new results.
+        baseline (dict[str, BenchmarkResult]): The results to compare with.
+        tolerance (float): The fraction a headline number may get worse by
+        before it counts as a regression.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    regressions: list[str] = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None or previous["unit"] != result["unit"]:
+            continue
+        if result["higher_is_better"]:
+            regressed = result["value"] < previous["value"] * (1 - tolerance)
+        else:
+            regressed = result["value"] > previous["value"] * (1 + tolerance)
+        if regressed:
+            regressions.append(
+                f"{name}: {result['value']:.2f} {result['unit']}"
+                f" (was {previous['value']:.2f})"
+            )
+    return regressions
+
+
+parser = argparse.ArgumentParser(
+    description="Benchmarks the backlog builder against a local fake Steam server."
+)
+parser.add_argument(
+    "--only",
+    help="Run only these benchmarks.",
+    nargs="+",
+    choices=list(benchmarks),
+)
+parser.add_argument(
+    "--latency",
+    help="Seconds of latency added to every fake response. Defaults to 0.02.",
+    type=float,
+    default=0.02,
+)
+parser.add_argument(
+    "--games",
+    help="The number of games every fake account owns. Defaults to 2000.",
+    type=int,
+    default=2_000,
+)
+parser.add_argument(
+    "--description-size",
+    help="Characters in each fake hover description. Defaults to 1024.",
+    type=int,
+    default=1_024,
+)
+parser.add_argument(
+    "--hover-count",
+    help="Apps fetched by the hover benchmarks. Defaults to 200.",
+    type=int,
+    default=200,
+)
+parser.add_argument(
+    "--parse-count",
+    help="Steam IDs parsed by the parsing benchmark. Defaults to 100000.",
+    type=int,
+    default=100_000,
+)
+parser.add_argument(
+    "--repeat",
+    help="Repetitions of the repeated benchmarks. Defaults to 10.",
+    type=int,
+    default=10,
+)
+parser.add_argument(
+    "--output",
+    "-o",
+    help="Write the results as JSON to this file. Defaults to stdout.",
+)
+parser.add_argument(
+    "--compare",
+    help="An earlier results file to check for regressions against.",
+)
+parser.add_argument(
+    "--tolerance",
+    help="The fraction a result may get worse by before it is a regression."
+    " Defaults to 0.2.",
+    type=float,
+    default=0.2,
+)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the selected benchmarks against a fake Steam server. The shared
+    rate limiter is lifted for the duration, as the fake server never
+    throttles.
+    """
+    previous_limiter = set_rate_limiter(
+        RateLimiter(default_rate=1_000_000, default_burst=1_000_000)
+    )
+    results: dict[str, BenchmarkResult] = {}
+    try:
+        async with fake_steam(args.latency, args.games, args.description_size):
+            async with shared_session():
+                for name in args.only or benchmarks:
+                    print(f"Running {name}...", file=sys.stderr)
+                    results[name] = await benchmarks[name](args)
+    finally:
+        set_rate_limiter(previous_limiter)
+    return {
+        "timestamp": time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "latency": args.latency,
+            "games": args.games,
+            "description_size": args.description_size,
+            "hover_count": args.hover_count,
+            "parse_count": args.parse_count,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    for name, result in report["results"].items():
+        print(f"  {name:16} {result['value']:12.2f} {result['unit']}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(report["results"], baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
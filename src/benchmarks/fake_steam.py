@@ -0,0 +1,166 @@
+"""A local aiohttp server emulating the Steam endpoints this project uses:
+``GetOwnedGames``, the store's ``apphoverpublic`` and the community's
+``?xml=1`` profiles. Every response waits for ``latency`` seconds first, and
+the number of owned games and the size of hover descriptions are configurable.
+
+Use ``fake_steam`` to start a server and point ``steamlib.endpoints`` at it.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from collections import Counter
+from steamlib import endpoints
+import asyncio
+import json
+
+# Custom IDs the community endpoint reports as not found.
+UNKNOWN_CUSTOM_ID = "unknown"
+
+
+def fake_steam_id_64(custom_id: str) -> str:
+    """The Steam ID 64 the fake community endpoint resolves a custom ID to."""
+    return str(76561197960265728 + sum(map(ord, custom_id)))
+
+
+class FakeSteam:
+    """The fake Steam endpoints, and a count of the requests made to each."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        game_count: int = 1_000,
+        description_size: int = 1_024,
+    ) -> None:
+        """Create the fake endpoints.
+
+        Args:
+            latency (float, optional): The number of seconds every response is
+            delayed by. Defaults to 0.
+            game_count (int, optional): The number of games every account owns.
+            Defaults to 1,000.
+            description_size (int, optional): The number of characters in each
+            hover description. Defaults to 1,024.
+        """
+        self.latency = latency
+        self.game_count = game_count
+        self.description_size = description_size
+        self.requests: Counter[str] = Counter()
+        self._owned_games_body: bytes | None = None
+
+    def app(self) -> web.Application:
+        """Build the web application serving the fake endpoints."""
+        app = web.Application()
+        app.router.add_get("/IPlayerService/GetOwnedGames/v1/", self._owned_games)
+        app.router.add_get("/apphoverpublic/{appid}/", self._app_hover)
+        app.router.add_get("/id/{custom_id}", self._community_profile)
+        return app
+
+    def owned_games_body(self) -> bytes:
+        """The ``GetOwnedGames`` response body, built once."""
+        if self._owned_games_body is None:
+            games = [
+                {
+                    "appid": 10 * (i + 1),
+                    "name": f"Game {i}",
+                    "playtime_forever": (i * 37) % 600,
+                    "img_icon_url": "6b0312cda02f5f777efa2f3318c307ff9acafbb5",
+                    "has_community_visible_stats": True,
+                }
+                for i in range(self.game_count)
+            ]
+            self._owned_games_body = json.dumps(
+                {"response": {"game_count": len(games), "games": games}}
+            ).encode("utf-8")
+        return self._owned_games_body
+
+    async def _owned_games(self, request: web.Request) -> web.Response:
+        self.requests["owned_games"] += 1
+        await asyncio.sleep(self.latency)
+        return web.Response(body=self.owned_games_body(), content_type="application/json")
+
+    async def _app_hover(self, request: web.Request) -> web.Response:
+        self.requests["app_hover"] += 1
+        await asyncio.sleep(self.latency)
+        appid = int(request.match_info["appid"])
+        return web.json_response(
+            {
+                "strReleaseDate": "Nov 1, 2000",
+                "strDescription": "x" * self.description_size,
+                "rgScreenshots": [
+                    {
+                        "appid": appid,
+                        "id": 0,
+                        "filename": f"ss_{appid}.jpg",
+                        "all_ages": "1",
+                    }
+                ],
+                "rgCategories": [{"strDisplayName": "Single-player"}],
+                "strGenres": "Action",
+                "strMicroTrailerURL": "",
+                "ReviewSummary": {
+                    "strReviewSummary": "Very Positive",
+                    "cReviews": 100,
+                    "cRecommendationsPositive": 90,
+                    "cRecommendationsNegative": 10,
+                    "nReviewScore": 8,
+                },
+            }
+        )
+
+    async def _community_profile(self, request: web.Request) -> web.Response:
+        self.requests["community_profile"] += 1
+        await asyncio.sleep(self.latency)
+        custom_id = request.match_info["custom_id"]
+        if custom_id == UNKNOWN_CUSTOM_ID:
+            body = "<response><error>The specified profile could not be found.</error></response>"
+        else:
+            body = (
+                "<profile><steamID64>"
+                f"{fake_steam_id_64(custom_id)}"
+                "</steamID64></profile>"
+            )
+        return web.Response(text=body, content_type="text/xml")
+
+
+@asynccontextmanager
+async def fake_steam(
+    latency: float = 0.0,
+    game_count: int = 1_000,
+    description_size: int = 1_024,
+) -> AsyncIterator[FakeSteam]:
+    """Start a fake Steam server on a free local port, pointing
+    ``steamlib.endpoints`` at it until the block exits.
+
+    Args:
+        latency (float, optional): The number of seconds every response is
+        delayed by. Defaults to 0.
+        game_count (int, optional): The number of games every account owns.
+        Defaults to 1,000.
+        description_size (int, optional): The number of characters in each
+        hover description. Defaults to 1,024.
+
+    Yields:
+        FakeSteam: The fake endpoints.
+    """
+    steam = FakeSteam(latency, game_count, description_size)
+    server = TestServer(steam.app())
+    await server.start_server()
+    base_url = str(server.make_url("")).rstrip("/")
+    previous = (
+        endpoints.STEAM_API_URL,
+        endpoints.STEAM_STORE_URL,
+        endpoints.STEAM_COMMUNITY_URL,
+    )
+    endpoints.STEAM_API_URL = base_url
+    endpoints.STEAM_STORE_URL = base_url
+    endpoints.STEAM_COMMUNITY_URL = base_url
+    try:
+        yield steam
+    finally:
+        (
+            endpoints.STEAM_API_URL,
+            endpoints.STEAM_STORE_URL,
+            endpoints.STEAM_COMMUNITY_URL,
+        ) = previous
+        await server.close()
@@ -0,0 +1,43 @@
+import unittest
+from steamid.resolve_custom_id import InvalidCustomIDError, resolve_custom_id
+from steamlib.get_app_hover import get_app_hover
+from steamlib.get_owned_games import get_owned_games
+from .bench_suite import find_regressions
+from .fake_steam import UNKNOWN_CUSTOM_ID, fake_steam, fake_steam_id_64
+
+
+class TestFakeSteam(unittest.IsolatedAsyncioTestCase):
+    async def test_endpoints(self):
+        async with fake_steam(game_count=3, description_size=10) as steam:
+            owned_games = await get_owned_games("76561197960287930", "key")
+            self.assertEqual([game["appid"] for game in owned_games], [10, 20, 30])
+            response = await get_app_hover(10)
+            self.assertEqual(response["strDescription"], "x" * 10)
+            self.assertEqual(
+                await resolve_custom_id("gabelogannewell"),
+                fake_steam_id_64("gabelogannewell"),
+            )
+            with self.assertRaises(InvalidCustomIDError):
+                await resolve_custom_id(UNKNOWN_CUSTOM_ID)
+        self.assertEqual(
+            steam.requests,
+            {"owned_games": 1, "app_hover": 1, "community_profile": 2},
+        )
+
+
+class TestFindRegressions(unittest.TestCase):
+    def test_direction(self):
+        baseline = {
+            "throughput": {"value": 100, "unit": "requests/s", "higher_is_better": True, "details": {}},
+            "latency": {"value": 10, "unit": "ms", "higher_is_better": False, "details": {}},
+        }
+        results = {
+            "throughput": {"value": 85, "unit": "requests/s", "higher_is_better": True, "details": {}},
+            "latency": {"value": 13, "unit": "ms", "higher_is_better": False, "details": {}},
+        }
+        self.assertEqual(len(find_regressions(results, baseline, 0.2)), 1)
+        self.assertEqual(len(find_regressions(results, baseline, 0.1)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
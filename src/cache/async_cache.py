@@ -0,0 +1,103 @@
+import abc
+from typing import Iterable, Mapping
+from .cache import Cache, CacheEntry
+
+
+class AsyncCache(metaclass=abc.ABCMeta):
+    """A very simple interface for a key-value cache that can be used from the
+    event loop without blocking it.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get the value with the given key.
+
+        Args:
+            key (str): The key value to retrieve.
+
+        Returns:
+            CacheEntry | None: The CacheEntry associated with the ``key`` or
+            ``None`` if it has not been set.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        """Set the value with the given key to the provided value.
+
+        Args:
+            key (str): The key value to set.
+            value (str): The value to set the key to.
+        """
+        pass
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get the values for several keys at once. Implementations should
+        override this if they can do so more efficiently than one ``get`` per
+        key.
+
+        Args:
+            keys (Iterable[str]): The key values to retrieve.
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that has been
+            set. Keys that have not been set are omitted.
+        """
+        entries: dict[str, CacheEntry] = {}
+        for key in keys:
+            cache_entry = await self.get(key)
+            if cache_entry is not None:
+                entries[key] = cache_entry
+        return entries
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys at once. Implementations should override this if
+        they can do so more efficiently than one ``set`` per key.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key.
+        """
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def close(self) -> None:
+        """Release any resources held by the cache. The cache cannot be used
+        afterwards.
+        """
+        pass
+
+
+class AsyncCacheAdapter(AsyncCache):
+    """Exposes a synchronous Cache as an AsyncCache by calling it directly on
+    the event loop. Only suitable for caches that never block, such as
+    ``LRUCache`` or ``DictionaryCache``.
+    """
+
+    def __init__(self, cache: Cache) -> None:
+        """Wrap the given Cache.
+
+        Args:
+            cache (Cache): The non-blocking Cache to wrap.
+        """
+        self._cache = cache
+
+    @property
+    def cache(self) -> Cache:
+        """The wrapped Cache."""
+        return self._cache
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get the specified key from the wrapped Cache."""
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        """Set the given key in the wrapped Cache."""
+        self._cache.set(key, value)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get several keys from the wrapped Cache."""
+        return self._cache.get_many(keys)
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys in the wrapped Cache."""
+        self._cache.set_many(items)
@@ -0,0 +1,266 @@
+from .async_cache import AsyncCache
+from .cache import CacheEntry
+from .codec import ValueCodec, zlib_codec
+from .sqlite_cache import SQLiteCache
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from typing import Callable, Iterable, Mapping, TypeVar
+import asyncio
+import logging
+import os
+import threading
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSQLiteCache(AsyncCache):
+    """An AsyncCache backed by the same SQLite database format as
+    ``SQLiteCache``, which keeps all disk I/O off the event loop.
+
+    Writes are made through a single connection owned by a dedicated writer
+    thread, so they are serialized without any locking on the event loop.
+    Reads are spread over a pool of reader threads, each with its own
+    connection. The database runs in WAL mode, so readers never wait on the
+    writer and always see every write that has already been awaited.
+    """
+
+    def __init__(
+        self,
+        filePath: str | bytes | os.PathLike,
+        readers: int = 4,
+        codec: ValueCodec | None = zlib_codec,
+    ) -> None:
+        """Create a new AsyncSQLiteCache using the specified file as a
+        database. The writer connection is opened, and the table created,
+        before this returns.
+
+        Args:
+            filePath (str): The file to use for the database.
+            readers (int, optional): The number of reader threads and
+            connections. Defaults to 4.
+            codec (ValueCodec | None, optional): The codec to encode new values
+            with, as for ``SQLiteCache``. Defaults to ``zlib_codec``.
+
+        Raises:
+            ValueError: Raised if ``readers`` is less than 1.
+        """
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self._file_path = filePath
+        self._codec = codec
+        self._local = threading.local()
+        self._connections: list[SQLiteCache] = []
+        self._connections_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-cache-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="sqlite-cache-reader"
+        )
+        self._writer.submit(self._connection).result()
+
+    def _connection(self) -> SQLiteCache:
+        """Get the connection belonging to the current worker thread, opening
+        it if needed.
+
+        Returns:
+            SQLiteCache: The current thread's connection.
+        """
+        connection: SQLiteCache | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = SQLiteCache(
+                self._file_path, check_same_thread=False, codec=self._codec
+            )
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    async def _run(
+        self, executor: ThreadPoolExecutor, operation: Callable[[SQLiteCache], T]
+    ) -> T:
+        """Run an operation against a worker thread's connection.
+
+        Args:
+            executor (ThreadPoolExecutor): The reader or writer executor.
+            operation (Callable[[SQLiteCache], T]): The operation to run.
+
+        Returns:
+            T: The result of the operation.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, lambda: operation(self._connection())
+        )
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get the specified key on a reader thread.
+
+        Args:
+            key (str): The key to fetch
+
+        Returns:
+            CacheEntry | None: The CacheEntry associated with the key, or None if not set
+        """
+        return await self._run(self._readers, lambda cache: cache.get(key))
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get several keys on a reader thread.
+
+        Args:
+            keys (Iterable[str]): The keys to fetch
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that is set.
+            Keys that are not set are omitted.
+        """
+        key_list = list(keys)
+        return await self._run(self._readers, lambda cache: cache.get_many(key_list))
+
+    async def set(self, key: str, value: str) -> None:
+        """Set the given key to the provided value on the writer thread.
+
+        Args:
+            key (str): The key to set
+            value (str): The value to set the key to
+        """
+        await self._run(self._writer, lambda cache: cache.set(key, value))
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys in a single transaction on the writer thread.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key
+        """
+        item_dict = dict(items)
+        await self._run(self._writer, lambda cache: cache.set_many(item_dict))
+
+    async def recode(self, batch_size: int = 512) -> int:
+        """Rewrite every value with the current codec, as ``SQLiteCache.recode``
+        does. Each batch runs as its own operation on the writer thread, so
+        other writes are not held up for the whole run, and reads never are.
+
+        Args:
+            batch_size (int, optional): The number of keys per transaction.
+            Defaults to 512.
+
+        Returns:
+            int: The number of values rewritten.
+        """
+        after: str | None = None
+        total = 0
+        while True:
+            after, count = await self._run(
+                self._writer, lambda cache: cache.recode_batch(after, batch_size)
+            )
+            if after is None:
+                return total
+            total += count
+
+    async def purge_older_than(
+        self, namespace: str | None, timestamp: float, batch_size: int = 512
+    ) -> int:
+        """Delete every key last updated before ``timestamp``, as
+        ``SQLiteCache.purge_older_than`` does. Each batch runs as its own
+        operation on the writer thread.
+
+        Args:
+            namespace (str | None): The namespace to delete from, or None for
+            every namespace.
+            timestamp (float): The time before which keys are deleted.
+            batch_size (int, optional): The number of keys per transaction.
+            Defaults to 512.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        if namespace is None:
+            namespaces = await self._run(self._readers, lambda cache: cache.namespaces())
+        else:
+            namespaces = [namespace]
+        total = 0
+        for namespace in namespaces:
+            while count := await self._run(
+                self._writer,
+                lambda cache: cache.purge_batch(namespace, timestamp, batch_size),
+            ):
+                total += count
+        return total
+
+    async def vacuum_incremental(self, batch_pages: int = 1024) -> int:
+        """Return every free page to the file system, ``batch_pages`` at a
+        time on the writer thread.
+
+        Args:
+            batch_pages (int, optional): The most pages freed per operation.
+            Defaults to 1024.
+
+        Returns:
+            int: The number of pages freed.
+        """
+        total = 0
+        while count := await self._run(
+            self._writer, lambda cache: cache.vacuum_incremental(batch_pages)
+        ):
+            total += count
+        return total
+
+    async def enable_incremental_vacuum(self) -> bool:
+        """Run ``SQLiteCache.enable_incremental_vacuum`` on the writer
+        thread. Reads from other connections wait for it to finish.
+
+        Returns:
+            bool: Whether the database needed it.
+        """
+        return await self._run(
+            self._writer, lambda cache: cache.enable_incremental_vacuum()
+        )
+
+    async def maintain(
+        self,
+        retention: Mapping[str, float],
+        interval: float = 60 * 60,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        """Keep the cache bounded until cancelled: every ``interval`` seconds,
+        purge the keys of each namespace in ``retention`` that are older than
+        its retention, then free the pages they used. A run that fails is
+        logged and retried at the next interval.
+
+        Args:
+            retention (Mapping[str, float]): The number of seconds keys are
+            kept after they were last updated, by namespace. Other namespaces
+            are never purged.
+            interval (float, optional): The number of seconds between runs.
+            Defaults to an hour.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.time``.
+        """
+        while True:
+            try:
+                for namespace, seconds in retention.items():
+                    await self.purge_older_than(namespace, clock() - seconds)
+                await self.vacuum_incremental()
+            except Exception:
+                logger.exception("Cache maintenance failed")
+            await asyncio.sleep(interval)
+
+    async def close(self) -> None:
+        """Wait for outstanding operations, then stop the worker threads and
+        close every connection.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self) -> None:
+        """Stop the worker threads and close every connection. Blocks until
+        outstanding operations finish.
+        """
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
@@ -0,0 +1,103 @@
+from .async_cache import AsyncCache
+from .cache import CacheEntry
+from .lru_cache import LRUCache
+from typing import Iterable, Mapping
+from time import time
+
+
+class AsyncTieredCache(AsyncCache):
+    """The AsyncCache counterpart of ``TieredCache``: a read-through cache which
+    keeps recently used entries in a bounded in-memory ``LRUCache`` (L1) in
+    front of a slower AsyncCache such as ``AsyncSQLiteCache`` (L2). L1 hits
+    never leave the event loop. L2 hits are promoted into L1 with their
+    original ``updated`` time, and writes go through to both tiers.
+    """
+
+    def __init__(self, l2: AsyncCache, l1: LRUCache | None = None) -> None:
+        """Create a new AsyncTieredCache over the given caches.
+
+        Args:
+            l2 (AsyncCache): The slower, authoritative cache.
+            l1 (LRUCache | None, optional): The in-memory cache to serve reads
+            from. Defaults to an ``LRUCache`` holding 10,000 entries.
+        """
+        self._l1 = l1 if l1 is not None else LRUCache(max_entries=10_000)
+        self._l2 = l2
+
+    @property
+    def l1(self) -> LRUCache:
+        """The in-memory cache reads are served from."""
+        return self._l1
+
+    @property
+    def l2(self) -> AsyncCache:
+        """The slower cache behind the in-memory cache."""
+        return self._l2
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Get the specified key from L1, falling back to L2.
+
+        Args:
+            key (str): The key to fetch.
+
+        Returns:
+            CacheEntry | None: The CacheEntry associated with the key, or None
+            if not set in either tier.
+        """
+        cache_entry = self._l1.get(key)
+        if cache_entry is not None:
+            return cache_entry
+        cache_entry = await self._l2.get(key)
+        if cache_entry is not None:
+            self._l1.put_entry(key, cache_entry)
+        return cache_entry
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get several keys, reading only the L1 misses from L2 in one bulk
+        read.
+
+        Args:
+            keys (Iterable[str]): The keys to fetch.
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that is set.
+            Keys that are not set are omitted.
+        """
+        entries: dict[str, CacheEntry] = {}
+        missing: list[str] = []
+        for key in keys:
+            cache_entry = self._l1.get(key)
+            if cache_entry is None:
+                missing.append(key)
+            else:
+                entries[key] = cache_entry
+        if missing:
+            promoted = await self._l2.get_many(missing)
+            for key, cache_entry in promoted.items():
+                self._l1.put_entry(key, cache_entry)
+            entries.update(promoted)
+        return entries
+
+    async def set(self, key: str, value: str) -> None:
+        """Set the given key in both tiers.
+
+        Args:
+            key (str): The key to set.
+            value (str): The value to set the key to.
+        """
+        await self.set_many({key: value})
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys in both tiers, using a single bulk write for L2.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key.
+        """
+        updated = int(time())
+        for key, value in items.items():
+            self._l1.put_entry(key, {"value": value, "updated": updated})
+        await self._l2.set_many(items)
+
+    async def close(self) -> None:
+        """Close the L2 cache."""
+        await self._l2.close()
@@ -1,5 +1,5 @@
 import abc
-from typing import TypedDict
+from typing import Iterable, Mapping, TypedDict
 
 
 class CacheEntry(TypedDict):
@@ -34,3 +34,32 @@ class Cache(metaclass=abc.ABCMeta):
             value (str): The value to set the key to.
         """
         pass
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get the values for several keys at once. Implementations should
+        override this if they can do so more efficiently than one ``get`` per
+        key.
+
+        Args:
+            keys (Iterable[str]): The key values to retrieve.
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that has been
+            set. Keys that have not been set are omitted.
+        """
+        entries: dict[str, CacheEntry] = {}
+        for key in keys:
+            cache_entry = self.get(key)
+            if cache_entry is not None:
+                entries[key] = cache_entry
+        return entries
+
+    def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys at once. Implementations should override this if
+        they can do so more efficiently than one ``set`` per key.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key.
+        """
+        for key, value in items.items():
+            self.set(key, value)
@@ -0,0 +1,420 @@
+from .cache import CacheEntry
+from typing import Any, Iterator, Sequence
+import abc
+import json
+import struct
+import zlib
+
+# Value types in a binary record.
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STRING, _SHARED_STRING, _LIST, _OBJECT = range(9)
+
+# The separators ``json.dumps`` can be called with to produce a recordable
+# value, by their index in a record's header byte.
+_SEPARATORS = ((", ", ": "), (",", ":"))
+
+_double = struct.Struct("<d")
+
+
+class ValueCodec(metaclass=abc.ABCMeta):
+    """Encodes cache values as compact bytes and back. Every codec has a tag,
+    from 1 to 255, which is stored as the first byte of each value it encodes,
+    so values written by different codecs can be read side by side. Once values
+    have been stored with a tag, the codec behind it must keep decoding them
+    the same way.
+    """
+
+    def __init__(self, tag: int) -> None:
+        """Create a new ValueCodec.
+
+        Args:
+            tag (int): The tag identifying values encoded by this codec.
+
+        Raises:
+            ValueError: Raised if ``tag`` is not from 1 to 255.
+        """
+        if not 0 < tag < 256:
+            raise ValueError("tag must be from 1 to 255")
+        self.tag = tag
+
+    @abc.abstractmethod
+    def encode(self, value: str) -> bytes:
+        """Encode a value.
+
+        Args:
+            value (str): The value to encode.
+
+        Raises:
+            ValueError: Raised if the codec cannot encode ``value``.
+
+        Returns:
+            bytes: The encoded value, without the tag.
+        """
+        pass
+
+    @abc.abstractmethod
+    def decode(self, data: bytes) -> str:
+        """Decode a value encoded by ``encode``.
+
+        Args:
+            data (bytes): The encoded value, without the tag.
+
+        Returns:
+            str: The value.
+        """
+        pass
+
+
+class ZlibCodec(ValueCodec):
+    """Compresses the UTF-8 text of values with raw deflate. A shared
+    ``dictionary`` of text common to many values, such as JSON keys, lets
+    values of a few hundred bytes compress well on their own.
+    """
+
+    def __init__(self, tag: int, dictionary: bytes = b"", level: int = 6) -> None:
+        """Create a new ZlibCodec.
+
+        Args:
+            tag (int): The tag identifying values encoded by this codec.
+            dictionary (bytes, optional): The shared dictionary to prime the
+            compressor with. Defaults to no dictionary.
+            level (int, optional): The zlib compression level. Defaults to 6.
+        """
+        super().__init__(tag)
+        self.dictionary = dictionary
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress bytes with the codec's level and dictionary."""
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, wbits=-15, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level, wbits=-15)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress bytes compressed by ``compress``."""
+        if self.dictionary:
+            decompressor = zlib.decompressobj(wbits=-15, zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(wbits=-15)
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def encode(self, value: str) -> bytes:
+        return self.compress(value.encode("utf-8"))
+
+    def decode(self, data: bytes) -> str:
+        return self.decompress(data).decode("utf-8")
+
+
+def _write_varint(number: int, out: bytearray) -> None:
+    while number >= 0x80:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data: bytes, position: int) -> tuple[int, int]:
+    number = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (number, position)
+        shift += 7
+
+
+def _write_value(value: Any, shared: dict[str, int], out: bytearray) -> None:
+    if value is None:
+        out.append(_NULL)
+    elif value is False:
+        out.append(_FALSE)
+    elif value is True:
+        out.append(_TRUE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _write_varint(value * 2 if value >= 0 else -value * 2 - 1, out)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _double.pack(value)
+    elif isinstance(value, str):
+        index = shared.get(value)
+        if index is not None:
+            out.append(_SHARED_STRING)
+            _write_varint(index, out)
+        else:
+            encoded = value.encode("utf-8")
+            out.append(_STRING)
+            _write_varint(len(encoded), out)
+            out += encoded
+    elif isinstance(value, list):
+        out.append(_LIST)
+        _write_varint(len(value), out)
+        for item in value:
+            _write_value(item, shared, out)
+    else:
+        out.append(_OBJECT)
+        _write_varint(len(value), out)
+        for key, item in value.items():
+            _write_value(key, shared, out)
+            _write_value(item, shared, out)
+
+
+def _read_value(data: bytes, position: int, strings: Sequence[str]) -> tuple[Any, int]:
+    kind = data[position]
+    position += 1
+    if kind == _STRING:
+        length, position = _read_varint(data, position)
+        end = position + length
+        return (data[position:end].decode("utf-8"), end)
+    if kind == _SHARED_STRING:
+        index, position = _read_varint(data, position)
+        return (strings[index], position)
+    if kind == _INT:
+        number, position = _read_varint(data, position)
+        return (-(number >> 1) - 1 if number & 1 else number >> 1, position)
+    if kind == _OBJECT:
+        length, position = _read_varint(data, position)
+        obj: dict[str, Any] = {}
+        for _ in range(length):
+            key, position = _read_value(data, position, strings)
+            obj[key], position = _read_value(data, position, strings)
+        return (obj, position)
+    if kind == _LIST:
+        length, position = _read_varint(data, position)
+        items: list[Any] = []
+        for _ in range(length):
+            item, position = _read_value(data, position, strings)
+            items.append(item)
+        return (items, position)
+    if kind == _FLOAT:
+        return (_double.unpack_from(data, position)[0], position + _double.size)
+    if kind == _NULL:
+        return (None, position)
+    if kind == _FALSE:
+        return (False, position)
+    if kind == _TRUE:
+        return (True, position)
+    raise ValueError(f"Unknown record value type {kind}")
+
+
+def encode_record(value: Any, strings: Sequence[str] = ()) -> bytes:
+    """Encode a decoded JSON value as a compact binary record. Integers are
+    written as variable length integers, other strings with their length, and
+    any string in ``strings`` as just its index.
+
+    Args:
+        value (Any): The decoded JSON value.
+        strings (Sequence[str], optional): The strings shared by every record,
+        typically object keys and common values. Defaults to none.
+
+    Returns:
+        bytes: The record.
+    """
+    out = bytearray()
+    _write_value(value, {string: i for i, string in enumerate(strings)}, out)
+    return bytes(out)
+
+
+def decode_record(data: bytes, strings: Sequence[str] = ()) -> Any:
+    """Decode a record written by ``encode_record``.
+
+    Args:
+        data (bytes): The record.
+        strings (Sequence[str], optional): The strings the record was encoded
+        with. Defaults to none.
+
+    Returns:
+        Any: The decoded JSON value.
+    """
+    return _read_value(data, 0, strings)[0]
+
+
+class RecordCodec(ValueCodec):
+    """Stores JSON values as compact binary records, made by
+    ``encode_record``, optionally compressed by a ``ZlibCodec``. Only values
+    exactly as ``json.dumps`` writes them, with the default or compact
+    separators, can be encoded, so decoding gives back the same text.
+    """
+
+    def __init__(
+        self,
+        tag: int,
+        strings: Sequence[str] = (),
+        compression: ZlibCodec | None = None,
+    ) -> None:
+        """Create a new RecordCodec.
+
+        Args:
+            tag (int): The tag identifying values encoded by this codec.
+            strings (Sequence[str], optional): The strings shared by every
+            record. Defaults to none.
+            compression (ZlibCodec | None, optional): The codec to compress
+            records with. Its tag is not used. Defaults to no compression.
+        """
+        super().__init__(tag)
+        self.strings = tuple(strings)
+        self.compression = compression
+        self._shared = {string: i for i, string in enumerate(self.strings)}
+
+    def encode(self, value: str) -> bytes:
+        decoded = json.loads(value)
+        for style, separators in enumerate(_SEPARATORS):
+            if json.dumps(decoded, separators=separators) == value:
+                break
+        else:
+            raise ValueError("Value is not written as json.dumps writes it")
+        out = bytearray((style,))
+        _write_value(decoded, self._shared, out)
+        if self.compression is not None:
+            return self.compression.compress(bytes(out))
+        return bytes(out)
+
+    def decode(self, data: bytes) -> str:
+        if self.compression is not None:
+            data = self.compression.decompress(data)
+        decoded, _ = _read_value(data, 1, self.strings)
+        return json.dumps(decoded, separators=_SEPARATORS[data[0]])
+
+
+_codecs: dict[int, ValueCodec] = {}
+
+
+def register_codec(codec: ValueCodec) -> ValueCodec:
+    """Register a codec, so values it encoded can be decoded by its tag.
+
+    Args:
+        codec (ValueCodec): The codec to register.
+
+    Raises:
+        ValueError: Raised if a different codec is registered with the same
+        tag.
+
+    Returns:
+        ValueCodec: The codec.
+    """
+    registered = _codecs.setdefault(codec.tag, codec)
+    if registered is not codec:
+        raise ValueError(f"A codec is already registered with tag {codec.tag}")
+    return codec
+
+
+def encode_value(value: str, codec: ValueCodec | None) -> str | bytes:
+    """Encode a value for storage. The value is kept as text if there is no
+    codec, the codec cannot encode it, or encoding it would not make it
+    smaller.
+
+    Args:
+        value (str): The value to encode.
+        codec (ValueCodec | None): The codec to encode with.
+
+    Returns:
+        str | bytes: The value as text, or the codec's tag followed by the
+        encoded value.
+    """
+    if codec is None:
+        return value
+    try:
+        data = codec.encode(value)
+    except ValueError:
+        return value
+    if len(data) + 1 >= len(value):
+        return value
+    return bytes((codec.tag,)) + data
+
+
+def decode_value(stored: str | bytes) -> str:
+    """Decode a value stored by ``encode_value``, with the registered codec
+    matching its tag.
+
+    Args:
+        stored (str | bytes): The stored value.
+
+    Raises:
+        ValueError: Raised if no codec is registered for the value's tag.
+
+    Returns:
+        str: The value.
+    """
+    if isinstance(stored, str):
+        return stored
+    codec = _codecs.get(stored[0])
+    if codec is None:
+        raise ValueError(f"No codec is registered with tag {stored[0]}")
+    return codec.decode(stored[1:])
+
+
+class LazyCacheEntry(dict):
+    """A ``CacheEntry`` whose value is only decoded when it is first read, so
+    entries that are checked for freshness and found stale, or never used, are
+    not decoded at all.
+    """
+
+    def __init__(self, stored: str | bytes, updated: float) -> None:
+        """Create a new LazyCacheEntry.
+
+        Args:
+            stored (str | bytes): The value as stored by ``encode_value``.
+            updated (float): The time the value was set.
+        """
+        super().__init__(updated=updated)
+        self._stored: str | bytes | None = stored
+
+    def _load(self) -> None:
+        if self._stored is not None:
+            dict.__setitem__(self, "value", decode_value(self._stored))
+            self._stored = None
+
+    def __missing__(self, key: str) -> Any:
+        if key != "value" or self._stored is None:
+            raise KeyError(key)
+        self._load()
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "value":
+            self._load()
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "value" or super().__contains__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._load()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._load()
+        return super().__len__()
+
+    def keys(self):
+        self._load()
+        return super().keys()
+
+    def values(self):
+        self._load()
+        return super().values()
+
+    def items(self):
+        self._load()
+        return super().items()
+
+    def copy(self) -> CacheEntry:
+        self._load()
+        return {"value": self["value"], "updated": self["updated"]}
+
+    def __eq__(self, other: object) -> bool:
+        self._load()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        self._load()
+        return super().__ne__(other)
+
+    def __repr__(self) -> str:
+        self._load()
+        return super().__repr__()
+
+
+zlib_codec = register_codec(ZlibCodec(1))
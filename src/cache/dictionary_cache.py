@@ -5,17 +5,18 @@ from time import time
 
 class DictionaryCache(Cache):
     """A simple dictionary-based Cache implementation that can be initialized
-    and used in tests.
+    and used in tests. It is never bounded; use ``LRUCache`` for a long-lived
+    in-memory cache.
     """
-    def __init__(self, base_dictionary: Dict[str, CacheEntry] = {}) -> None:
+    def __init__(self, base_dictionary: Dict[str, CacheEntry] | None = None) -> None:
         """Create a new dictionary-based Cache with the provided pre-initialized
         values.
 
         Args:
             base_dictionary (Dict[str, CacheEntry], optional): Any values to be
-            pre-initialized in the cache. Defaults to {}.
+            pre-initialized in the cache. Defaults to an empty dictionary.
         """
-        self._dict = base_dictionary
+        self._dict = base_dictionary if base_dictionary is not None else {}
 
     def get(self, key: str) -> CacheEntry | None:
         """Get a value from the cache. Returns the ``CacheEntry`` or ``None`` if
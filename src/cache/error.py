@@ -0,0 +1,13 @@
+class MissingCacheEntryError(Exception):
+    """Thrown when data must be read from the cache, such as in offline mode,
+    and the cache has no entry for it.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Create a new MissingCacheEntryError.
+
+        Args:
+            key (str): The cache key that has no entry.
+        """
+        super().__init__(f"The cache has no entry for {key!r}")
+        self.key = key
@@ -0,0 +1,102 @@
+from typing import Iterable, Mapping
+from metrics.registry import registry
+from .async_cache import AsyncCache
+from .cache import Cache, CacheEntry
+
+cache_hits_total = registry.counter(
+    "cache_hits_total", "Cache reads that found their key.", ["backend"]
+)
+cache_misses_total = registry.counter(
+    "cache_misses_total", "Cache reads that did not find their key.", ["backend"]
+)
+cache_sets_total = registry.counter("cache_sets_total", "Cache keys set.", ["backend"])
+
+
+class InstrumentedCache(Cache):
+    """Wraps a Cache, counting its hits, misses and sets in the
+    ``cache_*_total`` metrics under the ``backend`` label.
+    """
+
+    def __init__(self, cache: Cache, backend: str) -> None:
+        """Wrap the given Cache.
+
+        Args:
+            cache (Cache): The Cache to wrap.
+            backend (str): The name the cache is recorded under.
+        """
+        self._cache = cache
+        self._backend = backend
+
+    @property
+    def cache(self) -> Cache:
+        """The wrapped Cache."""
+        return self._cache
+
+    def get(self, key: str) -> CacheEntry | None:
+        cache_entry = self._cache.get(key)
+        _count_reads(self._backend, 1, int(cache_entry is not None))
+        return cache_entry
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        key_list = list(keys)
+        entries = self._cache.get_many(key_list)
+        _count_reads(self._backend, len(key_list), len(entries))
+        return entries
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+        cache_sets_total.inc(backend=self._backend)
+
+    def set_many(self, items: Mapping[str, str]) -> None:
+        self._cache.set_many(items)
+        cache_sets_total.inc(len(items), backend=self._backend)
+
+
+class InstrumentedAsyncCache(AsyncCache):
+    """Wraps an AsyncCache, counting its hits, misses and sets in the
+    ``cache_*_total`` metrics under the ``backend`` label.
+    """
+
+    def __init__(self, cache: AsyncCache, backend: str) -> None:
+        """Wrap the given AsyncCache.
+
+        Args:
+            cache (AsyncCache): The AsyncCache to wrap.
+            backend (str): The name the cache is recorded under.
+        """
+        self._cache = cache
+        self._backend = backend
+
+    @property
+    def cache(self) -> AsyncCache:
+        """The wrapped AsyncCache."""
+        return self._cache
+
+    async def get(self, key: str) -> CacheEntry | None:
+        cache_entry = await self._cache.get(key)
+        _count_reads(self._backend, 1, int(cache_entry is not None))
+        return cache_entry
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        key_list = list(keys)
+        entries = await self._cache.get_many(key_list)
+        _count_reads(self._backend, len(key_list), len(entries))
+        return entries
+
+    async def set(self, key: str, value: str) -> None:
+        await self._cache.set(key, value)
+        cache_sets_total.inc(backend=self._backend)
+
+    async def set_many(self, items: Mapping[str, str]) -> None:
+        await self._cache.set_many(items)
+        cache_sets_total.inc(len(items), backend=self._backend)
+
+    async def close(self) -> None:
+        await self._cache.close()
+
+
+def _count_reads(backend: str, reads: int, hits: int) -> None:
+    if hits:
+        cache_hits_total.inc(hits, backend=backend)
+    if reads > hits:
+        cache_misses_total.inc(reads - hits, backend=backend)
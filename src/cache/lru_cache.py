@@ -0,0 +1,147 @@
+from .cache import Cache, CacheEntry
+from collections import OrderedDict
+from typing import Callable
+from time import time
+
+
+class LRUCache(Cache):
+    """A bounded in-memory Cache implementation. Once the cache holds more than
+    ``max_entries`` entries or ``max_bytes`` bytes of keys and values, the least
+    recently used entries are evicted. Entries whose ``updated`` time is older
+    than ``ttl`` seconds are treated as missing and dropped when read.
+
+    Hits, misses, evictions and expirations are counted in the ``hits``,
+    ``misses``, ``evictions`` and ``expirations`` attributes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        """Create a new, empty LRUCache. Any bound left as ``None`` is not
+        enforced.
+
+        Args:
+            max_entries (int | None, optional): The maximum number of entries
+            to hold. Defaults to None.
+            max_bytes (int | None, optional): The maximum total size of the
+            UTF-8 encoded keys and values to hold. Defaults to None.
+            ttl (float | None, optional): The number of seconds after an
+            entry's ``updated`` time that it expires. Defaults to None.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.time``.
+
+        Raises:
+            ValueError: Raised if ``max_entries`` or ``max_bytes`` is less than
+            1, or ``ttl`` is negative.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the UTF-8 encoded keys and values held."""
+        return self._total_bytes
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Get a value from the cache and mark it as most recently used.
+        Returns ``None`` if the key is not set or has expired.
+
+        Args:
+            key (str): The key to retrieve.
+
+        Returns:
+            CacheEntry | None: The CacheEntry, or None if not set or expired.
+        """
+        cache_entry = self._entries.get(key)
+        if cache_entry is None:
+            self.misses += 1
+            return None
+        if self._is_expired(cache_entry):
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cache_entry
+
+    def set(self, key: str, value: str) -> None:
+        """Set the specified key in the cache to the value provided, evicting
+        the least recently used entries if a bound is exceeded.
+
+        Args:
+            key (str): The key to set.
+            value (str): The value to set the key to.
+        """
+        self.put_entry(key, {"value": value, "updated": int(self._clock())})
+
+    def put_entry(self, key: str, cache_entry: CacheEntry) -> None:
+        """Store a complete CacheEntry, keeping its ``updated`` time rather than
+        stamping it with the current time. Used to copy entries in from another
+        cache.
+
+        Args:
+            key (str): The key to set.
+            cache_entry (CacheEntry): The entry to store.
+        """
+        if key in self._entries:
+            self._remove(key)
+        size = len(key.encode("utf-8")) + len(cache_entry["value"].encode("utf-8"))
+        self._entries[key] = cache_entry
+        self._sizes[key] = size
+        self._total_bytes += size
+        self._evict()
+
+    def _is_expired(self, cache_entry: CacheEntry) -> bool:
+        """Check whether an entry is older than the configured ttl.
+
+        Args:
+            cache_entry (CacheEntry): The entry to check.
+
+        Returns:
+            bool: Whether the entry has expired.
+        """
+        if self._ttl is None:
+            return False
+        return self._clock() - cache_entry["updated"] > self._ttl
+
+    def _remove(self, key: str) -> None:
+        """Remove a key and its size accounting.
+
+        Args:
+            key (str): The key to remove.
+        """
+        del self._entries[key]
+        self._total_bytes -= self._sizes.pop(key)
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until every bound is met."""
+        while self._entries and (
+            (self._max_entries is not None and len(self._entries) > self._max_entries)
+            or (self._max_bytes is not None and self._total_bytes > self._max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
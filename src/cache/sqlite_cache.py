@@ -1,32 +1,140 @@
 from .cache import Cache, CacheEntry
+from .codec import (
+    LazyCacheEntry,
+    ValueCodec,
+    decode_value,
+    encode_value,
+    register_codec,
+    zlib_codec,
+)
+from typing import Iterable, Mapping, cast
 import sqlite3
 from inspect import cleandoc
 from time import time
 import os
 
+# Bulk reads are split into chunks so a single statement never exceeds
+# SQLite's host parameter limit (999 on older builds).
+MAX_KEYS_PER_SELECT = 512
+
+# The version of the cache table's schema, kept in the database's
+# ``user_version``. Version 0 is the original table without namespaces.
+SCHEMA_VERSION = 1
+
+# The statements upgrading the schema from each version to the next, by the
+# version they upgrade from.
+_migrations: tuple[tuple[str, ...], ...] = (
+    (
+        "ALTER TABLE cache ADD COLUMN namespace TEXT NOT NULL DEFAULT ''",
+        cleandoc(
+            """
+            UPDATE cache SET namespace = substr(key, 1, instr(key, ':') - 1)
+            WHERE instr(key, ':') > 0
+            """
+        ),
+        "CREATE INDEX cache_namespace_updated ON cache (namespace, updated)",
+    ),
+)
+
+
+def _select_many_sql(count: int) -> str:
+    """Builds the SELECT used to read ``count`` keys at once.
+
+    Args:
+        count (int): The number of key parameters in the statement.
+
+    Returns:
+        str: The parameterized SELECT statement.
+    """
+    placeholders = ", ".join("?" * count)
+    return f"SELECT key, value, updated FROM cache WHERE key IN ({placeholders})"
+
+
+def key_namespace(key: str) -> str:
+    """Gets the namespace a key is stored in: the part of the key before its
+    first ``:``, such as ``app_hover`` for ``app_hover:10``.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        str: The namespace, or an empty string if the key has no ``:``.
+    """
+    namespace, separator, _ = key.partition(":")
+    return namespace if separator else ""
+
+
+def _cache_entry(stored: str | bytes, updated: int) -> CacheEntry:
+    """Builds the CacheEntry for a stored value, decoding blobs lazily."""
+    if isinstance(stored, bytes):
+        return cast(CacheEntry, LazyCacheEntry(stored, updated))
+    return {"value": stored, "updated": updated}
+
 
 class SQLiteCache(Cache):
     """Creates a cache object which uses the file at ``filePath`` as the SQLite
     database file. If the file does not exist, it will be created. If it does
     exist, the existing information will be used.
+
+    The database is opened in WAL journal mode so readers are not blocked by a
+    writer, and every write is committed in its own transaction. Use
+    ``set_many`` to write many keys in a single transaction.
+
+    Values are stored as blobs encoded by ``codec`` where that makes them
+    smaller, and as plain text otherwise. Blobs are only decoded when an
+    entry's value is first read. Text rows written before a codec was used keep
+    working, and ``recode`` rewrites them with the current codec.
+
+    Every key is stored in the namespace given by ``key_namespace``, indexed
+    with its ``updated`` time, so ``purge_older_than`` deletes stale entries of
+    one kind without a table scan. Freed pages are returned to the file system
+    with ``vacuum_incremental``. Databases written by older versions are
+    migrated when opened, but only get incremental vacuuming once
+    ``enable_incremental_vacuum`` is run; until then, freed pages are reused
+    rather than returned.
     """
 
-    def __init__(self, filePath: str | bytes | os.PathLike) -> None:
+    def __init__(
+        self,
+        filePath: str | bytes | os.PathLike,
+        check_same_thread: bool = True,
+        codec: ValueCodec | None = zlib_codec,
+    ) -> None:
         """Create a new SQLiteCache using the specified file as a database.
 
         Args:
             filePath (str): The file to use for the database.
+            check_same_thread (bool, optional): Whether using the cache from a
+            thread other than the one that created it is an error. Only
+            disable this if access is serialized some other way. Defaults to
+            True.
+            codec (ValueCodec | None, optional): The codec to encode new values
+            with, or None to store them as text. It is registered, so values it
+            encodes can be decoded. Defaults to ``zlib_codec``.
         """
         parent_dir = os.path.dirname(filePath)
         if not os.path.exists(parent_dir):
             os.makedirs(parent_dir)
-        self._con = sqlite3.connect(filePath)
+        self._codec = codec if codec is None else register_codec(codec)
+        self._con = sqlite3.connect(filePath, check_same_thread=check_same_thread)
         self._cur = self._con.cursor()
-        self._create_table()
+        # Only takes effect here for a new database, before WAL mode is set.
+        self._cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._cur.execute("PRAGMA journal_mode=WAL")
+        self._cur.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
 
     def __del__(self) -> None:
         """Close connection to the file database."""
-        self._con.close()
+        self.close()
+
+    def close(self) -> None:
+        """Close connection to the file database. The cache cannot be used
+        afterwards.
+        """
+        con = getattr(self, "_con", None)
+        if con is not None:
+            con.close()
 
     def get(self, key: str) -> CacheEntry | None:
         """Get the specified key.
@@ -38,20 +146,37 @@ class SQLiteCache(Cache):
             CacheEntry | None: The CacheEntry associated with the key, or None if not set
         """
         res = self._cur.execute(
-            cleandoc(
-                f"""
-                SELECT value, updated FROM cache WHERE key='{key}'
-                """
-            )
+            "SELECT value, updated FROM cache WHERE key = ?",
+            (key,),
         )
-        row: tuple[str, int] | None = res.fetchone()
+        row: tuple[str | bytes, int] | None = res.fetchone()
         if row is None:
             return None
-        cache_entry: CacheEntry = {
-            "value": row[0],
-            "updated": row[1],
-        }
-        return cache_entry
+        return _cache_entry(row[0], row[1])
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get several keys with as few statements as possible. Each chunk of
+        keys is padded to a power of two so only a handful of distinct
+        statements are ever prepared, and they stay in the connection's
+        statement cache.
+
+        Args:
+            keys (Iterable[str]): The keys to fetch
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that is set.
+            Keys that are not set are omitted.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        entries: dict[str, CacheEntry] = {}
+        for start in range(0, len(unique_keys), MAX_KEYS_PER_SELECT):
+            chunk = unique_keys[start : start + MAX_KEYS_PER_SELECT]
+            padded_size = 1 << (len(chunk) - 1).bit_length()
+            chunk.extend(chunk[-1:] * (padded_size - len(chunk)))
+            res = self._cur.execute(_select_many_sql(padded_size), chunk)
+            for key, value, updated in res:
+                entries[key] = _cache_entry(value, updated)
+        return entries
 
     def set(self, key: str, value: str) -> None:
         """Set the given key to the provided value.
@@ -60,21 +185,224 @@ class SQLiteCache(Cache):
             key (str): The key to set
             value (str): The value to set the key to
         """
-        self._cur.execute(
-            "REPLACE INTO cache (key, value, updated) VALUES(?, ?, ?)",
-            (key, value, int(time())),
+        with self._con:
+            self._cur.execute(
+                "REPLACE INTO cache (key, namespace, value, updated) VALUES(?, ?, ?, ?)",
+                (
+                    key,
+                    key_namespace(key),
+                    encode_value(value, self._codec),
+                    int(time()),
+                ),
+            )
+
+    def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys in a single transaction.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key
+        """
+        updated = int(time())
+        with self._con:
+            self._cur.executemany(
+                "REPLACE INTO cache (key, namespace, value, updated) VALUES(?, ?, ?, ?)",
+                (
+                    (key, key_namespace(key), encode_value(value, self._codec), updated)
+                    for key, value in items.items()
+                ),
+            )
+
+    def recode_batch(self, after: str | None, limit: int) -> tuple[str | None, int]:
+        """Rewrite the values of up to ``limit`` keys, in key order, with the
+        current codec, in a single transaction. Their ``updated`` times are
+        kept.
+
+        Args:
+            after (str | None): The last key of the previous batch, or None to
+            start from the first key.
+            limit (int): The number of keys to look at.
+
+        Returns:
+            tuple[str | None, int]: The last key looked at, or None if there
+            were none left, and the number of values rewritten.
+        """
+        if after is None:
+            res = self._cur.execute(
+                "SELECT key, value FROM cache ORDER BY key LIMIT ?", (limit,)
+            )
+        else:
+            res = self._cur.execute(
+                "SELECT key, value FROM cache WHERE key > ? ORDER BY key LIMIT ?",
+                (after, limit),
+            )
+        rows: list[tuple[str, str | bytes]] = res.fetchall()
+        if not rows:
+            return (None, 0)
+        recoded: list[tuple[str | bytes, str]] = []
+        for key, stored in rows:
+            if self._codec is not None and isinstance(stored, bytes):
+                if stored[0] == self._codec.tag:
+                    continue
+            encoded = encode_value(decode_value(stored), self._codec)
+            if encoded != stored:
+                recoded.append((encoded, key))
+        with self._con:
+            self._cur.executemany("UPDATE cache SET value = ? WHERE key = ?", recoded)
+        return (rows[-1][0], len(recoded))
+
+    def recode(self, batch_size: int = 512) -> int:
+        """Rewrite every value with the current codec, such as text rows
+        written before a codec was used, keeping their ``updated`` times. Each
+        batch of keys is rewritten in its own transaction.
+
+        Args:
+            batch_size (int, optional): The number of keys per transaction.
+            Defaults to 512.
+
+        Returns:
+            int: The number of values rewritten.
+        """
+        after: str | None = None
+        total = 0
+        while True:
+            after, count = self.recode_batch(after, batch_size)
+            if after is None:
+                return total
+            total += count
+
+    def namespaces(self) -> list[str]:
+        """Get every namespace with at least one key.
+
+        Returns:
+            list[str]: The namespaces, in order.
+        """
+        res = self._cur.execute("SELECT DISTINCT namespace FROM cache ORDER BY namespace")
+        return [row[0] for row in res]
+
+    def purge_batch(self, namespace: str, timestamp: float, limit: int) -> int:
+        """Delete up to ``limit`` keys in ``namespace`` last updated before
+        ``timestamp``, in a single transaction.
+
+        Args:
+            namespace (str): The namespace to delete from.
+            timestamp (float): The time before which keys are deleted.
+            limit (int): The most keys to delete.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        with self._con:
+            res = self._cur.execute(
+                cleandoc(
+                    """
+                    DELETE FROM cache WHERE key IN (
+                        SELECT key FROM cache
+                        WHERE namespace = ? AND updated < ?
+                        LIMIT ?
+                    )
+                    """
+                ),
+                (namespace, timestamp, limit),
+            )
+        return res.rowcount
+
+    def purge_older_than(
+        self, namespace: str | None, timestamp: float, batch_size: int = 512
+    ) -> int:
+        """Delete every key last updated before ``timestamp``. Each batch of
+        keys is deleted in its own transaction, so writers from other
+        connections are not held up for long. Readers never are.
+
+        Args:
+            namespace (str | None): The namespace to delete from, or None for
+            every namespace.
+            timestamp (float): The time before which keys are deleted.
+            batch_size (int, optional): The number of keys per transaction.
+            Defaults to 512.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+        namespaces = self.namespaces() if namespace is None else [namespace]
+        total = 0
+        for namespace in namespaces:
+            while count := self.purge_batch(namespace, timestamp, batch_size):
+                total += count
+        return total
+
+    def vacuum_incremental(self, pages: int | None = None) -> int:
+        """Return free pages, such as those left by purged keys, to the file
+        system, shrinking the database file.
+
+        Args:
+            pages (int | None, optional): The most pages to free, or None to
+            free all of them. Defaults to None.
+
+        Returns:
+            int: The number of pages freed.
+        """
+        before = self._cur.execute("PRAGMA freelist_count").fetchone()[0]
+        # The pragma frees one page per step, and only executescript steps a
+        # statement without result columns to completion.
+        self._con.executescript(f"PRAGMA incremental_vacuum({int(pages or 0)})")
+        return before - self._cur.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Give a database created without incremental vacuuming, by an older
+        version, the ability to use ``vacuum_incremental``. This rewrites the
+        whole file with a full vacuum, blocking every other connection while
+        it runs, so it is a one-off maintenance step rather than part of
+        opening the cache.
+
+        Returns:
+            bool: Whether the database needed it.
+        """
+        if self._cur.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        self._cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._cur.execute("VACUUM")
+        return True
+
+    def _migrate(self) -> None:
+        """Create the cache table, or bring an existing one up to
+        ``SCHEMA_VERSION``.
+        """
+        table_exists = (
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cache'"
         )
+        if self._cur.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        self._cur.execute("BEGIN IMMEDIATE")
+        try:
+            # Read again now that no other connection can migrate meanwhile.
+            version = self._cur.execute("PRAGMA user_version").fetchone()[0]
+            if self._cur.execute(table_exists).fetchone() is None:
+                self._create_table()
+            else:
+                for statements in _migrations[version:]:
+                    for statement in statements:
+                        self._cur.execute(statement)
+            self._cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except BaseException:
+            self._con.rollback()
+            raise
+        self._con.commit()
 
     def _create_table(self) -> None:
-        """Create the cache table if it does not exist."""
+        """Create the cache table and its index at the current schema
+        version."""
         self._cur.execute(
             cleandoc(
-                f"""
-                CREATE TABLE IF NOT EXISTS cache (
+                """
+                CREATE TABLE cache (
                     key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL DEFAULT '',
                     value TEXT NOT NULL,
                     updated INTEGER DEFAULT 0
-                ) WITHOUT ROWID;
+                ) WITHOUT ROWID
                 """
             )
         )
+        self._cur.execute(
+            "CREATE INDEX cache_namespace_updated ON cache (namespace, updated)"
+        )
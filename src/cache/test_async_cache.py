@@ -0,0 +1,22 @@
+import unittest
+from .async_cache import AsyncCacheAdapter
+from .dictionary_cache import DictionaryCache
+
+
+class TestAsyncCacheAdapter(unittest.IsolatedAsyncioTestCase):
+    async def test_exists(self):
+        cache = AsyncCacheAdapter(DictionaryCache())
+        await cache.set("some_key", "some_value")
+        cache_entry = await cache.get("some_key")
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], "some_value")
+        self.assertIs((await cache.get_many(["some_key"]))["some_key"], cache_entry)
+
+    async def test_does_not_exist(self):
+        cache = AsyncCacheAdapter(DictionaryCache())
+        self.assertIs(await cache.get("some_key"), None)
+        self.assertEqual(await cache.get_many(["some_key"]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
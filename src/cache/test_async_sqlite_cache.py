@@ -0,0 +1,128 @@
+import json
+import unittest
+import asyncio
+import threading
+from unittest.mock import patch
+from from_root import from_root
+from .async_sqlite_cache import AsyncSQLiteCache
+from .sqlite_cache import SQLiteCache
+
+db_path = from_root(".cache", "test_async_sqlite_cache.db")
+wal_path = db_path.with_name(db_path.name + "-wal")
+shm_path = db_path.with_name(db_path.name + "-shm")
+
+
+class TestAsyncSQLiteCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.cache = AsyncSQLiteCache(db_path, readers=2)
+
+    async def asyncTearDown(self) -> None:
+        await self.cache.close()
+        for path in (db_path, wal_path, shm_path):
+            path.unlink(missing_ok=True)
+
+    async def test_exists(self):
+        test_key = "some_key"
+        expected_value = "some_value"
+        await self.cache.set(test_key, expected_value)
+        cache_entry = await self.cache.get(test_key)
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], expected_value)
+
+    async def test_does_not_exist(self):
+        cache_entry = await self.cache.get("some_key")
+        self.assertIs(cache_entry, None)
+
+    async def test_set_many_get_many(self):
+        items = {f"key_{i}": f"value_{i}" for i in range(100)}
+        await self.cache.set_many(items)
+        entries = await self.cache.get_many(items.keys())
+        self.assertEqual({key: entry["value"] for key, entry in entries.items()}, items)
+
+    async def test_concurrent_reads_and_writes(self):
+        await asyncio.gather(
+            *(self.cache.set(f"key_{i}", f"value_{i}") for i in range(20))
+        )
+        entries = await asyncio.gather(
+            *(self.cache.get(f"key_{i}") for i in range(20))
+        )
+        self.assertTrue(all(entry is not None for entry in entries))
+
+    async def test_runs_off_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        threads: set[int] = set()
+        original_get = SQLiteCache.get
+
+        def recording_get(cache, key):
+            threads.add(threading.get_ident())
+            return original_get(cache, key)
+
+        with patch.object(SQLiteCache, "get", recording_get):
+            await self.cache.get("some_key")
+        self.assertNotIn(loop_thread, threads)
+        self.assertEqual(len(threads), 1)
+
+    async def test_shares_file_with_sqlite_cache(self):
+        await self.cache.set("some_key", "some_value")
+        sync_cache = SQLiteCache(db_path)
+        cache_entry = sync_cache.get("some_key")
+        sync_cache.close()
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], "some_value")
+
+    async def test_recode(self):
+        value = json.dumps({"strDescription": "a long description " * 50})
+        sync_cache = SQLiteCache(db_path, codec=None)
+        sync_cache.set_many({f"key_{i}": value for i in range(5)})
+        sync_cache.close()
+        self.assertEqual(await self.cache.recode(batch_size=2), 5)
+        entries = await self.cache.get_many(f"key_{i}" for i in range(5))
+        self.assertEqual({entry["value"] for entry in entries.values()}, {value})
+
+    async def test_purge_and_vacuum(self):
+        await self.cache.set_many({f"app_hover:{i}": f"value_{i}" * 100 for i in range(200)})
+        await self.cache.set("custom_id:gabe", "76561197960287930")
+        self.assertEqual(
+            await self.cache.purge_older_than(None, float("inf"), batch_size=64), 201
+        )
+        self.assertEqual(await self.cache.get_many(["app_hover:0", "custom_id:gabe"]), {})
+        self.assertGreaterEqual(await self.cache.vacuum_incremental(batch_pages=4), 0)
+
+    async def test_maintain(self):
+        await self.cache.set("app_hover:10", "value")
+        await self.cache.set("custom_id:gabe", "76561197960287930")
+        maintenance = asyncio.create_task(
+            self.cache.maintain({"app_hover": 10}, interval=60, clock=lambda: 2**40)
+        )
+        await asyncio.sleep(0.1)
+        maintenance.cancel()
+        self.assertIsNone(await self.cache.get("app_hover:10"))
+        self.assertIsNotNone(await self.cache.get("custom_id:gabe"))
+
+    async def test_maintain_survives_errors(self):
+        calls = 0
+        purge_older_than = self.cache.purge_older_than
+
+        async def failing_purge(namespace, timestamp):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise OSError("disk I/O error")
+            return await purge_older_than(namespace, timestamp)
+
+        await self.cache.set("app_hover:10", "value")
+        with patch.object(self.cache, "purge_older_than", failing_purge):
+            with self.assertLogs("cache.async_sqlite_cache", "ERROR"):
+                maintenance = asyncio.create_task(
+                    self.cache.maintain(
+                        {"app_hover": 10}, interval=0.01, clock=lambda: 2**40
+                    )
+                )
+                await asyncio.sleep(0.1)
+                maintenance.cancel()
+        self.assertGreater(calls, 1)
+        self.assertIsNone(await self.cache.get("app_hover:10"))
+
+
+if __name__ == "__main__":
+    unittest.main()
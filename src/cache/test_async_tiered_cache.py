@@ -0,0 +1,33 @@
+import unittest
+from .async_cache import AsyncCacheAdapter
+from .async_tiered_cache import AsyncTieredCache
+from .dictionary_cache import DictionaryCache
+
+
+class TestAsyncTieredCache(unittest.IsolatedAsyncioTestCase):
+    async def test_promotes_l2_hits(self):
+        expected_updated = 123456789
+        l2 = DictionaryCache({"some_key": {"value": "some_value", "updated": expected_updated}})
+        cache = AsyncTieredCache(AsyncCacheAdapter(l2))
+        await cache.get("some_key")
+        l1_entry = cache.l1.get("some_key")
+        assert l1_entry is not None
+        self.assertEqual(l1_entry["updated"], expected_updated)
+
+    async def test_write_through(self):
+        l2 = DictionaryCache()
+        cache = AsyncTieredCache(AsyncCacheAdapter(l2))
+        await cache.set("some_key", "some_value")
+        self.assertIsNot(l2.get("some_key"), None)
+        self.assertIsNot(cache.l1.get("some_key"), None)
+
+    async def test_get_many(self):
+        l2 = DictionaryCache({"b": {"value": "2", "updated": 0}})
+        cache = AsyncTieredCache(AsyncCacheAdapter(l2))
+        await cache.set("a", "1")
+        entries = await cache.get_many(["a", "b", "c"])
+        self.assertEqual(set(entries), {"a", "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import unittest
+from unittest.mock import patch
+from . import codec
+from .codec import (
+    LazyCacheEntry,
+    RecordCodec,
+    ZlibCodec,
+    decode_record,
+    decode_value,
+    encode_record,
+    encode_value,
+    register_codec,
+    zlib_codec,
+)
+
+hover = {
+    "strReleaseDate": "Nov 1, 2000",
+    "strDescription": "A game about éclairs " * 20,
+    "rgScreenshots": [{"appid": 10, "id": 0, "filename": "ss_1.jpg", "all_ages": "1"}],
+    "ReviewSummary": {"cReviews": 100, "nReviewScore": -3, "ratio": 0.9, "hidden": None},
+    "flags": [True, False],
+}
+
+
+class TestRecord(unittest.TestCase):
+    def test_round_trip(self):
+        strings = ("appid", "all_ages", "1")
+        record = encode_record(hover, strings)
+        self.assertEqual(decode_record(record, strings), hover)
+
+    def test_shared_strings_are_smaller(self):
+        self.assertLess(
+            len(encode_record(hover, ("strDescription", "rgScreenshots"))),
+            len(encode_record(hover)),
+        )
+
+    def test_large_integers(self):
+        for number in (0, -1, 127, 128, 2**70, -(2**70)):
+            self.assertEqual(decode_record(encode_record(number)), number)
+
+
+class TestCodecs(unittest.TestCase):
+    def test_zlib_round_trip(self):
+        value = json.dumps(hover)
+        for compressor in (ZlibCodec(200), ZlibCodec(201, b'"strReleaseDate": "')):
+            self.assertEqual(compressor.decode(compressor.encode(value)), value)
+
+    def test_dictionary_is_smaller(self):
+        value = json.dumps({"strReleaseDate": "Nov 1, 2000"})
+        dictionary = b'{"strReleaseDate": "Nov 1, 2000"}'
+        self.assertLess(
+            len(ZlibCodec(200, dictionary).encode(value)),
+            len(ZlibCodec(200).encode(value)),
+        )
+
+    def test_record_codec_keeps_separators(self):
+        record_codec = RecordCodec(200, ("appid",), ZlibCodec(200))
+        for separators in ((", ", ": "), (",", ":")):
+            value = json.dumps(hover, separators=separators)
+            self.assertEqual(record_codec.decode(record_codec.encode(value)), value)
+
+    def test_record_codec_rejects_other_text(self):
+        record_codec = RecordCodec(200)
+        for value in ("not json", '{"a":1, "b": 2}', '{"a": 1.0e3}'):
+            with self.assertRaises(ValueError):
+                record_codec.encode(value)
+
+    def test_invalid_tag(self):
+        with self.assertRaises(ValueError):
+            ZlibCodec(0)
+
+
+class TestValues(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(codec._codecs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_encodes_with_tag(self):
+        value = json.dumps(hover)
+        stored = encode_value(value, zlib_codec)
+        assert isinstance(stored, bytes)
+        self.assertEqual(stored[0], zlib_codec.tag)
+        self.assertLess(len(stored), len(value))
+        self.assertEqual(decode_value(stored), value)
+
+    def test_keeps_text(self):
+        self.assertEqual(encode_value("76561197960287930", zlib_codec), "76561197960287930")
+        self.assertEqual(encode_value(json.dumps(hover), None), json.dumps(hover))
+        self.assertEqual(encode_value("not json" * 20, RecordCodec(200)), "not json" * 20)
+        self.assertEqual(decode_value("some_value"), "some_value")
+
+    def test_unknown_tag(self):
+        with self.assertRaises(ValueError):
+            decode_value(bytes((200,)) + b"data")
+
+    def test_register_conflict(self):
+        register_codec(ZlibCodec(200))
+        with self.assertRaises(ValueError):
+            register_codec(ZlibCodec(200))
+
+
+class TestLazyCacheEntry(unittest.TestCase):
+    def test_decodes_once_on_first_read(self):
+        value = json.dumps(hover)
+        entry = LazyCacheEntry(encode_value(value, zlib_codec), 5)
+        with patch.object(codec, "decode_value", wraps=decode_value) as decode:
+            self.assertEqual(entry["updated"], 5)
+            decode.assert_not_called()
+            self.assertEqual(entry["value"], value)
+            self.assertEqual(entry.get("value"), value)
+            decode.assert_called_once()
+
+    def test_behaves_like_cache_entry(self):
+        value = json.dumps(hover)
+        expected = {"value": value, "updated": 5}
+        self.assertEqual(LazyCacheEntry(encode_value(value, zlib_codec), 5), expected)
+        self.assertEqual(dict(LazyCacheEntry(encode_value(value, zlib_codec), 5)), expected)
+        self.assertIn("value", LazyCacheEntry(encode_value(value, zlib_codec), 5))
+        with self.assertRaises(KeyError):
+            LazyCacheEntry(encode_value(value, zlib_codec), 5)["missing"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,19 @@ class TestDictionaryCache(unittest.TestCase):
         cache_entry = cache.get(test_key)
         self.assertIs(cache_entry, None)
 
+    def test_instances_do_not_share_storage(self):
+        first_cache = DictionaryCache()
+        first_cache.set("some_key", "some_value")
+        second_cache = DictionaryCache()
+        self.assertIs(second_cache.get("some_key"), None)
+
+    def test_set_many_get_many(self):
+        cache = DictionaryCache({})
+        cache.set_many({"key_1": "value_1", "key_2": "value_2"})
+        entries = cache.get_many(["key_1", "key_2", "key_3"])
+        self.assertEqual(set(entries), {"key_1", "key_2"})
+        self.assertEqual(entries["key_2"]["value"], "value_2")
+
 
 if __name__ == "__main__":
     unittest.main()
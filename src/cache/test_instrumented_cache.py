@@ -0,0 +1,47 @@
+import unittest
+from .async_cache import AsyncCacheAdapter
+from .dictionary_cache import DictionaryCache
+from .instrumented_cache import (
+    InstrumentedAsyncCache,
+    InstrumentedCache,
+    cache_hits_total,
+    cache_misses_total,
+    cache_sets_total,
+)
+
+
+def counts(backend: str) -> tuple[float, float, float]:
+    return (
+        cache_hits_total.value(backend=backend),
+        cache_misses_total.value(backend=backend),
+        cache_sets_total.value(backend=backend),
+    )
+
+
+class TestInstrumentedCache(unittest.TestCase):
+    def test_counts(self):
+        cache = InstrumentedCache(DictionaryCache(), "test_sync")
+        before = counts("test_sync")
+        cache.set("a", "1")
+        cache.set_many({"b": "2", "c": "3"})
+        self.assertEqual(cache.get("a")["value"], "1")
+        self.assertIsNone(cache.get("z"))
+        self.assertEqual(len(cache.get_many(["b", "c", "y"])), 2)
+        after = counts("test_sync")
+        self.assertEqual(tuple(a - b for a, b in zip(after, before)), (3, 2, 3))
+
+
+class TestInstrumentedAsyncCache(unittest.IsolatedAsyncioTestCase):
+    async def test_counts(self):
+        cache = InstrumentedAsyncCache(AsyncCacheAdapter(DictionaryCache()), "test_async")
+        before = counts("test_async")
+        await cache.set("a", "1")
+        self.assertEqual((await cache.get("a"))["value"], "1")
+        self.assertEqual(await cache.get_many(["a", "b"]), {"a": await cache.cache.get("a")})
+        after = counts("test_async")
+        self.assertEqual(tuple(a - b for a, b in zip(after, before)), (2, 1, 1))
+        await cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
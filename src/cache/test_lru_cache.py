@@ -0,0 +1,81 @@
+import unittest
+from .lru_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_exists(self):
+        cache = LRUCache()
+        cache.set("some_key", "some_value")
+        cache_entry = cache.get("some_key")
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], "some_value")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+    def test_does_not_exist(self):
+        cache = LRUCache()
+        self.assertIs(cache.get("some_key"), None)
+        self.assertEqual(cache.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertIs(cache.get("b"), None)
+        self.assertIsNot(cache.get("a"), None)
+        self.assertIsNot(cache.get("c"), None)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", "1234")
+        cache.set("b", "1234")
+        self.assertEqual(cache.total_bytes, 10)
+        cache.set("c", "1234")
+        self.assertIs(cache.get("a"), None)
+        self.assertEqual(cache.total_bytes, 10)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_overwrite_updates_size(self):
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", "12345678")
+        cache.set("a", "1")
+        self.assertEqual(cache.total_bytes, 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=60, clock=clock)
+        cache.set("some_key", "some_value")
+        clock.now += 60
+        self.assertIsNot(cache.get("some_key"), None)
+        clock.now += 1
+        self.assertIs(cache.get("some_key"), None)
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_put_entry_keeps_updated(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=60, clock=clock)
+        cache.put_entry("some_key", {"value": "some_value", "updated": 900})
+        self.assertIs(cache.get("some_key"), None)
+
+    def test_invalid_bounds(self):
+        self.assertRaises(ValueError, lambda: LRUCache(max_entries=0))
+        self.assertRaises(ValueError, lambda: LRUCache(max_bytes=0))
+        self.assertRaises(ValueError, lambda: LRUCache(ttl=-1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,14 @@
+import json
+import os
+import sqlite3
 import unittest
 from from_root import from_root
-from .sqlite_cache import SQLiteCache
+from .codec import LazyCacheEntry
+from .sqlite_cache import SCHEMA_VERSION, SQLiteCache, key_namespace
 
 db_path = from_root(".cache", "test_sqlite_cache.db")
+wal_path = db_path.with_name(db_path.name + "-wal")
+shm_path = db_path.with_name(db_path.name + "-shm")
 
 
 class TestSQLiteCache(unittest.TestCase):
@@ -10,7 +16,9 @@ class TestSQLiteCache(unittest.TestCase):
         self.cache = SQLiteCache(db_path)
 
     def tearDown(self) -> None:
-        db_path.unlink(missing_ok=True)
+        self.cache.close()
+        for path in (db_path, wal_path, shm_path):
+            path.unlink(missing_ok=True)
 
     def test_exists(self):
         test_key = "some_key"
@@ -25,6 +33,132 @@ class TestSQLiteCache(unittest.TestCase):
         cache_entry = self.cache.get(test_key)
         self.assertIs(cache_entry, None)
 
+    def test_key_is_not_interpolated(self):
+        test_key = "it's a key"
+        self.cache.set(test_key, "some_value")
+        cache_entry = self.cache.get(test_key)
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], "some_value")
+
+    def test_persists_after_reopen(self):
+        self.cache.set("some_key", "some_value")
+        self.cache.close()
+        self.cache = SQLiteCache(db_path)
+        cache_entry = self.cache.get("some_key")
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], "some_value")
+
+    def test_wal_mode(self):
+        mode = self.cache._cur.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_set_many_get_many(self):
+        items = {f"key_{i}": f"value_{i}" for i in range(1200)}
+        self.cache.set_many(items)
+        entries = self.cache.get_many([*items.keys(), "missing_key"])
+        self.assertEqual(len(entries), len(items))
+        self.assertNotIn("missing_key", entries)
+        for key, value in items.items():
+            self.assertEqual(entries[key]["value"], value)
+
+    def test_get_many_empty(self):
+        self.assertEqual(self.cache.get_many([]), {})
+
+    def stored_type(self, key: str) -> str:
+        return self.cache._cur.execute(
+            "SELECT typeof(value) FROM cache WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+    def test_compresses_large_values(self):
+        value = json.dumps({"strDescription": "a long description " * 50})
+        self.cache.set("large", value)
+        self.cache.set("small", "some_value")
+        self.assertEqual(self.stored_type("large"), "blob")
+        self.assertEqual(self.stored_type("small"), "text")
+        large = self.cache.get("large")
+        assert large is not None
+        self.assertIsInstance(large, LazyCacheEntry)
+        self.assertEqual(large["value"], value)
+        self.assertEqual(self.cache.get_many(["large"])["large"]["value"], value)
+
+    def test_reads_text_rows_and_recodes_them(self):
+        value = json.dumps({"strDescription": "a long description " * 50})
+        self.cache.close()
+        self.cache = SQLiteCache(db_path, codec=None)
+        self.cache.set_many({f"key_{i}": value for i in range(5)})
+        self.cache.set("small", "some_value")
+        self.assertEqual(self.stored_type("key_0"), "text")
+        self.cache._cur.execute("UPDATE cache SET updated = 1")
+        self.cache._con.commit()
+        self.cache.close()
+
+        self.cache = SQLiteCache(db_path)
+        self.assertEqual(self.cache.get("key_0"), {"value": value, "updated": 1})
+        self.assertEqual(self.cache.recode(batch_size=2), 5)
+        self.assertEqual(self.stored_type("key_0"), "blob")
+        self.assertEqual(self.stored_type("small"), "text")
+        self.assertEqual(self.cache.get("key_4"), {"value": value, "updated": 1})
+        self.assertEqual(self.cache.recode(), 0)
+
+    def test_key_namespace(self):
+        self.assertEqual(key_namespace("app_hover:10"), "app_hover")
+        self.assertEqual(key_namespace("owned_games:a:b"), "owned_games")
+        self.assertEqual(key_namespace("some_key"), "")
+
+    def test_purge_older_than(self):
+        self.cache.set_many({f"app_hover:{i}": "value" for i in range(10)})
+        self.cache.set_many({f"custom_id:{i}": "value" for i in range(3)})
+        self.cache._cur.execute(
+            "UPDATE cache SET updated = 1 WHERE key IN ('app_hover:0', 'app_hover:1', 'custom_id:0')"
+        )
+        self.cache._con.commit()
+        self.assertEqual(self.cache.purge_older_than("app_hover", 2, batch_size=1), 2)
+        self.assertIsNone(self.cache.get("app_hover:0"))
+        self.assertIsNotNone(self.cache.get("app_hover:2"))
+        self.assertIsNotNone(self.cache.get("custom_id:0"))
+        self.assertEqual(self.cache.purge_older_than(None, 2), 1)
+        self.assertEqual(self.cache.namespaces(), ["app_hover", "custom_id"])
+
+    def test_purge_uses_index(self):
+        plan = self.cache._cur.execute(
+            "EXPLAIN QUERY PLAN SELECT key FROM cache WHERE namespace = ? AND updated < ?",
+            ("app_hover", 1),
+        ).fetchall()
+        self.assertIn("cache_namespace_updated", " ".join(row[-1] for row in plan))
+
+    def test_vacuum_incremental(self):
+        self.cache.set_many({f"app_hover:{i}": os.urandom(500).hex() for i in range(500)})
+        self.cache.purge_older_than("app_hover", float("inf"))
+        self.assertEqual(self.cache.vacuum_incremental(pages=1), 1)
+        self.assertGreater(self.cache.vacuum_incremental(), 0)
+        self.assertEqual(
+            self.cache._cur.execute("PRAGMA freelist_count").fetchone()[0], 0
+        )
+
+    def test_migrates_unversioned_database(self):
+        self.cache.close()
+        db_path.unlink()
+        con = sqlite3.connect(db_path)
+        con.execute(
+            "CREATE TABLE cache (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " updated INTEGER DEFAULT 0) WITHOUT ROWID"
+        )
+        con.execute("INSERT INTO cache VALUES ('app_hover:10', 'value', 5)")
+        con.commit()
+        con.close()
+
+        self.cache = SQLiteCache(db_path)
+        cur = self.cache._cur
+        self.assertEqual(cur.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        self.assertEqual(cur.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+        self.assertEqual(self.cache.get("app_hover:10"), {"value": "value", "updated": 5})
+        self.assertEqual(self.cache.namespaces(), ["app_hover"])
+        self.assertEqual(self.cache.purge_older_than("app_hover", 6), 1)
+
+        self.assertTrue(self.cache.enable_incremental_vacuum())
+        self.assertEqual(cur.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        self.assertFalse(self.cache.enable_incremental_vacuum())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from .cache import CacheEntry
+from .dictionary_cache import DictionaryCache
+from .lru_cache import LRUCache
+from .tiered_cache import TieredCache
+
+
+class CountingCache(DictionaryCache):
+    def __init__(self, base_dictionary: dict[str, CacheEntry] | None = None) -> None:
+        super().__init__(base_dictionary)
+        self.gets = 0
+        self.bulk_sets = 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        self.gets += 1
+        return super().get(key)
+
+    def set_many(self, items) -> None:
+        self.bulk_sets += 1
+        super().set_many(items)
+
+
+class TestTieredCache(unittest.TestCase):
+    def test_promotes_l2_hits(self):
+        expected_updated = 123456789
+        l2 = CountingCache(
+            {"some_key": {"value": "some_value", "updated": expected_updated}}
+        )
+        cache = TieredCache(l2)
+        first_entry = cache.get("some_key")
+        second_entry = cache.get("some_key")
+        assert first_entry is not None and second_entry is not None
+        self.assertEqual(second_entry["value"], "some_value")
+        self.assertEqual(second_entry["updated"], expected_updated)
+        self.assertEqual(l2.gets, 1)
+        self.assertEqual(cache.l1.hits, 1)
+
+    def test_does_not_exist(self):
+        cache = TieredCache(CountingCache())
+        self.assertIs(cache.get("some_key"), None)
+
+    def test_write_through(self):
+        l2 = CountingCache()
+        cache = TieredCache(l2)
+        cache.set("some_key", "some_value")
+        l2_entry = l2.get("some_key")
+        assert l2_entry is not None
+        self.assertEqual(l2_entry["value"], "some_value")
+        self.assertIsNot(cache.l1.get("some_key"), None)
+
+    def test_write_behind(self):
+        l2 = CountingCache()
+        cache = TieredCache(l2, l1=LRUCache(max_entries=1), write_behind=True, flush_size=3)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        self.assertIs(l2.get("a"), None)
+        a_entry = cache.get("a")
+        assert a_entry is not None
+        self.assertEqual(a_entry["value"], "1")
+        cache.set("c", "3")
+        self.assertEqual(l2.bulk_sets, 1)
+        self.assertEqual(set(l2.get_many(["a", "b", "c"])), {"a", "b", "c"})
+
+    def test_flush(self):
+        l2 = CountingCache()
+        cache = TieredCache(l2, write_behind=True)
+        cache.set("some_key", "some_value")
+        cache.flush()
+        cache.flush()
+        self.assertIsNot(l2.get("some_key"), None)
+        self.assertEqual(l2.bulk_sets, 1)
+
+    def test_close_flushes(self):
+        l2 = CountingCache()
+        cache = TieredCache(l2, write_behind=True)
+        cache.set_many({"a": "1", "b": "2"})
+        self.assertIsNone(l2.get("a"))
+        cache.close()
+        self.assertEqual(set(l2.get_many(["a", "b"])), {"a", "b"})
+        self.assertEqual(l2.bulk_sets, 1)
+
+    def test_get_many(self):
+        l2 = CountingCache({"b": {"value": "2", "updated": 0}})
+        cache = TieredCache(l2)
+        cache.set("a", "1")
+        entries = cache.get_many(["a", "b", "c"])
+        self.assertEqual(set(entries), {"a", "b"})
+        self.assertIsNot(cache.l1.get("b"), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
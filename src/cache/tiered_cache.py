@@ -0,0 +1,142 @@
+from .cache import Cache, CacheEntry
+from .lru_cache import LRUCache
+from typing import Iterable, Mapping
+from time import time
+
+
+class TieredCache(Cache):
+    """A read-through Cache which keeps recently used entries in a bounded
+    in-memory cache (L1) in front of a slower cache such as ``SQLiteCache``
+    (L2). Reads are served from L1 when possible, and L2 hits are promoted into
+    L1 with their original ``updated`` time.
+
+    Writes always go to L1 immediately. By default they are also written
+    through to L2. With ``write_behind`` enabled, L2 writes are buffered and
+    written with a single ``set_many`` once ``flush_size`` writes are pending,
+    or when ``flush`` or ``close`` is called. Call ``close`` when done with the
+    cache so no buffered write is lost.
+    """
+
+    def __init__(
+        self,
+        l2: Cache,
+        l1: LRUCache | None = None,
+        write_behind: bool = False,
+        flush_size: int = 256,
+    ) -> None:
+        """Create a new TieredCache over the given caches.
+
+        Args:
+            l2 (Cache): The slower, authoritative cache.
+            l1 (LRUCache | None, optional): The in-memory cache to serve reads
+            from. Defaults to an ``LRUCache`` holding 10,000 entries.
+            write_behind (bool, optional): Whether to buffer writes to L2.
+            Defaults to False.
+            flush_size (int, optional): The number of buffered writes that
+            triggers a flush when ``write_behind`` is enabled. Defaults to 256.
+        """
+        self._l1 = l1 if l1 is not None else LRUCache(max_entries=10_000)
+        self._l2 = l2
+        self._write_behind = write_behind
+        self._flush_size = flush_size
+        self._pending: dict[str, CacheEntry] = {}
+
+    @property
+    def l1(self) -> LRUCache:
+        """The in-memory cache reads are served from."""
+        return self._l1
+
+    @property
+    def l2(self) -> Cache:
+        """The slower cache behind the in-memory cache."""
+        return self._l2
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Get the specified key from L1, falling back to L2.
+
+        Args:
+            key (str): The key to fetch.
+
+        Returns:
+            CacheEntry | None: The CacheEntry associated with the key, or None
+            if not set in either tier.
+        """
+        cache_entry = self._l1.get(key)
+        if cache_entry is not None:
+            return cache_entry
+        cache_entry = self._pending.get(key) or self._l2.get(key)
+        if cache_entry is not None:
+            self._l1.put_entry(key, cache_entry)
+        return cache_entry
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Get several keys, reading only the L1 misses from L2 in one bulk
+        read.
+
+        Args:
+            keys (Iterable[str]): The keys to fetch.
+
+        Returns:
+            dict[str, CacheEntry]: The CacheEntry for each key that is set.
+            Keys that are not set are omitted.
+        """
+        entries: dict[str, CacheEntry] = {}
+        missing: list[str] = []
+        for key in keys:
+            cache_entry = self._l1.get(key) or self._pending.get(key)
+            if cache_entry is None:
+                missing.append(key)
+            else:
+                entries[key] = cache_entry
+        if missing:
+            promoted = self._l2.get_many(missing)
+            for key, cache_entry in promoted.items():
+                self._l1.put_entry(key, cache_entry)
+            entries.update(promoted)
+        return entries
+
+    def set(self, key: str, value: str) -> None:
+        """Set the given key in both tiers.
+
+        Args:
+            key (str): The key to set.
+            value (str): The value to set the key to.
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: Mapping[str, str]) -> None:
+        """Set several keys in both tiers, using a single bulk write for L2.
+
+        Args:
+            items (Mapping[str, str]): The values to set, by key.
+        """
+        updated = int(time())
+        for key, value in items.items():
+            cache_entry: CacheEntry = {"value": value, "updated": updated}
+            self._l1.put_entry(key, cache_entry)
+            if self._write_behind:
+                self._pending[key] = cache_entry
+        if not self._write_behind:
+            self._l2.set_many(items)
+        elif len(self._pending) >= self._flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any buffered writes through to L2."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = {}
+        self._l2.set_many(
+            {key: cache_entry["value"] for key, cache_entry in pending.items()}
+        )
+
+    def close(self) -> None:
+        """Write any buffered writes through to L2, then close L2 if it can be
+        closed, such as a ``SQLiteCache``. The cache cannot be used
+        afterwards.
+        """
+        self.flush()
+        close = getattr(self._l2, "close", None)
+        if close is not None:
+            close()
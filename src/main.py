@@ -1,36 +1,376 @@
-import asyncio
+from typing import TYPE_CHECKING
+from backlog.index import BacklogIndex, weights
 from steamid.steamid import SteamID
-from steamid.resolve_custom_id import InvalidCustomIDError
-from steamlib.get_owned_games import get_owned_games, AuthFailedError
-from os import environ
+from os import environ, path
 import argparse
-import random
+import atexit
+import json
+import math
 import sys
 
+if TYPE_CHECKING:
+    from cache.async_cache import AsyncCache
+    from cache.async_sqlite_cache import AsyncSQLiteCache
+    from steamid.custom_id_resolver import CustomIDResolver
+    from steamlib.owned_games import OwnedGame
+
+# Only what parsing arguments and Steam IDs needs is imported up front. The
+# HTTP client, XML parser and schema validator are imported by the code paths
+# that use them, keeping startup fast; test_main.py holds an import time
+# budget for this module.
+
+cache_path = path.join(
+    path.dirname(path.abspath(__file__)), "..", ".cache", "steam_backlog_builder.db"
+)
+
+# The namespaces of the cache, named by the prefix of their keys.
+cache_namespaces = ("app_hover", "custom_id", "owned_games")
+
+
+def positive_int(value: str) -> int:
+    """Parses a command line argument that must be a whole number of at
+    least 1.
+
+    Args:
+        value (str): The argument.
+
+    Raises:
+        argparse.ArgumentTypeError: Raised if the argument is not an integer,
+        or is less than 1.
+
+    Returns:
+        int: The parsed argument.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Parses a command line argument that must be a whole number of at
+    least 0.
+
+    Args:
+        value (str): The argument.
+
+    Raises:
+        argparse.ArgumentTypeError: Raised if the argument is not an integer,
+        or is less than 0.
+
+    Returns:
+        int: The parsed argument.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, not {number}")
+    return number
+
+
+def review_score(value: str) -> int:
+    """Parses a command line argument that must be a Steam review score, a
+    whole number from 0 to 10.
+
+    Args:
+        value (str): The argument.
+
+    Raises:
+        argparse.ArgumentTypeError: Raised if the argument is not an integer,
+        or is not from 0 to 10.
+
+    Returns:
+        int: The parsed argument.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if not 0 <= number <= 10:
+        raise argparse.ArgumentTypeError(f"must be from 0 to 10, not {number}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Parses a command line argument that must be a finite number greater
+    than 0.
+
+    Args:
+        value (str): The argument.
+
+    Raises:
+        argparse.ArgumentTypeError: Raised if the argument is not a number, or
+        is not finite and greater than 0.
+
+    Returns:
+        float: The parsed argument.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: '{value}'")
+    if not 0 < number < math.inf:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, not {number}")
+    return number
+
+
+# Options shared by picking and the prewarm command.
+shared_parser = argparse.ArgumentParser(add_help=False)
+shared_parser.add_argument(
+    "--steam-api-key",
+    "-s",
+    help=(
+        "The Steam API key to use to retrieve owned games with. If not provided,"
+        " it will be read from the STEAM_API_KEY environment variable."
+        " If it cannot be found in either location, the program will not run."
+    ),
+    metavar="api_key",
+    dest="steam_api_key",
+)
+shared_parser.add_argument(
+    "--stats",
+    help=(
+        "Print request timings, bytes downloaded, retries and cache hit counts"
+        " to stderr when the program exits."
+    ),
+    action="store_true",
+)
+shared_parser.add_argument(
+    "--metrics-file",
+    help=(
+        "Write the same statistics in the Prometheus text format to this file"
+        " when the program exits. With --serve they are also served at"
+        " GET /metrics."
+    ),
+    metavar="path",
+    dest="metrics_file",
+)
+
 parser = argparse.ArgumentParser(
     description=(
         "Picks a random steam game from your backlog for you to play"
-        " next! Any game with less than one hour of playtime is eligible"
-        " to be picked."
+        " next! By default, any game with less than one hour of playtime is"
+        " eligible to be picked."
+    ),
+    epilog=(
+        "Run 'prewarm --help' for filling the cache ahead of time, so picks"
+        " can be made with --offline."
     ),
+    parents=[shared_parser],
 )
 parser.add_argument(
     "steam_id",
-    help="The Steam ID to pick a backlog game for.",
+    help=(
+        "The Steam ID to pick a backlog game for. Not needed with --batch or"
+        " --serve."
+    ),
     metavar="SteamID",
+    nargs="?",
 )
 parser.add_argument(
-    "--steam-api-key",
-    "-s",
+    "--max-playtime",
     help=(
-        "The Steam API key to use to retrieve owned games with. If not provided,"
-        " it will be read from the STEAM_API_KEY environment variable."
-        " If it cannot be found in either location, the program will not run."
+        "Only games played for fewer than this many minutes are eligible."
+        " Defaults to 60."
     ),
-    metavar="api_key",
-    dest="steam_api_key",
+    metavar="minutes",
+    dest="max_playtime",
+    type=non_negative_int,
+    default=60,
+)
+parser.add_argument(
+    "--weight",
+    help=(
+        "How eligible games are weighed when picking: 'uniform' picks every"
+        " game with equal chance, 'playtime' favors games played less."
+        " Defaults to uniform. Not supported with --serve."
+    ),
+    choices=sorted(weights),
+    default="uniform",
+)
+parser.add_argument(
+    "--count",
+    "-n",
+    help=(
+        "The number of different games to pick. Defaults to 1. Not supported"
+        " with --batch or --serve."
+    ),
+    metavar="count",
+    type=positive_int,
+    default=1,
+)
+parser.add_argument(
+    "--genre",
+    help=(
+        "Only pick games with this genre, such as 'RPG'. Repeat to require"
+        " several genres. Not supported with --batch or --serve."
+    ),
+    metavar="genre",
+    action="append",
+    default=[],
+)
+parser.add_argument(
+    "--category",
+    help=(
+        "Only pick games in this store category, such as 'Online Co-op'."
+        " Repeat to require several categories. Not supported with --batch or"
+        " --serve."
+    ),
+    metavar="category",
+    action="append",
+    default=[],
+)
+parser.add_argument(
+    "--min-score",
+    help=(
+        "Only pick games with at least this Steam review score, from 1"
+        " (Overwhelmingly Negative) to 9 (Overwhelmingly Positive). 8 is Very"
+        " Positive. Not supported with --batch or --serve."
+    ),
+    metavar="score",
+    dest="min_score",
+    type=review_score,
+)
+parser.add_argument(
+    "--batch",
+    "-b",
+    help=(
+        "Pick a game for every Steam ID in this file, one per line, instead of"
+        " a single Steam ID. Use '-' to read from stdin. One JSON result is"
+        " printed per line for each account as it completes."
+    ),
+    metavar="file",
+    type=argparse.FileType("r"),
+)
+parser.add_argument(
+    "--concurrency",
+    help="The number of accounts worked on at once in batch mode. Defaults to 16.",
+    metavar="count",
+    type=positive_int,
+    default=16,
+)
+parser.add_argument(
+    "--timeout",
+    help=(
+        "The number of seconds after which an account is given up on in batch"
+        " mode. Defaults to no timeout."
+    ),
+    metavar="seconds",
+    type=float,
+)
+parser.add_argument(
+    "--serve",
+    help=(
+        "Run as a long-lived HTTP service answering GET /pick?steam_id=..."
+        " with one JSON result, keeping caches and connections warm between"
+        " requests."
+    ),
+    action="store_true",
+)
+parser.add_argument(
+    "--host",
+    help="The host to listen on with --serve. Defaults to 127.0.0.1.",
+    default="127.0.0.1",
+)
+parser.add_argument(
+    "--port",
+    help="The port to listen on with --serve. Defaults to 8080.",
+    type=int,
+    default=8080,
+)
+parser.add_argument(
+    "--unix-socket",
+    help="Listen on this Unix socket instead of a TCP port with --serve.",
+    metavar="path",
+    dest="unix_socket",
+)
+parser.add_argument(
+    "--offline",
+    help=(
+        "Pick only from data already in the cache, without any network"
+        " access, however old it is. Fill the cache with the prewarm command"
+        " first. No Steam API key is needed. Not supported with --serve."
+    ),
+    action="store_true",
+)
+parser.add_argument(
+    "--cache-retention",
+    help=(
+        "With --serve, cached data not updated for this many days is"
+        " deleted from the cache every hour. Defaults to 30."
+    ),
+    metavar="days",
+    dest="cache_retention",
+    type=positive_float,
+    default=30,
+)
+
+prewarm_parser = argparse.ArgumentParser(
+    prog=f"{parser.prog} prewarm",
+    description=(
+        "Fills the cache with the custom ID resolutions, owned games and store"
+        " data needed to pick games for these accounts, so picks can later be"
+        " made with --offline. One JSON result is printed per line for each"
+        " account as it completes."
+    ),
+    parents=[shared_parser],
+)
+prewarm_parser.add_argument(
+    "steam_ids",
+    help="The Steam IDs to prewarm the cache for.",
+    metavar="SteamID",
+    nargs="*",
+)
+prewarm_parser.add_argument(
+    "--file",
+    "-f",
+    help=(
+        "Also prewarm every Steam ID in this file, one per line. Use '-' to"
+        " read from stdin."
+    ),
+    metavar="file",
+    type=argparse.FileType("r"),
+)
+prewarm_parser.add_argument(
+    "--max-playtime",
+    help=(
+        "Store data is fetched for games played for fewer than this many"
+        " minutes, matching the --max-playtime picks will use. Defaults to 60."
+    ),
+    metavar="minutes",
+    dest="max_playtime",
+    type=non_negative_int,
+    default=60,
+)
+prewarm_parser.add_argument(
+    "--concurrency",
+    help="The number of accounts worked on at once. Defaults to 4.",
+    metavar="count",
+    type=positive_int,
+    default=4,
+)
+prewarm_parser.add_argument(
+    "--timeout",
+    help=(
+        "The number of seconds after which an account is given up on."
+        " Defaults to no timeout."
+    ),
+    metavar="seconds",
+    type=float,
 )
 
+# What each cache namespace holds, for reporting missing offline data.
+cache_namespace_descriptions = {
+    "app_hover": "store data",
+    "custom_id": "Steam ID 64",
+    "owned_games": "owned games",
+}
+
 
 def get_duration_str(mins: int) -> str:
     """Provide a remark depending on a given game's playtime.
@@ -46,9 +386,147 @@ def get_duration_str(mins: int) -> str:
     return f"You've only played it for {mins} minute{'' if mins == 1 else 's'} so far!"
 
 
-async def main():
-    args = parser.parse_args(args=None if sys.argv[1:] else ["--help"])
-    id: str = args.steam_id
+def open_cache() -> "AsyncSQLiteCache":
+    """Open the persistent cache, storing new values as compressed Steam
+    records. Values stored with an older codec can still be read.
+
+    Returns:
+        AsyncSQLiteCache: The cache.
+    """
+    from cache.async_sqlite_cache import AsyncSQLiteCache
+    from steamlib.cache_codecs import steam_record_codec
+
+    return AsyncSQLiteCache(cache_path, codec=steam_record_codec)
+
+
+def report_stats(args: argparse.Namespace) -> None:
+    """Print or write the recorded metrics, as asked for by ``--stats`` and
+    ``--metrics-file``.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+    """
+    from metrics.exposition import format_prometheus, format_text
+
+    if args.stats:
+        print(format_text(), file=sys.stderr, end="")
+    if args.metrics_file:
+        with open(args.metrics_file, "w") as file:
+            file.write(format_prometheus())
+
+
+async def print_batch(
+    args: argparse.Namespace,
+    api_key: str,
+    resolver: "CustomIDResolver",
+    cache: "AsyncCache",
+) -> None:
+    """Run batch mode, printing one JSON result per line as each account
+    completes.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+        api_key (str): The Steam API key to use to retrieve owned games.
+        resolver (CustomIDResolver): The resolver for custom names and URLs.
+        cache (AsyncCache): The cache owned games are read from with
+        ``--offline``.
+    """
+    from backlog.account import cached_owned_games_loader, load_owned_games
+    from backlog.batch import read_steam_ids, run_batch
+
+    steam_ids = read_steam_ids(args.batch)
+    async for result in run_batch(
+        steam_ids,
+        api_key,
+        resolver,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        max_playtime=args.max_playtime,
+        loader=cached_owned_games_loader(cache) if args.offline else load_owned_games,
+        weight=weights[args.weight],
+    ):
+        print(json.dumps(result), flush=True)
+
+
+def has_filters(args: argparse.Namespace) -> bool:
+    """Whether any of ``--genre``, ``--category`` or ``--min-score`` is used."""
+    return bool(args.genre or args.category or args.min_score is not None)
+
+
+def print_pick(game: "OwnedGame") -> None:
+    """Print a picked game with a remark on its playtime."""
+    print(
+        f"Why not try playing {game['name']}? {get_duration_str(game['playtime_forever'])}",
+        flush=True,
+    )
+
+
+async def print_filtered_picks(
+    args: argparse.Namespace, index: BacklogIndex, cache: "AsyncCache"
+) -> int:
+    """Pick games below ``--max-playtime`` matching ``--genre``,
+    ``--category`` and ``--min-score``, printing each pick as soon as it is
+    confirmed. The hover data already cached is read in one bulk read into a
+    ``HoverIndex``, which decides those games at once. Only the games not
+    cached yet are checked one at a time, in the order they would be picked,
+    fetching their hover data unless ``--offline`` is used.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+        index (BacklogIndex): The index over the account's games.
+        cache (AsyncCache): The cache hover data is stored in.
+
+    Raises:
+        MissingCacheEntryError: Raised with ``--offline`` if no game was
+        picked and none of the games checked have cached hover data.
+
+    Returns:
+        int: The number of games picked.
+    """
+    from backlog.filters import HoverIndex, hover_filter, index_hover
+    from backlog.pipeline import PickPipeline
+    from cache.error import MissingCacheEntryError
+    from steamlib.cached_app_hover import CachedAppHover, app_hover_cache_key
+
+    hover_index = HoverIndex()
+    await index_hover(
+        hover_index,
+        CachedAppHover(cache, offline=True),
+        (game["appid"] for game in index.below(args.max_playtime)),
+    )
+    matching = hover_index.matching(args.genre, args.category, args.min_score)
+    candidates = (
+        game
+        for game in index.iter_picks(args.max_playtime, weights[args.weight])
+        if game["appid"] in matching or game["appid"] not in hover_index
+    )
+
+    app_hover = CachedAppHover(cache, offline=args.offline)
+    pipeline = PickPipeline(
+        app_hover, hover_filter(args.genre, args.category, args.min_score)
+    )
+    picked = 0
+    async for game in pipeline.picks(candidates, args.count, matching):
+        print_pick(game)
+        picked += 1
+    await app_hover.wait_for_refreshes()
+    if args.offline and picked == 0 and pipeline.failed and not hover_index:
+        raise MissingCacheEntryError(
+            app_hover_cache_key(index.below(args.max_playtime)[0]["appid"])
+        )
+    return picked
+
+
+def get_api_key(args: argparse.Namespace) -> str:
+    """Get the Steam API key from ``--steam-api-key`` or the STEAM_API_KEY
+    environment variable, exiting with instructions if neither is set.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        str: The Steam API key.
+    """
     api_key = args.steam_api_key or environ.get("STEAM_API_KEY")
     if not isinstance(api_key, str) or len(api_key) == 0:
         print(
@@ -70,32 +548,178 @@ async def main():
             " by using the same link."
         )
         sys.exit(1)
+    return api_key
+
 
+async def prewarm(args: argparse.Namespace, api_key: str) -> None:
+    """Run the prewarm command, printing one JSON result per line as each
+    account completes.
+
+    Args:
+        args (argparse.Namespace): The parsed prewarm arguments.
+        api_key (str): The Steam API key to use to retrieve owned games.
+    """
+    from backlog.batch import read_steam_ids
+    from backlog.prewarm import run_prewarm
+    from cache.instrumented_cache import InstrumentedAsyncCache
+    from steamlib.session import shared_session
+
+    steam_ids: list[str] = args.steam_ids
+    if args.file is not None:
+        steam_ids = steam_ids + read_steam_ids(args.file)
+    cache = InstrumentedAsyncCache(open_cache(), "sqlite")
     try:
-        steam_id = SteamID(id)
-        id_64 = await steam_id.to_steam_id_64()
-    except ValueError:
-        print(f'Could not parse the provided Steam ID: "{id}"')
-        sys.exit(3)
-    except InvalidCustomIDError:
-        print(f'Could not find a Steam profile associated with the Custom ID: "{id}"')
-        sys.exit(3)
+        async with shared_session():
+            async for result in run_prewarm(
+                steam_ids,
+                api_key,
+                cache,
+                concurrency=args.concurrency,
+                timeout=args.timeout,
+                max_playtime=args.max_playtime,
+            ):
+                print(json.dumps(result), flush=True)
+    finally:
+        await cache.close()
+
+
+async def main():
+    if sys.argv[1:2] == ["prewarm"]:
+        args = prewarm_parser.parse_args(sys.argv[2:] or ["--help"])
+        if not args.steam_ids and args.file is None:
+            prewarm_parser.error("at least one SteamID or --file is required")
+        atexit.register(report_stats, args)
+        await prewarm(args, get_api_key(args))
+        return
+
+    args = parser.parse_args(args=None if sys.argv[1:] else ["--help"])
+    atexit.register(report_stats, args)
+    id: str | None = args.steam_id
+    if args.offline and args.serve:
+        parser.error("--offline does not work with --serve")
+    api_key = "" if args.offline else get_api_key(args)
+    if has_filters(args) and (args.serve or args.batch is not None):
+        parser.error(
+            "--genre, --category and --min-score only work for a single SteamID"
+        )
+    if args.count > 1 and (args.serve or args.batch is not None):
+        parser.error("--count only works for a single SteamID")
+    if args.weight != "uniform" and args.serve:
+        parser.error("--weight does not work with --serve")
+    if args.serve:
+        from backlog.service import BacklogService, serve
+        from cache.instrumented_cache import InstrumentedAsyncCache
+        import asyncio
 
+        sqlite_cache = open_cache()
+        service = BacklogService(
+            api_key, InstrumentedAsyncCache(sqlite_cache, "sqlite")
+        )
+        maintenance = asyncio.create_task(
+            sqlite_cache.maintain(
+                {
+                    namespace: args.cache_retention * 24 * 60 * 60
+                    for namespace in cache_namespaces
+                }
+            )
+        )
+        try:
+            await serve(service, args.host, args.port, args.unix_socket)
+        finally:
+            maintenance.cancel()
+            await asyncio.gather(maintenance, return_exceptions=True)
+        return
+    if args.batch is None and id is None:
+        parser.error("a SteamID is required unless --batch or --serve is used")
+
+    steam_id: SteamID | None = None
+    if args.batch is None:
+        try:
+            steam_id = SteamID(id)
+        except ValueError:
+            print(f'Could not parse the provided Steam ID: "{id}"')
+            sys.exit(3)
+
+    import aiohttp
+    from backlog.account import cached_owned_games_loader
+    from backlog.sync import OwnedGamesSync
+    from cache.error import MissingCacheEntryError
+    from cache.instrumented_cache import InstrumentedAsyncCache
+    from steamid.error import InvalidCustomIDError
+    from steamlib.error import AuthFailedError
+    from steamlib.session import shared_session
+
+    cache = InstrumentedAsyncCache(open_cache(), "sqlite")
     try:
-        owned_games = await get_owned_games(id_64, api_key)
-    except AuthFailedError as e:
+        async with shared_session():
+            resolver = None
+            if steam_id is None or steam_id.needs_resolution:
+                from steamid.custom_id_resolver import CustomIDResolver
+
+                resolver = CustomIDResolver(cache, offline=args.offline)
+            if steam_id is None:
+                await print_batch(args, api_key, resolver, cache)
+                return
+
+            try:
+                if args.offline:
+                    load = cached_owned_games_loader(cache)
+                    _, owned_games = await load(steam_id, api_key, resolver)
+                else:
+                    steam_id_64 = await steam_id.to_steam_id_64(resolver)
+                    owned_games, _ = await OwnedGamesSync(cache).sync(
+                        steam_id_64, api_key
+                    )
+                index = BacklogIndex(owned_games)
+                filtered_picks = None
+                if has_filters(args):
+                    filtered_picks = await print_filtered_picks(args, index, cache)
+            except InvalidCustomIDError:
+                print(f'Could not find a Steam profile associated with the Custom ID: "{id}"')
+                sys.exit(3)
+            except AuthFailedError as e:
+                print(
+                    "Could not retrieve the Steam games owned by that Steam ID!"
+                    "\n\nIt's possible the API key provided is invalid, or the Steam ID"
+                    " specified does not have a public profile, or a profile accessible"
+                    " by the account associated with the API key."
+                    "\n\nPlease double check"
+                    " the API key and the Steam profile in question and try again."
+                )
+                sys.exit(2)
+            except aiohttp.ClientError:
+                print(
+                    "Could not retrieve the Steam games owned by that Steam ID!"
+                    " Steam did not respond successfully, even after retrying."
+                    " Please try again later."
+                )
+                sys.exit(4)
+            except MissingCacheEntryError as e:
+                namespace = e.key.partition(":")[0]
+                print(
+                    "Could not pick a game offline, as the cache has no"
+                    f' {cache_namespace_descriptions[namespace]} for "{id}".'
+                    f' Run "prewarm {id}" while online to cache it, then try'
+                    " again."
+                )
+                sys.exit(5)
+    finally:
+        await cache.close()
+
+    if filtered_picks is None:
+        random_games = index.sample(args.count, args.max_playtime, weights[args.weight])
+        for random_game in random_games:
+            print_pick(random_game)
+        picked = len(random_games)
+    else:
+        picked = filtered_picks
+    if picked == 0 and filtered_picks is not None and index.count_below(args.max_playtime):
         print(
-            "Could not retrieve the Steam games owned by that Steam ID!"
-            "\n\nIt's possible the API key provided is invalid, or the Steam ID"
-            " specified does not have a public profile, or a profile accessible"
-            " by the account associated with the API key."
-            "\n\nPlease double check"
-            " the API key and the Steam profile in question and try again."
+            "None of your unplayed games match those filters. Try fewer"
+            " filters, or a higher --max-playtime."
         )
-        sys.exit(2)
-
-    short_play_games = [game for game in owned_games if game["playtime_forever"] < 60]
-    if len(short_play_games) == 0:
+        sys.exit(0)
+    if picked == 0:
         print(
             "Wow! You don't have any unplayed games. "
             "Either you haven't gotten started yet, or you've "
@@ -104,10 +728,8 @@ async def main():
         )
         sys.exit(0)
 
-    random_game = random.choice(short_play_games)
-    print(
-        f"Why not try playing {random_game['name']}? {get_duration_str(random_game['playtime_forever'])}"
-    )
 
+if __name__ == "__main__":
+    import asyncio
 
-asyncio.run(main())
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+from .registry import Counter, Histogram, Registry, registry as default_registry
+from math import isinf
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_number(value: float) -> str:
+    if isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def format_prometheus(registry: Registry = default_registry) -> str:
+    """Formats every metric in the Prometheus text exposition format.
+
+    Args:
+        registry (Registry, optional): The metrics to format. Defaults to the
+        built-in metrics.
+
+    Returns:
+        str: The formatted metrics.
+    """
+    lines: list[str] = []
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if isinstance(metric, Counter):
+            for label_values, value in metric.series():
+                labels = _format_labels(metric.labels_of(label_values))
+                lines.append(f"{metric.name}{labels} {_format_number(value)}")
+        elif isinstance(metric, Histogram):
+            for label_values, counts, total in metric.series():
+                labels = metric.labels_of(label_values)
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    bucket_labels = _format_labels({**labels, "le": _format_number(bound)})
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_number(total)}")
+                lines.append(f"{metric.name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def format_text(registry: Registry = default_registry) -> str:
+    """Formats every metric that has been recorded as a short human readable
+    summary. Histograms of seconds are shown in milliseconds, with the median
+    and 95th percentile estimated from their buckets.
+
+    Args:
+        registry (Registry, optional): The metrics to format. Defaults to the
+        built-in metrics.
+
+    Returns:
+        str: The formatted metrics.
+    """
+    lines: list[str] = []
+    for metric in registry.metrics():
+        if isinstance(metric, Counter):
+            for label_values, value in metric.series():
+                labels = _format_labels(metric.labels_of(label_values))
+                lines.append(f"{metric.name}{labels}: {_format_number(value)}")
+        elif isinstance(metric, Histogram):
+            for label_values, counts, total in metric.series():
+                labels = metric.labels_of(label_values)
+                count = sum(counts)
+                p50 = metric.quantile(0.5, **labels) * 1000
+                p95 = metric.quantile(0.95, **labels) * 1000
+                lines.append(
+                    f"{metric.name}{_format_labels(labels)}: {count} observed,"
+                    f" mean {total / count * 1000:.1f} ms,"
+                    f" p50 <= {p50:g} ms, p95 <= {p95:g} ms"
+                )
+    return "\n".join(lines) + ("\n" if lines else "")
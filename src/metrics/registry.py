@@ -0,0 +1,202 @@
+from bisect import bisect_left
+from typing import Iterable, Iterator, Sequence
+import abc
+
+# Latency buckets, in seconds, from a fast cache hit to a slow web request.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+class Metric(metaclass=abc.ABCMeta):
+    """A named metric with a fixed set of label names. Each combination of
+    label values is tracked separately.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()) -> None:
+        """Create a new metric.
+
+        Args:
+            name (str): The metric name.
+            help (str): A description of what is measured.
+            label_names (Sequence[str], optional): The names of the labels
+            every observation is made with. Defaults to none.
+        """
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        """Order the given labels by ``label_names``.
+
+        Raises:
+            ValueError: Raised if the labels do not match ``label_names``.
+        """
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        try:
+            return tuple(str(labels[name]) for name in self.label_names)
+        except KeyError:
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+
+    def labels_of(self, label_values: LabelValues) -> dict[str, str]:
+        """Name the label values of a series."""
+        return dict(zip(self.label_names, label_values))
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Forget every observation."""
+        pass
+
+
+class Counter(Metric):
+    """A value that only ever goes up, such as a number of requests."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, help, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` to the counter for the given labels."""
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the counter for the given labels."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def series(self) -> Iterator[tuple[LabelValues, float]]:
+        """Iterate over the value of every combination of labels seen."""
+        return iter(sorted(self._values.items()))
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class Histogram(Metric):
+    """Counts observations, such as latencies, into cumulative buckets, so
+    their distribution can be summarized without keeping every observation.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create a new histogram.
+
+        Args:
+            name (str): The metric name.
+            help (str): A description of what is measured.
+            label_names (Sequence[str], optional): The names of the labels
+            every observation is made with. Defaults to none.
+            buckets (Iterable[float], optional): The upper bounds of the
+            buckets. Defaults to ``DEFAULT_BUCKETS``.
+        """
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given labels."""
+        key = self._label_values(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations for the given labels."""
+        return sum(self._counts.get(self._label_values(labels), ()))
+
+    def sum(self, **labels: str) -> float:
+        """Get the sum of the observations for the given labels."""
+        return self._sums.get(self._label_values(labels), 0.0)
+
+    def series(self) -> Iterator[tuple[LabelValues, list[int], float]]:
+        """Iterate over the bucket counts, without accumulating them, and sum
+        of every combination of labels seen. The last count is of the
+        observations above every bucket.
+        """
+        for key in sorted(self._counts):
+            yield (key, self._counts[key], self._sums[key])
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile, from 0 to 1.
+
+        Returns:
+            float: The estimate. ``inf`` if it is above every bucket, and 0 if
+            nothing has been observed.
+        """
+        counts = self._counts.get(self._label_values(labels))
+        if not counts:
+            return 0.0
+        rank = q * sum(counts)
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank and seen > 0:
+                return bound
+        return float("inf")
+
+    def reset(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+
+class Registry:
+    """The metrics recorded by a process. Metrics are created on first use and
+    shared by name afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get the counter with the given name, creating it if needed."""
+        return self._get_or_create(Counter, name, help, label_names)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get the histogram with the given name, creating it if needed."""
+        return self._get_or_create(Histogram, name, help, label_names, buckets)
+
+    def metrics(self) -> list[Metric]:
+        """Get every metric, sorted by name."""
+        return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def reset(self) -> None:
+        """Forget every observation, keeping the metrics themselves."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def _get_or_create(self, metric_type, name, help, label_names, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = metric_type(name, help, label_names, *args)
+        elif not isinstance(metric, metric_type):
+            raise ValueError(f"{name} is already registered as a {metric.type}")
+        return metric
+
+
+# The registry every built-in metric is recorded in.
+registry = Registry()
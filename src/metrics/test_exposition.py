@@ -0,0 +1,43 @@
+import unittest
+from .exposition import format_prometheus, format_text
+from .registry import Registry
+
+
+class TestExposition(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        counter = self.registry.counter("cache_hits_total", "Hits.", ["backend"])
+        counter.inc(3, backend='my "sqlite"')
+        histogram = self.registry.histogram(
+            "steam_request_seconds", "Latency.", ["endpoint"], buckets=[0.1, 1]
+        )
+        histogram.observe(0.05, endpoint="hover")
+        histogram.observe(0.5, endpoint="hover")
+
+    def test_prometheus(self):
+        self.assertEqual(
+            format_prometheus(self.registry),
+            "# HELP cache_hits_total Hits.\n"
+            "# TYPE cache_hits_total counter\n"
+            'cache_hits_total{backend="my \\"sqlite\\""} 3\n'
+            "# HELP steam_request_seconds Latency.\n"
+            "# TYPE steam_request_seconds histogram\n"
+            'steam_request_seconds_bucket{endpoint="hover",le="0.1"} 1\n'
+            'steam_request_seconds_bucket{endpoint="hover",le="1"} 2\n'
+            'steam_request_seconds_bucket{endpoint="hover",le="+Inf"} 2\n'
+            'steam_request_seconds_sum{endpoint="hover"} 0.55\n'
+            'steam_request_seconds_count{endpoint="hover"} 2\n',
+        )
+
+    def test_text(self):
+        self.assertEqual(
+            format_text(self.registry),
+            'cache_hits_total{backend="my \\"sqlite\\""}: 3\n'
+            'steam_request_seconds{endpoint="hover"}: 2 observed, mean 275.0 ms,'
+            " p50 <= 100 ms, p95 <= 1000 ms\n",
+        )
+        self.assertEqual(format_text(Registry()), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
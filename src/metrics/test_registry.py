@@ -0,0 +1,52 @@
+import unittest
+from .registry import Metric, Registry
+
+
+class TestCounter(unittest.TestCase):
+    def test_labels(self):
+        counter = Registry().counter("requests_total", "Requests.", ["endpoint"])
+        counter.inc(endpoint="hover")
+        counter.inc(2, endpoint="hover")
+        counter.inc(endpoint="owned_games")
+        self.assertEqual(counter.value(endpoint="hover"), 3)
+        self.assertEqual(list(counter.series()), [(("hover",), 3), (("owned_games",), 1)])
+        with self.assertRaises(ValueError):
+            counter.inc(status="200")
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe(self):
+        histogram = Registry().histogram("seconds", "Seconds.", buckets=[0.1, 1])
+        for value in [0.05, 0.1, 0.5, 2]:
+            histogram.observe(value)
+        self.assertEqual(histogram.count(), 4)
+        self.assertAlmostEqual(histogram.sum(), 2.65)
+        self.assertEqual(list(histogram.series()), [((), [2, 1, 1], 2.65)])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.75), 1)
+        self.assertEqual(histogram.quantile(1), float("inf"))
+
+
+class TestRegistry(unittest.TestCase):
+    def test_shared_by_name(self):
+        registry = Registry()
+        counter = registry.counter("total", "Total.")
+        self.assertIs(registry.counter("total", "Total."), counter)
+        with self.assertRaises(ValueError):
+            registry.histogram("total", "Total.")
+        counter.inc()
+        registry.reset()
+        self.assertEqual(counter.value(), 0)
+
+
+class TestMetric(unittest.TestCase):
+    def test_reset_is_required(self):
+        class Gauge(Metric):
+            type = "gauge"
+
+        with self.assertRaises(TypeError):
+            Gauge("steam_gauge", "A metric without reset.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+from typing import Callable
+from cache.async_cache import AsyncCache
+from cache.error import MissingCacheEntryError
+from .resolve_custom_id import resolve_custom_id
+from functools import partial
+from time import time
+import aiohttp
+import asyncio
+
+DAY = 24 * 60 * 60
+
+
+def custom_id_cache_key(id: str) -> str:
+    """Formats the cache key a custom ID's Steam ID 64 is stored under. Custom
+    IDs are case-insensitive, so the key is too.
+
+    Args:
+        id (str): The custom Steam community ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"custom_id:{id.lower()}"
+
+
+class CustomIDResolver:
+    """Resolves custom Steam community IDs with ``resolve_custom_id``,
+    remembering the results in an AsyncCache for ``ttl`` seconds so they persist
+    across runs when the cache does. Concurrent lookups of the same custom ID
+    share a single request.
+
+    A single resolver is meant to be shared by everything in the process that
+    resolves custom IDs. An ``offline`` resolver never makes a request: it
+    serves remembered resolutions however old they are.
+    """
+
+    def __init__(
+        self,
+        cache: AsyncCache | None = None,
+        ttl: float = 7 * DAY,
+        clock: Callable[[], float] = time,
+        offline: bool = False,
+    ) -> None:
+        """Create a new CustomIDResolver.
+
+        Args:
+            cache (AsyncCache | None, optional): The cache to remember
+            resolutions in. If not provided, only concurrent lookups are
+            shared. Defaults to None.
+            ttl (float, optional): The number of seconds a resolution is
+            remembered for. Defaults to 7 days.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.time``.
+            offline (bool, optional): Whether to only resolve from the cache.
+            Defaults to False.
+        """
+        self._cache = cache
+        self._ttl = ttl
+        self._clock = clock
+        self._offline = offline
+        self._in_flight: dict[str, asyncio.Task[str]] = {}
+
+    async def resolve(
+        self, id: str, session: aiohttp.ClientSession | None = None
+    ) -> str:
+        """Resolves a custom Steam community ID to its associated Steam ID 64,
+        from the cache if possible.
+
+        Args:
+            id (str): The custom Steam community ID to resolve
+            session (aiohttp.ClientSession | None, optional): The session to
+            make any request with. Defaults to None.
+
+        Raises:
+            InvalidCustomIDError: Raised if the custom id is not associated with a
+            steam profile.
+            MissingCacheEntryError: Raised if the resolver is offline and the
+            custom id has not been resolved before.
+
+        Returns:
+            str: The resolved Steam ID 64
+        """
+        key = custom_id_cache_key(id)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._resolve(id, key, session))
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._on_resolve_done, key))
+        return await asyncio.shield(task)
+
+    def _on_resolve_done(self, key: str, task: asyncio.Task[str]) -> None:
+        """Forget a finished lookup. Errors are retrieved here so a lookup
+        nobody is waiting on any more is not reported as unhandled.
+
+        Args:
+            key (str): The cache key the lookup was for.
+            task (asyncio.Task[str]): The finished lookup.
+        """
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _resolve(
+        self, id: str, key: str, session: aiohttp.ClientSession | None
+    ) -> str:
+        """Look a custom ID up in the cache, falling back to a web request and
+        remembering its result.
+
+        Args:
+            id (str): The custom Steam community ID to resolve.
+            key (str): The cache key for the custom ID.
+            session (aiohttp.ClientSession | None): The session to make any
+            request with.
+
+        Returns:
+            str: The resolved Steam ID 64.
+        """
+        if self._cache is not None:
+            cache_entry = await self._cache.get(key)
+            if (
+                cache_entry is not None
+                and (
+                    self._offline
+                    or self._clock() - cache_entry["updated"] <= self._ttl
+                )
+            ):
+                return cache_entry["value"]
+        if self._offline:
+            raise MissingCacheEntryError(key)
+        steam_id_64 = await resolve_custom_id(id, session=session)
+        if self._cache is not None:
+            await self._cache.set(key, steam_id_64)
+        return steam_id_64
@@ -0,0 +1,7 @@
+class InvalidCustomIDError(Exception):
+    """Thrown when the custom ID can't be associated with a Steam profile.
+    Happens when the xml response contains no valid ``steamID64`` element or if
+    the response from ``steamcommunity.com`` is ``404``.
+    """
+
+    pass
@@ -1,6 +1,8 @@
 import aiohttp
-import defusedxml
-import defusedxml.ElementTree
+from steamlib import endpoints
+from steamlib.rate_limit import rate_limited_get
+from steamlib.session import session_scope
+from .error import InvalidCustomIDError
 
 
 def steam_community_id_url(id: str) -> str:
@@ -13,24 +15,20 @@ def steam_community_id_url(id: str) -> str:
         str: A URL to the Steam Community for that custom id, with the
         ``?xml=1`` specifier included, to prompt an XML response.
     """
-    return f"https://steamcommunity.com/id/{id}?xml=1"
+    return f"{endpoints.STEAM_COMMUNITY_URL}/id/{id}?xml=1"
 
 
-class InvalidCustomIDError(Exception):
-    """Thrown when the custom ID can't be associated with a Steam profile.
-    Happens when the xml response contains no valid ``steamID64`` element or if
-    the response from ``steamcommunity.com`` is ``404``.
-    """
-
-    pass
-
-
-async def resolve_custom_id(id: str) -> str:
+async def resolve_custom_id(
+    id: str, session: aiohttp.ClientSession | None = None
+) -> str:
     """Resolves a custom Steam community ID to its associated Steam ID 64 using
     the xml returned by the Steam Community site.
 
     Args:
         id (str): The custom Steam community ID to resolve
+        session (aiohttp.ClientSession | None, optional): The session to make
+        the request with. If not provided, the current shared session is used,
+        or a temporary one is created. Defaults to None.
 
     Raises:
         NoSteamIDError: Raised if the XML contains no ``steamID64`` element, or
@@ -43,15 +41,19 @@ async def resolve_custom_id(id: str) -> str:
     Returns:
         str: The resolved Steam ID 64
     """
-    async with aiohttp.ClientSession(raise_for_status=True) as session:
+    async with session_scope(session) as session:
         try:
-            async with session.get(steam_community_id_url(id)) as response:
+            async with rate_limited_get(
+                session, steam_community_id_url(id), endpoint="resolve_custom_id"
+            ) as response:
                 xml_text = await response.text()
         except aiohttp.ClientResponseError as e:
             raise InvalidCustomIDError(
                 f"An HTTP error was encountered trying to resolve the custom ID: {e.status}"
             )
 
+        import defusedxml.ElementTree
+
         etree = defusedxml.ElementTree.fromstring(xml_text)
         error = etree.find("error")
         if error is not None:
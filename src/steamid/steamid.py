@@ -1,6 +1,9 @@
 from enum import Enum
+from typing import TYPE_CHECKING, Iterable
 import re
-from .resolve_custom_id import resolve_custom_id
+
+if TYPE_CHECKING:
+    from .custom_id_resolver import CustomIDResolver
 
 
 class SteamIDType(Enum):
@@ -26,6 +29,125 @@ steam_id_regex = {
 }
 
 
+def _build_steam_id_pattern() -> tuple[re.Pattern[str], dict[int, tuple[SteamIDType, int]]]:
+    """Combines every format in ``steam_id_regex`` into a single compiled
+    pattern, tried in the same order they were previously tried one at a time.
+    Each format is wrapped in its own outer group, so the group that matched
+    identifies the format and the format's own groups follow directly after it.
+
+    Returns:
+        tuple[re.Pattern[str], dict[int, tuple[SteamIDType, int]]]: The pattern
+        and a map from each outer group's index to its format and number of
+        inner groups.
+    """
+    order = [
+        SteamIDType.STEAM_ID,
+        SteamIDType.STEAM_ID_3,
+        SteamIDType.STEAM_ID_64,
+        SteamIDType.STANDARD_URL,
+        SteamIDType.CUSTOM_URL,
+        SteamIDType.CUSTOM_NAME,
+    ]
+    alternatives: list[str] = []
+    groups: dict[int, tuple[SteamIDType, int]] = {}
+    group_index = 1
+    for steam_id_type in order:
+        regex = steam_id_regex[steam_id_type]
+        inner_groups = re.compile(regex).groups
+        alternatives.append(f"({regex})")
+        groups[group_index] = (steam_id_type, inner_groups)
+        group_index += 1 + inner_groups
+    return (re.compile("|".join(alternatives)), groups)
+
+
+_steam_id_pattern, _steam_id_pattern_groups = _build_steam_id_pattern()
+
+
+def _classify(steam_id: str) -> tuple[SteamIDType, tuple[str, ...]] | None:
+    """Identifies the format of an already stripped Steam ID with a single
+    match, capturing the format's groups at the same time.
+
+    Args:
+        steam_id (str): The stripped string to identify.
+
+    Returns:
+        tuple[SteamIDType, tuple[str, ...]] | None: The format and its captured
+        groups, or None if no format matches.
+    """
+    matches = _steam_id_pattern.match(steam_id)
+    if matches is None or matches.lastindex is None:
+        return None
+    steam_id_type, inner_groups = _steam_id_pattern_groups[matches.lastindex]
+    # groups() is zero-indexed, so the format's first inner group (numbered
+    # lastindex + 1) is at position lastindex.
+    first = matches.lastindex
+    return (steam_id_type, matches.groups()[first : first + inner_groups])
+
+
+def _offline_steam_id_64(
+    steam_id_type: SteamIDType, groups: tuple[str, ...]
+) -> str | None:
+    """Converts a classified Steam ID to a Steam ID 64 without any web
+    requests.
+
+    Args:
+        steam_id_type (SteamIDType): The format of the Steam ID.
+        groups (tuple[str, ...]): The groups captured for that format.
+
+    Returns:
+        str | None: The Steam ID 64, or None if the format needs a web request
+        to resolve.
+    """
+    match steam_id_type:
+        case SteamIDType.STEAM_ID:
+            y = int(groups[1])
+            z = int(groups[2])
+            return str(z * 2 + steam_id_64_identifier + y)
+        case SteamIDType.STEAM_ID_3:
+            w = int(groups[1])
+            return str(w + steam_id_64_identifier)
+        case SteamIDType.STEAM_ID_64 | SteamIDType.STANDARD_URL:
+            return groups[0]
+    return None
+
+
+def parse_many(steam_ids: Iterable[str]) -> list[str | None]:
+    """Converts many Steam IDs to Steam ID 64s at once, without creating a
+    ``SteamID`` for each. Only formats that can be converted without a web
+    request are converted.
+
+    Args:
+        steam_ids (Iterable[str]): The strings to convert.
+
+    Returns:
+        list[str | None]: The Steam ID 64 for each string, in order. None is
+        given for custom names and custom URLs, which need a web request to
+        resolve, and for strings that are not a Steam ID at all.
+    """
+    steam_id_64s: list[str | None] = []
+    append = steam_id_64s.append
+    for steam_id in steam_ids:
+        classified = _classify(steam_id.strip())
+        append(None if classified is None else _offline_steam_id_64(*classified))
+    return steam_id_64s
+
+
+async def resolve_custom_id(id: str) -> str:
+    """Resolves a custom ID with ``steamid.resolve_custom_id``. It is imported
+    on first use, so parsing Steam IDs that need no web request does not load
+    the HTTP client.
+
+    Args:
+        id (str): The custom Steam community ID to resolve.
+
+    Returns:
+        str: The resolved Steam ID 64.
+    """
+    from .resolve_custom_id import resolve_custom_id
+
+    return await resolve_custom_id(id)
+
+
 class SteamID:
     """Represents a SteamID, and allows converting between various formats to
     SteamID64.
@@ -43,13 +165,15 @@ class SteamID:
         Args:
             steam_id (str): The string to attempt to identify as a Steam ID
         """
+        self._groups: tuple[str, ...] = ()
         self._steam_id = self._identify_steam_id(steam_id)
         self._steam_id_64: str | None = None
 
     def _identify_steam_id(self, steam_id: str) -> tuple[SteamIDType, str]:
         """Accepts a string and attempts to determine what format of SteamID it
         is. Any non-empty string will ultimately be identified as a custom name
-        if no other format matches.
+        if no other format matches. The groups captured while identifying the
+        format are kept, so conversion does not need to match again.
 
         Args:
             steam_id (str): The string to attempt to identify as a Steam ID
@@ -62,27 +186,32 @@ class SteamID:
             tuple[SteamIDType, str]: The type of the SteamID and the string that matched.
         """
         stripped_steam_id = steam_id.strip()
-        if re.match(steam_id_regex[SteamIDType.STEAM_ID], stripped_steam_id):
-            return (SteamIDType.STEAM_ID, stripped_steam_id)
-        if re.match(steam_id_regex[SteamIDType.STEAM_ID_3], stripped_steam_id):
-            return (SteamIDType.STEAM_ID_3, stripped_steam_id.strip("[]"))
-        if re.match(steam_id_regex[SteamIDType.STEAM_ID_64], stripped_steam_id):
-            return (SteamIDType.STEAM_ID_64, stripped_steam_id)
-        if re.match(steam_id_regex[SteamIDType.STANDARD_URL], stripped_steam_id):
-            return (SteamIDType.STANDARD_URL, stripped_steam_id)
-        if re.match(steam_id_regex[SteamIDType.CUSTOM_URL], stripped_steam_id):
-            return (SteamIDType.CUSTOM_URL, stripped_steam_id)
-        if re.match(steam_id_regex[SteamIDType.CUSTOM_NAME], stripped_steam_id):
-            return (SteamIDType.CUSTOM_NAME, stripped_steam_id)
-
-        raise ValueError("Invalid Steam ID format!")
-
-    async def to_steam_id_64(self) -> str:
+        classified = _classify(stripped_steam_id)
+        if classified is None:
+            raise ValueError("Invalid Steam ID format!")
+        steam_id_type, self._groups = classified
+        if steam_id_type == SteamIDType.STEAM_ID_3:
+            return (steam_id_type, stripped_steam_id.strip("[]"))
+        return (steam_id_type, stripped_steam_id)
+
+    @property
+    def needs_resolution(self) -> bool:
+        """Whether converting this Steam ID to a Steam ID 64 needs a web
+        request, as it is a custom name or custom URL."""
+        return self._steam_id[0] in (SteamIDType.CUSTOM_NAME, SteamIDType.CUSTOM_URL)
+
+    async def to_steam_id_64(self, resolver: "CustomIDResolver | None" = None) -> str:
         """Converts a Steam ID to a Steam ID 64 representation. May need to make
         a web request to convert custom names and custom URLs to the correct
         representation. This request will only be made once per Steam ID if needed
         and the result will be cached.
 
+        Args:
+            resolver (CustomIDResolver | None, optional): The resolver to
+            resolve custom names and custom URLs with, so resolutions are
+            shared beyond this Steam ID. If not provided, ``resolve_custom_id``
+            is called directly. Defaults to None.
+
         Raises:
             InvalidCustomIDError: Raised if the custom id is not associated with a
             steam profile.
@@ -95,48 +224,13 @@ class SteamID:
         if self._steam_id_64 is not None:
             return self._steam_id_64
 
-        match self._steam_id[0]:
-            case SteamIDType.STEAM_ID:
-                matches = re.match(
-                    steam_id_regex[SteamIDType.STEAM_ID], self._steam_id[1]
-                )
-                assert matches is not None
-                y = int(matches.group(2))
-                z = int(matches.group(3))
-
-                steam_id_64 = z * 2 + steam_id_64_identifier + y
-                self._steam_id_64 = str(steam_id_64)
-
-            case SteamIDType.STEAM_ID_3:
-                matches = re.match(
-                    steam_id_regex[SteamIDType.STEAM_ID_3], self._steam_id[1]
-                )
-                assert matches is not None
-                w = int(matches.group(2))
-                steam_id_64 = w + steam_id_64_identifier
-                self._steam_id_64 = str(steam_id_64)
-            case SteamIDType.STEAM_ID_64:
-                self._steam_id_64 = self._steam_id[1]
-            case SteamIDType.STANDARD_URL:
-                matches = re.match(
-                    steam_id_regex[SteamIDType.STANDARD_URL], self._steam_id[1]
-                )
-                assert matches is not None
-                self._steam_id_64 = matches.group(1)
-            case SteamIDType.CUSTOM_URL:
-                matches = re.match(
-                    steam_id_regex[SteamIDType.CUSTOM_URL], self._steam_id[1]
-                )
-                assert matches is not None
-                steam_id_64 = await resolve_custom_id(matches.group(1))
-                self._steam_id_64 = steam_id_64
-            case SteamIDType.CUSTOM_NAME:
-                matches = re.match(
-                    steam_id_regex[SteamIDType.CUSTOM_NAME], self._steam_id[1]
-                )
-                assert matches is not None
-                steam_id_64 = await resolve_custom_id(matches.group(1))
-                self._steam_id_64 = steam_id_64
+        steam_id_type = self._steam_id[0]
+        steam_id_64 = _offline_steam_id_64(steam_id_type, self._groups)
+        if steam_id_64 is None and resolver is not None:
+            steam_id_64 = await resolver.resolve(self._groups[0])
+        elif steam_id_64 is None:
+            steam_id_64 = await resolve_custom_id(self._groups[0])
+        self._steam_id_64 = steam_id_64
 
         assert self._steam_id_64 is not None
         return self._steam_id_64
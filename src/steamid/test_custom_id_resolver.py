@@ -0,0 +1,121 @@
+import unittest
+import asyncio
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from cache.error import MissingCacheEntryError
+from .custom_id_resolver import CustomIDResolver, custom_id_cache_key
+from .resolve_custom_id import InvalidCustomIDError
+from .steamid import SteamID
+
+
+class FakeResolveCustomID:
+    def __init__(self, steam_id_64: str = "76561197960287930", fail: bool = False):
+        self.calls: list[str] = []
+        self.steam_id_64 = steam_id_64
+        self.fail = fail
+
+    async def __call__(self, id, session=None):
+        self.calls.append(id)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise InvalidCustomIDError()
+        return self.steam_id_64
+
+
+class TestCustomIDResolver(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_lookups_share_request(self):
+        fake = FakeResolveCustomID()
+        resolver = CustomIDResolver()
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            results = await asyncio.gather(
+                resolver.resolve("GabeLoganNewell"),
+                resolver.resolve("gabelogannewell"),
+            )
+        self.assertEqual(results, [fake.steam_id_64, fake.steam_id_64])
+        self.assertEqual(fake.calls, ["GabeLoganNewell"])
+
+    async def test_cached_resolution(self):
+        fake = FakeResolveCustomID()
+        cache = AsyncCacheAdapter(
+            DictionaryCache(
+                {
+                    custom_id_cache_key("gabelogannewell"): {
+                        "value": "12345678901234567",
+                        "updated": 1000,
+                    }
+                }
+            )
+        )
+        resolver = CustomIDResolver(cache, ttl=60, clock=lambda: 1030)
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            steam_id_64 = await resolver.resolve("gabelogannewell")
+        self.assertEqual(steam_id_64, "12345678901234567")
+        self.assertEqual(fake.calls, [])
+
+    async def test_expired_resolution(self):
+        fake = FakeResolveCustomID()
+        cache = AsyncCacheAdapter(
+            DictionaryCache(
+                {
+                    custom_id_cache_key("gabelogannewell"): {
+                        "value": "12345678901234567",
+                        "updated": 1000,
+                    }
+                }
+            )
+        )
+        resolver = CustomIDResolver(cache, ttl=60, clock=lambda: 2000)
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            steam_id_64 = await resolver.resolve("gabelogannewell")
+        self.assertEqual(steam_id_64, fake.steam_id_64)
+        cache_entry = await cache.get(custom_id_cache_key("gabelogannewell"))
+        assert cache_entry is not None
+        self.assertEqual(cache_entry["value"], fake.steam_id_64)
+
+    async def test_error_not_cached(self):
+        fake = FakeResolveCustomID(fail=True)
+        cache = AsyncCacheAdapter(DictionaryCache())
+        resolver = CustomIDResolver(cache)
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            with self.assertRaises(InvalidCustomIDError):
+                await resolver.resolve("gabelogannewell")
+            with self.assertRaises(InvalidCustomIDError):
+                await resolver.resolve("gabelogannewell")
+        self.assertEqual(len(fake.calls), 2)
+        self.assertEqual(await cache.get_many([custom_id_cache_key("gabelogannewell")]), {})
+
+    async def test_offline(self):
+        fake = FakeResolveCustomID()
+        cache = AsyncCacheAdapter(
+            DictionaryCache(
+                {
+                    custom_id_cache_key("gabelogannewell"): {
+                        "value": "12345678901234567",
+                        "updated": 1000,
+                    }
+                }
+            )
+        )
+        resolver = CustomIDResolver(cache, ttl=60, clock=lambda: 2000, offline=True)
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            steam_id_64 = await resolver.resolve("gabelogannewell")
+            with self.assertRaises(MissingCacheEntryError) as raised:
+                await resolver.resolve("robinwalker")
+        self.assertEqual(steam_id_64, "12345678901234567")
+        self.assertEqual(raised.exception.key, custom_id_cache_key("robinwalker"))
+        self.assertEqual(fake.calls, [])
+
+    async def test_steam_id_uses_resolver(self):
+        fake = FakeResolveCustomID()
+        resolver = CustomIDResolver()
+        with patch("steamid.custom_id_resolver.resolve_custom_id", fake):
+            steam_id_64 = await SteamID(
+                "https://steamcommunity.com/id/gabelogannewell"
+            ).to_steam_id_64(resolver)
+        self.assertEqual(steam_id_64, fake.steam_id_64)
+        self.assertEqual(fake.calls, ["gabelogannewell"])
+
+
+if __name__ == "__main__":
+    unittest.main()
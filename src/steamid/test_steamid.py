@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch, AsyncMock
-from .steamid import SteamID, SteamIDType
+from .steamid import SteamID, SteamIDType, parse_many
 
 
 class TestCreateSteamID(unittest.TestCase):
@@ -95,5 +95,35 @@ class TestToSteamID64(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(expected_steam_id_64, steam_id_64)
 
 
+class TestParseMany(unittest.TestCase):
+    def test_mixed_formats(self):
+        steam_id_strings = [
+            "STEAM_0:0:11101",
+            "[U:1:22202]",
+            "U:1:22202",
+            " 76561197960287930 ",
+            "https://steamcommunity.com/profiles/76561197960287930/",
+            "https://steamcommunity.com/id/gabelogannewell",
+            "gabelogannewell",
+            "",
+        ]
+        expected_steam_id_64 = "76561197960287930"
+        self.assertEqual(
+            parse_many(steam_id_strings),
+            [expected_steam_id_64] * 5 + [None, None, None],
+        )
+
+
+class TestParseManyMatchesSteamID(unittest.IsolatedAsyncioTestCase):
+    async def test_matches_to_steam_id_64(self):
+        steam_id_strings = ["STEAM_0:1:11101", "[U:1:22203]", "76561197960287931"]
+        for steam_id_string, steam_id_64 in zip(
+            steam_id_strings, parse_many(steam_id_strings)
+        ):
+            self.assertEqual(
+                await SteamID(steam_id_string).to_steam_id_64(), steam_id_64
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
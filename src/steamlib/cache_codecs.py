@@ -0,0 +1,131 @@
+from cache.codec import RecordCodec, ZlibCodec, encode_record, register_codec
+import json
+
+# Strings shared by app hover records. Append only: a record refers to these
+# by index, so existing entries must keep their position.
+app_hover_strings = (
+    "",
+    "0",
+    "1",
+    "strReleaseDate",
+    "strDescription",
+    "rgScreenshots",
+    "appid",
+    "id",
+    "filename",
+    "all_ages",
+    "rgCategories",
+    "strDisplayName",
+    "strGenres",
+    "strMicroTrailerURL",
+    "ReviewSummary",
+    "strReviewSummary",
+    "cReviews",
+    "cRecommendationsPositive",
+    "cRecommendationsNegative",
+    "nReviewScore",
+    "Single-player",
+    "Multi-player",
+    "Online PvP",
+    "Online Co-op",
+    "Shared/Split Screen",
+    "Cross-Platform Multiplayer",
+    "Steam Achievements",
+    "Steam Trading Cards",
+    "Steam Workshop",
+    "Steam Cloud",
+    "Steam Leaderboards",
+    "Full controller support",
+    "Partial Controller Support",
+    "Remote Play Together",
+    "Remote Play on TV",
+    "Family Sharing",
+    "In-App Purchases",
+    "Includes level editor",
+    "Overwhelmingly Positive",
+    "Very Positive",
+    "Positive",
+    "Mostly Positive",
+    "Mixed",
+    "Mostly Negative",
+    "Negative",
+    "Very Negative",
+    "Overwhelmingly Negative",
+    "No user reviews",
+    "Action",
+    "Adventure",
+    "Casual",
+    "Indie",
+    "RPG",
+    "Simulation",
+    "Strategy",
+    "Free to Play",
+    "Early Access",
+)
+
+# Text common to app hover and owned games values, least common first, as
+# zlib finds matches closer to the end of its dictionary more cheaply.
+# Fixed once values are stored with it.
+_dictionary_fragments = (
+    ".1920x1080.jpg",
+    "https://video.akamai.steamstatic.com/store_trailers/",
+    "/microtrailer.webm?t=",
+    '{"strReleaseDate": "',
+    '", "strDescription": "',
+    '", "rgScreenshots": [',
+    '{"appid": ',
+    ', "id": 0, "filename": "ss_',
+    '.jpg", "all_ages": "1"}, ',
+    '], "rgCategories": [',
+    '{"strDisplayName": "',
+    '"}, ',
+    '], "strGenres": "',
+    '", "strMicroTrailerURL": "',
+    '", "ReviewSummary": {"strReviewSummary": "',
+    '", "cReviews": ',
+    ', "cRecommendationsPositive": ',
+    ', "cRecommendationsNegative": ',
+    ', "nReviewScore": ',
+)
+
+app_hover_dictionary = "".join(
+    (*app_hover_strings[20:], *_dictionary_fragments)
+).encode("utf-8")
+
+# A typical app hover response, as a record, to prime record compression.
+_app_hover_template = {
+    "strReleaseDate": "Jan 1, 2020",
+    "strDescription": "",
+    "rgScreenshots": [
+        {
+            "appid": 0,
+            "id": 0,
+            "filename": "ss_.1920x1080.jpg",
+            "all_ages": "1",
+        }
+    ],
+    "rgCategories": [{"strDisplayName": "Single-player"}],
+    "strGenres": "Action, Adventure, Indie",
+    "strMicroTrailerURL": "https://video.akamai.steamstatic.com/store_trailers//microtrailer.webm?t=",
+    "ReviewSummary": {
+        "strReviewSummary": "Very Positive",
+        "cReviews": 0,
+        "cRecommendationsPositive": 0,
+        "cRecommendationsNegative": 0,
+        "nReviewScore": 8,
+    },
+}
+
+app_hover_record_dictionary = json.dumps(
+    list(app_hover_strings[20:])
+).encode("utf-8") + encode_record(_app_hover_template, app_hover_strings)
+
+# Compresses the JSON text of Steam values with the shared dictionary. No
+# longer used to store values, but kept so values it stored can be decoded.
+steam_zlib_codec = register_codec(ZlibCodec(2, app_hover_dictionary))
+
+# Stores Steam values as binary records, compressed with a dictionary primed
+# by a typical app hover record. The codec of the persistent cache.
+steam_record_codec = register_codec(
+    RecordCodec(3, app_hover_strings, ZlibCodec(3, app_hover_record_dictionary))
+)
@@ -0,0 +1,375 @@
+from typing import AsyncIterator, Callable, Iterable
+from cache.async_cache import AsyncCache
+from cache.cache import CacheEntry
+from cache.error import MissingCacheEntryError
+from .get_app_hover import AppHoverResponse, get_app_hover
+from .error import InvalidResponseError
+from .session import session_scope
+from functools import partial
+from time import time
+import aiohttp
+import asyncio
+import json
+
+DAY = 24 * 60 * 60
+
+
+def app_hover_cache_key(appid: int) -> str:
+    """Formats the cache key hover data for an appid is stored under.
+
+    Args:
+        appid (int): The app id.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"app_hover:{appid}"
+
+
+class CachedAppHover:
+    """Serves ``get_app_hover`` lookups from an AsyncCache using
+    stale-while-revalidate.
+
+    Entries younger than ``fresh_for`` seconds are served directly. Older
+    entries are still served immediately, while a background request refreshes
+    them, as long as they are no more than ``max_stale`` seconds past fresh.
+    Only misses, and entries too stale to serve, wait on the network.
+    Concurrent lookups of the same appid share a single request, whether made
+    by ``get`` or ``get_many``.
+
+    When ``offline``, no request is ever made: every cached entry is served,
+    however stale, and appids that are not cached are reported as missing.
+    """
+
+    def __init__(
+        self,
+        cache: AsyncCache,
+        fresh_for: float = 7 * DAY,
+        max_stale: float | None = None,
+        clock: Callable[[], float] = time,
+        offline: bool = False,
+    ) -> None:
+        """Create a new CachedAppHover storing its responses in ``cache``.
+
+        Args:
+            cache (AsyncCache): The cache to store hover responses in.
+            fresh_for (float, optional): The number of seconds a response is
+            served without being refreshed. Defaults to 7 days.
+            max_stale (float | None, optional): The number of seconds past
+            ``fresh_for`` a response may still be served while it is refreshed.
+            If None, stale responses are always served. Defaults to None.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.time``.
+            offline (bool, optional): Whether to only serve responses from the
+            cache. Defaults to False.
+        """
+        self._cache = cache
+        self._fresh_for = fresh_for
+        self._max_stale = max_stale
+        self._clock = clock
+        self._offline = offline
+        self._in_flight: dict[int, asyncio.Task[AppHoverResponse]] = {}
+        # The number of callers waiting on each request in flight.
+        self._waiters: dict[int, int] = {}
+        # Bulk refreshes of stale entries started by ``get_many``.
+        self._bulk_refreshes: set[asyncio.Task[None]] = set()
+
+    async def get(
+        self, appid: int, session: aiohttp.ClientSession | None = None
+    ) -> AppHoverResponse:
+        """Gets the ``AppHoverResponse`` for the given appid, from the cache if
+        possible.
+
+        Args:
+            appid (int): The app id to retrieve the response for
+            session (aiohttp.ClientSession | None, optional): The session to
+            make any request with. Defaults to None.
+
+        Raises:
+            InvalidResponseError: Raised when the appid is not usable from the
+            cache and an invalid response is received from the server.
+            MissingCacheEntryError: Raised if offline and the appid is not
+            cached.
+
+        Returns:
+            AppHoverResponse: The ``AppHoverResponse`` for the appid
+        """
+        key = app_hover_cache_key(appid)
+        cache_entry = await self._cache.get(key)
+        response, stale = self._from_cache_entry(cache_entry)
+        if stale:
+            self._refresh(appid, session)
+        if response is not None:
+            return response
+        if self._offline:
+            raise MissingCacheEntryError(key)
+        task = self._refresh(appid, session)
+        self._wait_on(appid)
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._stop_waiting(appid)
+
+    async def get_many(
+        self,
+        appids: Iterable[int],
+        concurrency: int = 8,
+        session: aiohttp.ClientSession | None = None,
+    ) -> AsyncIterator[
+        tuple[int, AppHoverResponse | InvalidResponseError | MissingCacheEntryError]
+    ]:
+        """Gets the ``AppHoverResponse`` for many appids. Every appid is looked
+        up in the cache with a single bulk read and usable entries are yielded
+        first. The rest are fetched, yielding results as they complete, or, if
+        offline, yielded as missing. Stale entries are refreshed in the
+        background through the same bounded fetches, and fetched responses are
+        written to the cache in bulk.
+
+        Args:
+            appids (Iterable[int]): The app ids to retrieve responses for.
+            concurrency (int, optional): The maximum number of requests in
+            flight at once, for the misses and for the stale entries each.
+            Defaults to 8.
+            session (aiohttp.ClientSession | None, optional): The session to
+            make any requests with. Defaults to None.
+
+        Raises:
+            ValueError: Raised if ``concurrency`` is less than 1.
+
+        Yields:
+            tuple[int, AppHoverResponse | InvalidResponseError |
+            MissingCacheEntryError]: The appid and either its response or the
+            error encountered retrieving it.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        appid_list = list(dict.fromkeys(appids))
+        cache_entries = await self._cache.get_many(
+            app_hover_cache_key(appid) for appid in appid_list
+        )
+        missing: list[int] = []
+        stale: list[int] = []
+        for appid in appid_list:
+            response, is_stale = self._from_cache_entry(
+                cache_entries.get(app_hover_cache_key(appid))
+            )
+            if is_stale:
+                stale.append(appid)
+            if response is None:
+                missing.append(appid)
+            else:
+                yield (appid, response)
+        if self._offline:
+            for appid in missing:
+                yield (appid, MissingCacheEntryError(app_hover_cache_key(appid)))
+            return
+        if stale:
+            task = asyncio.create_task(self._refresh_many(stale, concurrency, session))
+            self._bulk_refreshes.add(task)
+            task.add_done_callback(self._on_bulk_refresh_done)
+        async for result in self._fetch_many(missing, concurrency, session):
+            yield result
+
+    async def wait_for_refreshes(self) -> None:
+        """Wait for every background refresh currently running to finish."""
+        while self._in_flight or self._bulk_refreshes:
+            await asyncio.gather(
+                *self._in_flight.values(),
+                *self._bulk_refreshes,
+                return_exceptions=True,
+            )
+
+    def cancel(self, appid: int) -> None:
+        """Cancel the request in flight for an appid, if any, such as a miss
+        whose caller no longer needs it. A request other ``get`` calls are
+        still waiting on is left to finish for them.
+
+        Args:
+            appid (int): The app id to cancel the request for.
+        """
+        task = self._in_flight.get(appid)
+        if task is not None and appid not in self._waiters:
+            task.cancel()
+
+    def _from_cache_entry(
+        self, cache_entry: CacheEntry | None
+    ) -> tuple[AppHoverResponse | None, bool]:
+        """Decide whether a cache entry can be served, and whether it needs
+        refreshing.
+
+        Args:
+            cache_entry (CacheEntry | None): The entry read from the cache.
+
+        Returns:
+            tuple[AppHoverResponse | None, bool]: The response to serve, or
+            None if the caller must wait on the network, and whether a
+            background refresh is needed.
+        """
+        if cache_entry is None:
+            return (None, False)
+        if self._offline:
+            return (json.loads(cache_entry["value"]), False)
+        age = self._clock() - cache_entry["updated"]
+        if age > self._fresh_for:
+            if self._max_stale is not None and age > self._fresh_for + self._max_stale:
+                return (None, False)
+            return (json.loads(cache_entry["value"]), True)
+        return (json.loads(cache_entry["value"]), False)
+
+    def _refresh(
+        self, appid: int, session: aiohttp.ClientSession | None, store: bool = True
+    ) -> asyncio.Task[AppHoverResponse]:
+        """Start fetching the response for an appid, or return the request
+        already in flight for it.
+
+        Args:
+            appid (int): The app id to refresh.
+            session (aiohttp.ClientSession | None): The session to fetch with.
+            store (bool, optional): Whether a new request stores its response
+            in the cache itself, rather than leaving that to the caller.
+            Defaults to True.
+
+        Returns:
+            asyncio.Task[AppHoverResponse]: The in-flight request.
+        """
+        task = self._in_flight.get(appid)
+        if task is None:
+            task = asyncio.create_task(self._fetch(appid, session, store))
+            self._in_flight[appid] = task
+            task.add_done_callback(partial(self._on_refresh_done, appid))
+        return task
+
+    async def _fetch_many(
+        self,
+        appids: Iterable[int],
+        concurrency: int,
+        session: aiohttp.ClientSession | None,
+    ) -> AsyncIterator[tuple[int, AppHoverResponse | InvalidResponseError]]:
+        """Fetch the responses for many appids, with at most ``concurrency``
+        requests in flight. Each request is registered like one made by
+        ``get``, so a concurrent lookup of the same appid shares it. Responses
+        are written to the cache with ``set_many``, in batches of up to
+        ``concurrency``.
+
+        Args:
+            appids (Iterable[int]): The app ids to fetch.
+            concurrency (int): The maximum number of requests in flight.
+            session (aiohttp.ClientSession | None): The session to fetch with.
+
+        Yields:
+            tuple[int, AppHoverResponse | InvalidResponseError]: The appid
+            and either its response or the error encountered retrieving it,
+            as they complete.
+        """
+        appid_iterator = iter(appids)
+        pending: dict[asyncio.Task[AppHoverResponse], int] = {}
+        fetched: dict[str, str] = {}
+
+        async with session_scope(session) as session:
+
+            def fill() -> None:
+                while len(pending) < concurrency:
+                    appid = next(appid_iterator, None)
+                    if appid is None:
+                        return
+                    pending[self._refresh(appid, session, store=False)] = appid
+                    self._wait_on(appid)
+
+            try:
+                fill()
+                while pending:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    completed = [(pending.pop(task), task) for task in done]
+                    for appid, _ in completed:
+                        self._stop_waiting(appid)
+                    fill()
+                    for appid, task in completed:
+                        if task.cancelled():
+                            continue
+                        result: AppHoverResponse | InvalidResponseError
+                        try:
+                            result = task.result()
+                        except InvalidResponseError as e:
+                            result = e
+                        else:
+                            fetched[app_hover_cache_key(appid)] = json.dumps(result)
+                        yield (appid, result)
+                    if len(fetched) >= concurrency:
+                        await self._cache.set_many(fetched)
+                        fetched = {}
+            finally:
+                for appid in pending.values():
+                    self._stop_waiting(appid)
+                    self.cancel(appid)
+                await asyncio.gather(*pending, return_exceptions=True)
+                # Requests other callers were waiting on ran to completion.
+                for task, appid in pending.items():
+                    if not task.cancelled() and task.exception() is None:
+                        fetched[app_hover_cache_key(appid)] = json.dumps(task.result())
+                if fetched:
+                    await self._cache.set_many(fetched)
+
+    async def _refresh_many(
+        self,
+        appids: list[int],
+        concurrency: int,
+        session: aiohttp.ClientSession | None,
+    ) -> None:
+        """Refresh stale entries through ``_fetch_many``, ignoring the
+        results, so a failed refresh leaves its stale entry in place."""
+        async for _ in self._fetch_many(appids, concurrency, session):
+            pass
+
+    def _on_bulk_refresh_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished bulk refresh, retrieving its error, if any."""
+        self._bulk_refreshes.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def _wait_on(self, appid: int) -> None:
+        """Count a caller waiting on the request for an appid, so ``cancel``
+        leaves it alone."""
+        self._waiters[appid] = self._waiters.get(appid, 0) + 1
+
+    def _stop_waiting(self, appid: int) -> None:
+        """Stop counting a caller waiting on the request for an appid."""
+        self._waiters[appid] -= 1
+        if not self._waiters[appid]:
+            del self._waiters[appid]
+
+    def _on_refresh_done(
+        self, appid: int, task: asyncio.Task[AppHoverResponse]
+    ) -> None:
+        """Forget a finished request. Errors are retrieved here so a failed
+        background refresh, which leaves the stale entry in place, is not
+        reported as an unhandled exception.
+
+        Args:
+            appid (int): The app id the request was for.
+            task (asyncio.Task[AppHoverResponse]): The finished request.
+        """
+        if self._in_flight.get(appid) is task:
+            del self._in_flight[appid]
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch(
+        self, appid: int, session: aiohttp.ClientSession | None, store: bool
+    ) -> AppHoverResponse:
+        """Fetch the response for an appid, storing it in the cache if asked
+        to.
+
+        Args:
+            appid (int): The app id to fetch.
+            session (aiohttp.ClientSession | None): The session to fetch with.
+            store (bool): Whether to store the response in the cache.
+
+        Returns:
+            AppHoverResponse: The fetched response.
+        """
+        response = await get_app_hover(appid, session=session)
+        if store:
+            await self._cache.set(app_hover_cache_key(appid), json.dumps(response))
+        return response
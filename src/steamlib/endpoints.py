@@ -0,0 +1,8 @@
+"""The base URLs of the Steam hosts requests are made to. They are read each
+time a request URL is built, so they can be pointed at another server, such as
+the fake Steam server used by the benchmarks.
+"""
+
+STEAM_API_URL = "https://api.steampowered.com"
+STEAM_STORE_URL = "https://store.steampowered.com"
+STEAM_COMMUNITY_URL = "https://steamcommunity.com"
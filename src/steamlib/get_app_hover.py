@@ -1,8 +1,15 @@
-from typing import TypedDict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, TypedDict
+from functools import cache
 import aiohttp
+import asyncio
 import json
-from jsonschema import validate
+from . import endpoints
 from .error import InvalidResponseError
+from .rate_limit import rate_limited_get
+from .session import session_scope
+
+if TYPE_CHECKING:
+    from jsonschema import Draft4Validator
 
 class AppHoverScreenshot(TypedDict):
     appid: int
@@ -124,12 +131,128 @@ app_hover_response_schema = {
   ]
 }
 
-    
-async def get_app_hover(appid: int) -> AppHoverResponse:
+
+@cache
+def _app_hover_validator() -> "Draft4Validator":
+    """Builds the validator for ``app_hover_response_schema``. The schema is
+    only checked, and the validator only built, on first use. ``jsonschema``
+    is slow to import, so it is only imported here.
+
+    Returns:
+        Draft4Validator: The compiled validator.
+    """
+    from jsonschema import Draft4Validator
+
+    Draft4Validator.check_schema(app_hover_response_schema)
+    return Draft4Validator(app_hover_response_schema)
+
+
+def validate_app_hover_response(instance: Any) -> None:
+    """Validates a decoded response against ``app_hover_response_schema``
+    using a validator compiled once and reused.
+
+    Args:
+        instance (Any): The decoded response.
+
+    Raises:
+        jsonschema.ValidationError: Raised if the response does not meet the
+        schema.
+    """
+    _app_hover_validator().validate(instance)
+
+
+def _is_integer(value: Any) -> bool:
+    """Whether ``value`` matches draft-04's ``integer`` type, which excludes
+    booleans and floats."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _has_string(instance: dict, key: str) -> bool:
+    """Whether ``key`` is present in ``instance`` and is a string."""
+    return isinstance(instance.get(key), str)
+
+
+def is_app_hover_response(instance: Any) -> bool:
+    """A hand-written structural check accepting exactly what
+    ``app_hover_response_schema`` accepts, without the overhead of a schema
+    validator. Intended for bulk fetches.
+
+    Args:
+        instance (Any): The decoded response.
+
+    Returns:
+        bool: Whether the response meets the schema.
+    """
+    if not isinstance(instance, dict):
+        return False
+    if not all(
+        _has_string(instance, key)
+        for key in (
+            "strReleaseDate",
+            "strDescription",
+            "strGenres",
+            "strMicroTrailerURL",
+        )
+    ):
+        return False
+    screenshots = instance.get("rgScreenshots")
+    if not isinstance(screenshots, list):
+        return False
+    for screenshot in screenshots:
+        if not (
+            isinstance(screenshot, dict)
+            and _is_integer(screenshot.get("appid"))
+            and _is_integer(screenshot.get("id"))
+            and _has_string(screenshot, "filename")
+            and _has_string(screenshot, "all_ages")
+        ):
+            return False
+    categories = instance.get("rgCategories")
+    if not isinstance(categories, list):
+        return False
+    for category in categories:
+        if not (isinstance(category, dict) and _has_string(category, "strDisplayName")):
+            return False
+    review_summary = instance.get("ReviewSummary")
+    return (
+        isinstance(review_summary, dict)
+        and _has_string(review_summary, "strReviewSummary")
+        and _is_integer(review_summary.get("cReviews"))
+        and _is_integer(review_summary.get("cRecommendationsPositive"))
+        and _is_integer(review_summary.get("cRecommendationsNegative"))
+        and _is_integer(review_summary.get("nReviewScore"))
+    )
+
+
+def app_hover_url(appid: int) -> str:
+    """Formats the store ``apphoverpublic`` request URL for an app.
+
+    Args:
+        appid (int): The app id to get the hover data for.
+
+    Returns:
+        str: The request URL, asking for English JSON.
+    """
+    return f"{endpoints.STEAM_STORE_URL}/apphoverpublic/{appid}/?l=english&json=1"
+
+
+async def get_app_hover(
+    appid: int,
+    session: aiohttp.ClientSession | None = None,
+    fast_validation: bool = False,
+) -> AppHoverResponse:
     """Gets the ``AppHoverResponse`` from the Steam store endpoint, for the given appid.
+    The request goes through the shared per-host rate limiter, and throttled or
+    failed requests are retried with ``rate_limited_get``.
 
     Args:
         appid (int): The app id to retrieve the response for
+        session (aiohttp.ClientSession | None, optional): The session to make
+        the request with. If not provided, the current shared session is used,
+        or a temporary one is created. Defaults to None.
+        fast_validation (bool, optional): Whether to check the response with
+        ``is_app_hover_response`` instead of the schema validator. Defaults to
+        False.
 
     Raises:
         InvalidResponseError: Raised when an invalid response is received from
@@ -139,19 +262,99 @@ async def get_app_hover(appid: int) -> AppHoverResponse:
     Returns:
         AppHoverResponse: The ``AppHoverResponse`` from the endpoint
     """
-    url = f"https://store.steampowered.com/apphoverpublic/{appid}/?l=english&json=1"
+    url = app_hover_url(appid)
     json_text = ""
     parsed_json: AppHoverResponse
-    async with aiohttp.ClientSession(raise_for_status=True) as session:
+    async with session_scope(session) as session:
         try:
-            async with session.get(url) as response:
+            async with rate_limited_get(session, url, endpoint="app_hover") as response:
                 json_text = await response.text()
         except Exception as e:  
             raise InvalidResponseError from e
     try:
         parsed_json = json.loads(json_text)
-        validate(instance=parsed_json, schema=app_hover_response_schema)
     except Exception as e:
         raise InvalidResponseError from e
+    if fast_validation:
+        if not is_app_hover_response(parsed_json):
+            raise InvalidResponseError(
+                "Response does not meet the app hover response schema"
+            )
+    else:
+        try:
+            validate_app_hover_response(parsed_json)
+        except Exception as e:
+            raise InvalidResponseError from e
     
-    return parsed_json
\ No newline at end of file
+    return parsed_json
+
+
+async def get_app_hover_many(
+    appids: Iterable[int],
+    concurrency: int = 8,
+    session: aiohttp.ClientSession | None = None,
+    fast_validation: bool = False,
+) -> AsyncIterator[tuple[int, AppHoverResponse | InvalidResponseError]]:
+    """Gets the ``AppHoverResponse`` for many appids, making at most
+    ``concurrency`` requests at a time. Results are yielded in the order they
+    complete, not the order of ``appids``. A failed appid does not stop the rest
+    of the batch; its ``InvalidResponseError`` is yielded in place of a
+    response.
+
+    Args:
+        appids (Iterable[int]): The app ids to retrieve responses for. Consumed
+        lazily, so it may be a generator.
+        concurrency (int, optional): The maximum number of requests in flight
+        at once. Defaults to 8.
+        session (aiohttp.ClientSession | None, optional): The session to make
+        the requests with. If not provided, the current shared session is used,
+        or a temporary one is created for the whole batch. Defaults to None.
+        fast_validation (bool, optional): Whether to check responses with
+        ``is_app_hover_response`` instead of the schema validator. Defaults to
+        False.
+
+    Raises:
+        ValueError: Raised if ``concurrency`` is less than 1.
+
+    Yields:
+        tuple[int, AppHoverResponse | InvalidResponseError]: The appid and
+        either its response or the error encountered retrieving it.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    appid_iterator = iter(appids)
+    pending: dict[asyncio.Task[AppHoverResponse], int] = {}
+
+    async with session_scope(session) as session:
+
+        def fill() -> None:
+            while len(pending) < concurrency:
+                appid = next(appid_iterator, None)
+                if appid is None:
+                    return
+                task = asyncio.create_task(
+                    get_app_hover(
+                        appid, session=session, fast_validation=fast_validation
+                    )
+                )
+                pending[task] = appid
+
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                completed = [(pending.pop(task), task) for task in done]
+                fill()
+                for appid, task in completed:
+                    result: AppHoverResponse | InvalidResponseError
+                    try:
+                        result = task.result()
+                    except InvalidResponseError as e:
+                        result = e
+                    yield (appid, result)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -1,55 +1,212 @@
-from typing import Any, TypedDict
+from typing import Any, AsyncIterator
 import aiohttp
+import codecs
 import json
+import re
+from . import endpoints
 from .error import AuthFailedError
+from .owned_games import OwnedGame
+from .rate_limit import rate_limited_get
+from .session import session_scope
 
-class OwnedGame(TypedDict):
-    name: str
-    playtime_forever: int
-    appid: int
 
+def owned_games_url(steam_id_64: str, steam_api_key: str) -> str:
+    """Formats the ``GetOwnedGames`` request URL for an account.
 
-async def get_owned_games(steam_id_64: str, steam_api_key: str) -> list[OwnedGame]:
-    """Gets a list of games owned by an account. May fail if the account is
-    private, or if the Steam API key is invalid.
+    Args:
+        steam_id_64 (str): The Steam ID 64 to get the owned games for.
+        steam_api_key (str): The Steam API key to use to make the request.
+
+    Returns:
+        str: The request URL, including app info so names are returned.
+    """
+    return f"{endpoints.STEAM_API_URL}/IPlayerService/GetOwnedGames/v1/?key={steam_api_key}&steamid={steam_id_64}&include_appinfo=1"
+
+
+_games_array_start = re.compile(r'"games"\s*:\s*\[')
+_array_separator = re.compile(r"[\s,]*")
+
+
+class OwnedGamesStreamDecoder:
+    """Incrementally decodes the ``response.games`` array of a
+    ``GetOwnedGames`` response body. Bytes are fed in as they arrive, and each
+    game object is returned as soon as it is complete, so only the game
+    currently being received is ever buffered.
+
+    Only the key ``games`` followed by an array is looked for. JSON strings
+    cannot contain an unescaped quote, so this can only match the key itself.
+    """
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_array = False
+        self._done = False
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Decode the next chunk of the response body.
+
+        Args:
+            data (bytes): The next chunk of the body.
+
+        Returns:
+            list[dict[str, Any]]: The game objects completed by this chunk.
+        """
+        if self._done:
+            return []
+        self._buffer += self._text_decoder.decode(data)
+        return self._decode_games()
+
+    def close(self) -> list[dict[str, Any]]:
+        """Signal the end of the response body.
+
+        Raises:
+            ValueError: Raised if the body ended partway through the games
+            array.
+
+        Returns:
+            list[dict[str, Any]]: Any game objects completed by the end of the
+            body.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        games = [] if self._done else self._decode_games()
+        if self._in_array and not self._done:
+            raise ValueError("Response body ended inside the games array")
+        return games
+
+    def _decode_games(self) -> list[dict[str, Any]]:
+        """Decode every complete game object in the buffer, then drop what
+        has been consumed.
+
+        Returns:
+            list[dict[str, Any]]: The decoded game objects.
+        """
+        games: list[dict[str, Any]] = []
+        position = 0
+        if not self._in_array:
+            start = _games_array_start.search(self._buffer)
+            if start is None:
+                # Keep enough of the tail that a key split across chunks is
+                # still found.
+                self._buffer = self._buffer[-32:]
+                return games
+            self._in_array = True
+            position = start.end()
+        buffer = self._buffer
+        while True:
+            separator = _array_separator.match(buffer, position)
+            assert separator is not None
+            position = separator.end()
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                self._done = True
+                break
+            try:
+                game, position = self._json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+            games.append(game)
+        self._buffer = "" if self._done else buffer[position:]
+        return games
+
+
+def _compact_owned_game(game: dict[str, Any]) -> OwnedGame:
+    """Keeps only the properties of a game that an ``OwnedGame`` needs.
+
+    Args:
+        game (dict[str, Any]): A game object from the ``GetOwnedGames``
+        response.
+
+    Returns:
+        OwnedGame: The compact game record.
+    """
+    return {
+        "name": game["name"],
+        "playtime_forever": game["playtime_forever"],
+        "appid": game["appid"],
+    }
+
+
+async def iter_owned_games(
+    steam_id_64: str,
+    steam_api_key: str,
+    session: aiohttp.ClientSession | None = None,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[OwnedGame]:
+    """Streams the games owned by an account, yielding each game as soon as it
+    has been received rather than waiting for the whole response. May fail if
+    the account is private, or if the Steam API key is invalid.
 
     Args:
         steam_id_64 (str): The Steam ID 64 to get the owned games for.
         steam_api_key (str): The Steam API key to use to make the request.
+        session (aiohttp.ClientSession | None, optional): The session to make
+        the request with. If not provided, the current shared session is used,
+        or a temporary one is created. Defaults to None.
+        chunk_size (int, optional): The maximum number of bytes read from the
+        response at a time. Defaults to 64 KiB.
 
     Raises:
         AuthFailedError: Raised if a 401 is received when trying to look up the
         owned games for the user. May be due to an invalid Steam API key or due
         to a non-public profile that the key does not have access to view.
+        aiohttp.ClientResponseError: Raised if any other error status is
+        received, once throttled and failed requests are no longer retried.
+        ValueError: Raised if the response ends partway through the games.
 
-    Returns:
-        list[OwnedGame]: A list of owned games, including only the name,
-        playtime, and appid. See definition of ``OwnedGame`` for the exact
-        property names.
+    Yields:
+        OwnedGame: Each owned game, including only the name, playtime, and
+        appid.
     """
-    url = f"https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/?key={steam_api_key}&steamid={steam_id_64}&include_appinfo=1"
-    async with aiohttp.ClientSession(raise_for_status=True) as session:
-        parsed_json = {}
+    url = owned_games_url(steam_id_64, steam_api_key)
+    async with session_scope(session) as session:
         try:
-            async with session.get(url) as response:
-                json_text = await response.text()
-                parsed_json = json.loads(json_text)
+            async with rate_limited_get(session, url, endpoint="owned_games") as response:
+                decoder = OwnedGamesStreamDecoder()
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    for game in decoder.feed(chunk):
+                        yield _compact_owned_game(game)
+                for game in decoder.close():
+                    yield _compact_owned_game(game)
         except aiohttp.ClientResponseError as e:
             if e.status == 401:
                 raise AuthFailedError(
                     f'Could not retrieve games for SteamID64 "{steam_id_64}"'
                 )
+            raise
+
+
+async def get_owned_games(
+    steam_id_64: str,
+    steam_api_key: str,
+    session: aiohttp.ClientSession | None = None,
+) -> list[OwnedGame]:
+    """Gets a list of games owned by an account. May fail if the account is
+    private, or if the Steam API key is invalid. The response is decoded with
+    ``iter_owned_games``, so the full response is never held in memory.
+
+    Args:
+        steam_id_64 (str): The Steam ID 64 to get the owned games for.
+        steam_api_key (str): The Steam API key to use to make the request.
+        session (aiohttp.ClientSession | None, optional): The session to make
+        the request with. If not provided, the current shared session is used,
+        or a temporary one is created. Defaults to None.
 
-    if "response" not in parsed_json:
-        return []
-    if "games" not in parsed_json["response"]:
-        return []
-    owned_games: list[OwnedGame] = [
-        {
-            "name": game["name"],
-            "playtime_forever": game["playtime_forever"],
-            "appid": game["appid"],
-        }
-        for game in parsed_json["response"]["games"]
+    Raises:
+        AuthFailedError: Raised if a 401 is received when trying to look up the
+        owned games for the user. May be due to an invalid Steam API key or due
+        to a non-public profile that the key does not have access to view.
+        aiohttp.ClientResponseError: Raised if any other error status is
+        received, once throttled and failed requests are no longer retried.
+
+    Returns:
+        list[OwnedGame]: A list of owned games, including only the name,
+        playtime, and appid. See definition of ``OwnedGame`` for the exact
+        property names.
+    """
+    return [
+        game
+        async for game in iter_owned_games(steam_id_64, steam_api_key, session)
     ]
-    return owned_games
@@ -0,0 +1,237 @@
+from array import array
+from collections.abc import Container, Sequence
+from itertools import compress
+from typing import Iterable, Iterator, TypedDict, overload
+import sys
+
+
+class OwnedGame(TypedDict):
+    name: str
+    playtime_forever: int
+    appid: int
+
+
+class OwnedGames(Sequence[OwnedGame]):
+    """A compact, column-oriented collection of owned games. Appids and
+    playtimes are stored in parallel ``array`` columns and names are interned,
+    so a game costs a few machine words rather than a whole dictionary.
+
+    Games are still read back as ``OwnedGame`` dictionaries, created on
+    access, so an ``OwnedGames`` can be used anywhere a ``list[OwnedGame]``
+    was. Filters return ``OwnedGamesView`` index views instead of copies.
+    """
+
+    def __init__(self, games: Iterable[OwnedGame] = ()) -> None:
+        """Create a new collection holding the given games.
+
+        Args:
+            games (Iterable[OwnedGame], optional): The games to add. Defaults
+            to no games.
+        """
+        self._appids = array("q")
+        self._playtimes = array("q")
+        self._names: list[str] = []
+        self.extend(games)
+
+    def append(self, game: OwnedGame) -> None:
+        """Add a game to the end of the collection.
+
+        Args:
+            game (OwnedGame): The game to add.
+        """
+        self._appids.append(game["appid"])
+        self._playtimes.append(game["playtime_forever"])
+        self._names.append(sys.intern(game["name"]))
+
+    def extend(self, games: Iterable[OwnedGame]) -> None:
+        """Add several games to the end of the collection.
+
+        Args:
+            games (Iterable[OwnedGame]): The games to add.
+        """
+        for game in games:
+            self.append(game)
+
+    def set_playtime(self, index: int, minutes: int) -> None:
+        """Change the ``playtime_forever`` of the game at ``index``.
+
+        Args:
+            index (int): The index of the game.
+            minutes (int): The new playtime, in minutes.
+        """
+        self._playtimes[index] = minutes
+
+    @property
+    def appids(self) -> array:
+        """The appid column. Must not be modified."""
+        return self._appids
+
+    @property
+    def playtimes(self) -> array:
+        """The ``playtime_forever`` column, in minutes. Must not be modified."""
+        return self._playtimes
+
+    @property
+    def names(self) -> list[str]:
+        """The name column. Must not be modified."""
+        return self._names
+
+    def __len__(self) -> int:
+        return len(self._appids)
+
+    @overload
+    def __getitem__(self, index: int) -> OwnedGame: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OwnedGamesView": ...
+
+    def __getitem__(self, index: int | slice) -> "OwnedGame | OwnedGamesView":
+        if isinstance(index, slice):
+            return OwnedGamesView(self, array("q", range(len(self))[index]))
+        return {
+            "name": self._names[index],
+            "playtime_forever": self._playtimes[index],
+            "appid": self._appids[index],
+        }
+
+    def __iter__(self) -> Iterator[OwnedGame]:
+        for name, playtime_forever, appid in zip(
+            self._names, self._playtimes, self._appids
+        ):
+            yield {
+                "name": name,
+                "playtime_forever": playtime_forever,
+                "appid": appid,
+            }
+
+    def where_playtime_below(self, minutes: int) -> "OwnedGamesView":
+        """Select the games with a ``playtime_forever`` below ``minutes``.
+
+        Args:
+            minutes (int): The exclusive playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        return OwnedGamesView(
+            self,
+            array("q", compress(range(len(self)), map(minutes.__gt__, self._playtimes))),
+        )
+
+    def where_appid_in(self, appids: Container[int]) -> "OwnedGamesView":
+        """Select the games whose appid is in ``appids``.
+
+        Args:
+            appids (Container[int]): The appids to keep.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        return OwnedGamesView(
+            self,
+            array(
+                "q",
+                compress(range(len(self)), (appid in appids for appid in self._appids)),
+            ),
+        )
+
+    def where_playtime_at_least(self, minutes: int) -> "OwnedGamesView":
+        """Select the games with a ``playtime_forever`` of at least ``minutes``.
+
+        Args:
+            minutes (int): The inclusive playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        return OwnedGamesView(
+            self,
+            array("q", compress(range(len(self)), map(minutes.__le__, self._playtimes))),
+        )
+
+
+class OwnedGamesView(Sequence[OwnedGame]):
+    """A read-only selection of games from an ``OwnedGames``, stored as an
+    array of indices into it.
+    """
+
+    def __init__(self, games: OwnedGames, indices: array) -> None:
+        """Create a new view of ``games``.
+
+        Args:
+            games (OwnedGames): The collection the view selects from.
+            indices (array): The indices of the selected games, in order.
+        """
+        self._games = games
+        self._indices = indices
+
+    @property
+    def indices(self) -> array:
+        """The indices of the selected games. Must not be modified."""
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, index: int) -> OwnedGame: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OwnedGamesView": ...
+
+    def __getitem__(self, index: int | slice) -> "OwnedGame | OwnedGamesView":
+        if isinstance(index, slice):
+            return OwnedGamesView(self._games, self._indices[index])
+        return self._games[self._indices[index]]
+
+    def __iter__(self) -> Iterator[OwnedGame]:
+        games = self._games
+        for index in self._indices:
+            yield games[index]
+
+    def where_playtime_below(self, minutes: int) -> "OwnedGamesView":
+        """Narrow the view to games with a ``playtime_forever`` below
+        ``minutes``.
+
+        Args:
+            minutes (int): The exclusive playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        playtimes = self._games.playtimes
+        return OwnedGamesView(
+            self._games,
+            array("q", (i for i in self._indices if playtimes[i] < minutes)),
+        )
+
+    def where_appid_in(self, appids: Container[int]) -> "OwnedGamesView":
+        """Narrow the view to games whose appid is in ``appids``.
+
+        Args:
+            appids (Container[int]): The appids to keep.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        game_appids = self._games.appids
+        return OwnedGamesView(
+            self._games,
+            array("q", (i for i in self._indices if game_appids[i] in appids)),
+        )
+
+    def where_playtime_at_least(self, minutes: int) -> "OwnedGamesView":
+        """Narrow the view to games with a ``playtime_forever`` of at least
+        ``minutes``.
+
+        Args:
+            minutes (int): The inclusive playtime threshold.
+
+        Returns:
+            OwnedGamesView: A view of the matching games.
+        """
+        playtimes = self._games.playtimes
+        return OwnedGamesView(
+            self._games,
+            array("q", (i for i in self._indices if playtimes[i] >= minutes)),
+        )
@@ -0,0 +1,318 @@
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Callable, Mapping
+from time import monotonic, perf_counter, time
+from metrics.registry import registry
+from yarl import URL
+import aiohttp
+import asyncio
+import math
+import random
+
+# Statuses worth retrying: throttling and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+request_seconds = registry.histogram(
+    "steam_request_seconds",
+    "Time from sending a Steam request to finishing with its response.",
+    ["endpoint"],
+)
+rate_limit_wait_seconds = registry.histogram(
+    "steam_rate_limit_wait_seconds",
+    "Time a Steam request waited for the rate limiter before being sent.",
+    ["endpoint"],
+)
+requests_total = registry.counter(
+    "steam_requests_total", "Steam requests sent, by response status.", ["endpoint", "status"]
+)
+retries_total = registry.counter(
+    "steam_request_retries_total", "Steam requests retried.", ["endpoint"]
+)
+response_bytes_total = registry.counter(
+    "steam_response_bytes_total", "Bytes of Steam response bodies read.", ["endpoint"]
+)
+
+
+class TokenBucket:
+    """A token bucket allowing ``burst`` requests at once and ``rate``
+    requests per second after that. It is implemented as a generic cell rate
+    algorithm, so every caller reserves its slot up front and waits without a
+    lock, in the order it arrived.
+
+    The rate adapts to throttling: a ``throttled`` call halves it, down to
+    ``min_rate``, and each ``succeeded`` call raises it by a small step, back
+    up to ``max_rate``. Sustained throughput settles just under the rate the
+    server allows. Requests in flight together are often throttled together,
+    so throttling while already paused only extends the pause.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        min_rate: float | None = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """Create a new TokenBucket.
+
+        Args:
+            rate (float): The maximum number of requests per second.
+            burst (float, optional): The number of requests allowed at once.
+            Defaults to 1.
+            min_rate (float | None, optional): The rate throttling can lower
+            the bucket to. Defaults to a twentieth of ``rate``.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.monotonic``.
+
+        Raises:
+            ValueError: Raised if ``rate`` is not positive or ``burst`` is less
+            than 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._max_rate = rate
+        self._min_rate = min_rate if min_rate is not None else rate / 20
+        self._burst = burst
+        self._clock = clock
+        self._next_ready = clock()
+        self._paused_until = 0.0
+        self._set_rate(rate)
+
+    @property
+    def rate(self) -> float:
+        """The current number of requests allowed per second."""
+        return self._rate
+
+    def reserve(self) -> float:
+        """Reserve the next slot.
+
+        Returns:
+            float: The number of seconds to wait before making the request.
+        """
+        now = self._clock()
+        next_ready = max(self._next_ready, now)
+        ready = max(next_ready - self._tolerance, self._paused_until, now)
+        self._next_ready = max(next_ready, ready) + self._interval
+        return ready - now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be made."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Slow down after the server throttled a request. Nothing is
+        granted for ``retry_after`` seconds, after which requests resume at
+        half the previous rate, without a burst. The rate is only halved once
+        per pause.
+
+        Args:
+            retry_after (float | None, optional): The number of seconds the
+            server asked to wait for. Defaults to None.
+        """
+        if self._clock() >= self._paused_until:
+            self._set_rate(max(self._rate / 2, self._min_rate))
+        if retry_after is not None and retry_after > 0:
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+        self._next_ready = max(
+            self._next_ready, self._paused_until + self._tolerance
+        )
+
+    def succeeded(self) -> None:
+        """Speed back up after a request was not throttled."""
+        if self._rate < self._max_rate:
+            self._set_rate(min(self._rate + self._max_rate / 50, self._max_rate))
+
+    def _set_rate(self, rate: float) -> None:
+        self._rate = rate
+        self._interval = 1 / rate
+        self._tolerance = (self._burst - 1) * self._interval
+
+
+class RateLimiter:
+    """Keeps a ``TokenBucket`` per host, so requests to one Steam host are not
+    slowed down by throttling on another.
+    """
+
+    def __init__(
+        self,
+        rates: Mapping[str, tuple[float, float]] | None = None,
+        default_rate: float = 10.0,
+        default_burst: float = 10.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """Create a new RateLimiter.
+
+        Args:
+            rates (Mapping[str, tuple[float, float]] | None, optional): The
+            ``(rate, burst)`` of specific hosts. Defaults to None.
+            default_rate (float, optional): The requests per second allowed to
+            any other host. Defaults to 10.
+            default_burst (float, optional): The requests allowed at once to
+            any other host. Defaults to 10.
+            clock (Callable[[], float], optional): The function used to get the
+            current time. Defaults to ``time.monotonic``.
+        """
+        self._rates = dict(rates or {})
+        self._default = (default_rate, default_burst)
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str | URL) -> TokenBucket:
+        """Get the bucket for the host of ``url``, creating it if needed.
+
+        Args:
+            url (str | URL): The URL being requested.
+
+        Returns:
+            TokenBucket: The host's bucket.
+        """
+        host = URL(url).host or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self._rates.get(host, self._default)
+            bucket = TokenBucket(rate, burst, clock=self._clock)
+            self._buckets[host] = bucket
+        return bucket
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Gets the rate limiter shared by every Steam request in the process.
+
+    Returns:
+        RateLimiter: The shared rate limiter.
+    """
+    return _default_rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter) -> RateLimiter:
+    """Replaces the rate limiter shared by every Steam request in the process.
+
+    Args:
+        limiter (RateLimiter): The new shared rate limiter.
+
+    Returns:
+        RateLimiter: The previous shared rate limiter.
+    """
+    global _default_rate_limiter
+    previous = _default_rate_limiter
+    _default_rate_limiter = limiter
+    return previous
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a ``Retry-After`` header, given either in seconds or as an HTTP
+    date.
+
+    Args:
+        value (str | None): The header value.
+
+    Returns:
+        float | None: The number of seconds to wait, or None if the header is
+        missing, malformed or not a finite number of seconds.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Picks an exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): The number of attempts made so far, from 1.
+        base_delay (float): The largest delay after the first attempt.
+        max_delay (float): The largest delay after any attempt.
+
+    Returns:
+        float: The number of seconds to wait.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+@asynccontextmanager
+async def rate_limited_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    limiter: RateLimiter | None = None,
+    max_attempts: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    endpoint: str = "other",
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Makes a GET request once the host's rate limit allows it, retrying
+    throttled and failed requests. A 429 slows down every request to the host,
+    honoring ``Retry-After`` up to ``max_delay``, while a 5xx only backs off
+    this request. Each attempt is recorded in the ``steam_*`` metrics under
+    ``endpoint``.
+
+    Args:
+        session (aiohttp.ClientSession): The session to make the request with.
+        url (str): The URL to request.
+        limiter (RateLimiter | None, optional): The rate limiter to use.
+        Defaults to the limiter shared by the process.
+        max_attempts (int, optional): The maximum number of attempts. Defaults
+        to 5.
+        base_delay (float, optional): The largest backoff after the first
+        failed attempt, in seconds. Defaults to 0.5.
+        max_delay (float, optional): The largest backoff after any failed
+        attempt, and the longest ``Retry-After`` honored, in seconds. Defaults
+        to 30.
+        endpoint (str, optional): The name the request is recorded under in
+        the metrics. Defaults to "other".
+
+    Raises:
+        aiohttp.ClientResponseError: Raised if the final response is not a
+        success status.
+
+    Yields:
+        aiohttp.ClientResponse: The successful response.
+    """
+    bucket = (limiter or _default_rate_limiter).bucket(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        waited_from = perf_counter()
+        await bucket.acquire()
+        started = perf_counter()
+        rate_limit_wait_seconds.observe(started - waited_from, endpoint=endpoint)
+        status = "error"
+        response: aiohttp.ClientResponse | None = None
+        try:
+            async with session.get(url, raise_for_status=False) as response:
+                status = str(response.status)
+                if response.status not in RETRY_STATUSES or attempt >= max_attempts:
+                    if response.status < 400:
+                        bucket.succeeded()
+                    response.raise_for_status()
+                    yield response
+                    return
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    retry_after = min(retry_after, max_delay)
+        finally:
+            request_seconds.observe(perf_counter() - started, endpoint=endpoint)
+            requests_total.inc(endpoint=endpoint, status=status)
+            if response is not None:
+                response_bytes_total.inc(response.content.total_bytes, endpoint=endpoint)
+        retries_total.inc(endpoint=endpoint)
+        delay = backoff_delay(attempt, base_delay, max_delay)
+        if response.status == 429:
+            bucket.throttled(retry_after if retry_after is not None else delay)
+        else:
+            await asyncio.sleep(delay if retry_after is None else retry_after)
@@ -0,0 +1,105 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+import aiohttp
+
+_current_session: ContextVar[aiohttp.ClientSession | None] = ContextVar(
+    "steam_session", default=None
+)
+
+
+def create_session(
+    limit: int = 100,
+    limit_per_host: int = 16,
+    keepalive_timeout: float = 30.0,
+    ttl_dns_cache: int = 300,
+) -> aiohttp.ClientSession:
+    """Creates a ``ClientSession`` with a connector tuned for making many
+    requests to the same handful of Steam hosts. Connections are kept alive and
+    reused between requests, and DNS lookups are cached.
+
+    Args:
+        limit (int, optional): Total number of simultaneous connections.
+        Defaults to 100.
+        limit_per_host (int, optional): Number of simultaneous connections to
+        a single host. Defaults to 16.
+        keepalive_timeout (float, optional): Seconds an idle connection is kept
+        open for reuse. Defaults to 30.0.
+        ttl_dns_cache (int, optional): Seconds a DNS lookup is cached for.
+        Defaults to 300.
+
+    Returns:
+        aiohttp.ClientSession: The new session. The caller is responsible for
+        closing it.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(connector=connector, raise_for_status=True)
+
+
+def get_shared_session() -> aiohttp.ClientSession | None:
+    """Gets the session made available by the innermost ``shared_session``
+    block, if any.
+
+    Returns:
+        aiohttp.ClientSession | None: The shared session, or ``None`` if not
+        inside a ``shared_session`` block.
+    """
+    return _current_session.get()
+
+
+@asynccontextmanager
+async def shared_session(
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Makes a single long-lived session available to every Steam request made
+    within the block, including requests made from tasks created inside it.
+
+    Args:
+        session (aiohttp.ClientSession | None, optional): The session to share.
+        If not provided, one is created with ``create_session`` and closed when
+        the block exits. Defaults to None.
+
+    Yields:
+        aiohttp.ClientSession: The shared session.
+    """
+    owns_session = session is None
+    if session is None:
+        session = create_session()
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        if owns_session:
+            await session.close()
+
+
+@asynccontextmanager
+async def session_scope(
+    session: aiohttp.ClientSession | None = None,
+) -> AsyncIterator[aiohttp.ClientSession]:
+    """Picks the session a request should be made with. An explicitly provided
+    session is used first, then the current shared session. If neither exists a
+    temporary session is created for the duration of the block, which matches
+    the behavior of a standalone call.
+
+    Args:
+        session (aiohttp.ClientSession | None, optional): An explicitly
+        provided session. Defaults to None.
+
+    Yields:
+        aiohttp.ClientSession: The session to make requests with.
+    """
+    if session is None:
+        session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession(raise_for_status=True) as temporary_session:
+        yield temporary_session
@@ -0,0 +1,49 @@
+import json
+import unittest
+from cache.codec import decode_value, encode_value
+from .cache_codecs import steam_record_codec, steam_zlib_codec
+
+app_hover = {
+    "strReleaseDate": "Nov 1, 2000",
+    "strDescription": "Play the world's number 1 online action game.",
+    "rgScreenshots": [
+        {
+            "appid": 10,
+            "id": 0,
+            "filename": "ss_6b0312cda02f5f777efa2f3318c307ff9acafbb5.1920x1080.jpg",
+            "all_ages": "1",
+        }
+    ],
+    "rgCategories": [{"strDisplayName": "Multi-player"}, {"strDisplayName": "Valve Anti-Cheat enabled"}],
+    "strGenres": "Action",
+    "strMicroTrailerURL": "",
+    "ReviewSummary": {
+        "strReviewSummary": "Overwhelmingly Positive",
+        "cReviews": 150000,
+        "cRecommendationsPositive": 145000,
+        "cRecommendationsNegative": 5000,
+        "nReviewScore": 9,
+    },
+}
+
+owned_games = json.dumps(
+    [[10 * i, i % 7 * 30, f"Game {i}"] for i in range(200)], separators=(",", ":")
+)
+
+
+class TestSteamCodecs(unittest.TestCase):
+    def test_round_trip(self):
+        for codec in (steam_zlib_codec, steam_record_codec):
+            for value in (json.dumps(app_hover), owned_games):
+                stored = encode_value(value, codec)
+                self.assertIsInstance(stored, bytes)
+                self.assertEqual(decode_value(stored), value)
+
+    def test_app_hover_is_compressed(self):
+        value = json.dumps(app_hover)
+        for codec in (steam_zlib_codec, steam_record_codec):
+            self.assertLess(len(encode_value(value, codec)), len(value) / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
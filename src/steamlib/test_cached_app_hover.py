@@ -0,0 +1,212 @@
+import unittest
+import asyncio
+import json
+from unittest.mock import patch
+from cache.async_cache import AsyncCacheAdapter
+from cache.dictionary_cache import DictionaryCache
+from cache.error import MissingCacheEntryError
+from .cached_app_hover import CachedAppHover, app_hover_cache_key
+from .error import InvalidResponseError
+from .test_get_app_hover import valid_response
+
+stale_response = {**valid_response, "strGenres": "Stale"}
+
+
+class FakeGetAppHover:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[int] = []
+        self.fail = fail
+
+    async def __call__(self, appid, session=None, fast_validation=False):
+        self.calls.append(appid)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise InvalidResponseError()
+        return valid_response
+
+
+def cache_with(entries: dict[int, tuple[dict, float]]) -> AsyncCacheAdapter:
+    return AsyncCacheAdapter(
+        DictionaryCache(
+            {
+                app_hover_cache_key(appid): {
+                    "value": json.dumps(response),
+                    "updated": updated,
+                }
+                for appid, (response, updated) in entries.items()
+            }
+        )
+    )
+
+
+class TestCachedAppHover(unittest.IsolatedAsyncioTestCase):
+    async def test_fresh_entry_served_without_request(self):
+        fake = FakeGetAppHover()
+        cached = CachedAppHover(
+            cache_with({1: (stale_response, 1000)}), fresh_for=60, clock=lambda: 1030
+        )
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            response = await cached.get(1)
+        self.assertEqual(response, stale_response)
+        self.assertEqual(fake.calls, [])
+
+    async def test_stale_entry_served_and_refreshed(self):
+        fake = FakeGetAppHover()
+        cache = cache_with({1: (stale_response, 1000)})
+        cached = CachedAppHover(cache, fresh_for=60, clock=lambda: 2000)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            response = await cached.get(1)
+            self.assertEqual(response, stale_response)
+            await cached.wait_for_refreshes()
+        self.assertEqual(fake.calls, [1])
+        cache_entry = await cache.get(app_hover_cache_key(1))
+        assert cache_entry is not None
+        self.assertEqual(json.loads(cache_entry["value"]), valid_response)
+
+    async def test_failed_refresh_keeps_stale_entry(self):
+        fake = FakeGetAppHover(fail=True)
+        cache = cache_with({1: (stale_response, 1000)})
+        cached = CachedAppHover(cache, fresh_for=60, clock=lambda: 2000)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            await cached.get(1)
+            await cached.wait_for_refreshes()
+        cache_entry = await cache.get(app_hover_cache_key(1))
+        assert cache_entry is not None
+        self.assertEqual(json.loads(cache_entry["value"]), stale_response)
+
+    async def test_too_stale_entry_blocks(self):
+        fake = FakeGetAppHover()
+        cached = CachedAppHover(
+            cache_with({1: (stale_response, 1000)}),
+            fresh_for=60,
+            max_stale=60,
+            clock=lambda: 2000,
+        )
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            response = await cached.get(1)
+        self.assertEqual(response, valid_response)
+
+    async def test_concurrent_misses_share_request(self):
+        fake = FakeGetAppHover()
+        cached = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            responses = await asyncio.gather(cached.get(1), cached.get(1))
+        self.assertEqual(responses, [valid_response, valid_response])
+        self.assertEqual(fake.calls, [1])
+
+    async def test_cancel_spares_shared_request(self):
+        released = asyncio.Event()
+
+        async def fake(appid, session=None, fast_validation=False):
+            await released.wait()
+            return valid_response
+
+        cache = AsyncCacheAdapter(DictionaryCache())
+        cached = CachedAppHover(cache)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            first = asyncio.create_task(cached.get(1))
+            second = asyncio.create_task(cached.get(1))
+            lone = asyncio.create_task(cached.get(2))
+            await asyncio.sleep(0)
+            first.cancel()
+            lone.cancel()
+            await asyncio.gather(first, lone, return_exceptions=True)
+            cached.cancel(1)
+            cached.cancel(2)
+            released.set()
+            self.assertEqual(await second, valid_response)
+            await cached.wait_for_refreshes()
+        self.assertIsNotNone(await cache.get(app_hover_cache_key(1)))
+        self.assertIsNone(await cache.get(app_hover_cache_key(2)))
+
+    async def test_miss_error(self):
+        fake = FakeGetAppHover(fail=True)
+        cached = CachedAppHover(AsyncCacheAdapter(DictionaryCache()))
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            with self.assertRaises(InvalidResponseError):
+                await cached.get(1)
+
+    async def test_get_many(self):
+        fake = FakeGetAppHover()
+        cache = cache_with({1: (stale_response, 1000)})
+        cached = CachedAppHover(cache, fresh_for=60, clock=lambda: 1000)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            results = {
+                appid: result async for appid, result in cached.get_many([1, 2, 2])
+            }
+        self.assertEqual(results, {1: stale_response, 2: valid_response})
+        self.assertEqual(fake.calls, [2])
+        self.assertIsNot(await cache.get(app_hover_cache_key(2)), None)
+
+    async def test_get_many_bounds_stale_refreshes(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake(appid, session=None, fast_validation=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return valid_response
+
+        cache = cache_with({appid: (stale_response, 1000) for appid in range(20)})
+        writes = []
+        set_many = cache.set_many
+
+        async def counting_set_many(items):
+            writes.append(len(items))
+            await set_many(items)
+
+        cache.set_many = counting_set_many
+        cached = CachedAppHover(cache, fresh_for=60, clock=lambda: 2000)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            results = [result async for result in cached.get_many(range(20), 4)]
+            self.assertEqual(len(results), 20)
+            await cached.wait_for_refreshes()
+        self.assertEqual(max_in_flight, 4)
+        self.assertEqual(sum(writes), 20)
+        self.assertLess(len(writes), 20)
+        cache_entry = await cache.get(app_hover_cache_key(19))
+        assert cache_entry is not None
+        self.assertEqual(json.loads(cache_entry["value"]), valid_response)
+
+    async def test_get_many_shares_requests_with_get(self):
+        fake = FakeGetAppHover()
+        cache = AsyncCacheAdapter(DictionaryCache())
+        cached = CachedAppHover(cache)
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+
+            async def get_many():
+                return [result async for result in cached.get_many([1, 2])]
+
+            many, single = await asyncio.gather(get_many(), cached.get(2))
+        self.assertEqual(single, valid_response)
+        self.assertEqual(dict(many), {1: valid_response, 2: valid_response})
+        self.assertEqual(sorted(fake.calls), [1, 2])
+        self.assertIsNotNone(await cache.get(app_hover_cache_key(2)))
+
+    async def test_offline(self):
+        fake = FakeGetAppHover()
+        cached = CachedAppHover(
+            cache_with({1: (stale_response, 1000)}),
+            fresh_for=60,
+            max_stale=60,
+            clock=lambda: 2000,
+            offline=True,
+        )
+        with patch("steamlib.cached_app_hover.get_app_hover", fake):
+            self.assertEqual(await cached.get(1), stale_response)
+            with self.assertRaises(MissingCacheEntryError):
+                await cached.get(2)
+            results = {
+                appid: result async for appid, result in cached.get_many([1, 2])
+            }
+            await cached.wait_for_refreshes()
+        self.assertEqual(results[1], stale_response)
+        self.assertIsInstance(results[2], MissingCacheEntryError)
+        self.assertEqual(fake.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,15 @@
 import unittest
+import asyncio
+from unittest.mock import patch
 from aioresponses import aioresponses
-from .get_app_hover import get_app_hover
+from .get_app_hover import (
+    get_app_hover,
+    get_app_hover_many,
+    is_app_hover_response,
+    validate_app_hover_response,
+)
+from jsonschema import ValidationError
+import copy
 import json
 from .error import InvalidResponseError
 
@@ -108,5 +117,141 @@ class TestGetAppHover(unittest.IsolatedAsyncioTestCase):
             await get_app_hover(test_appid)
 
 
+def with_change(path: list, value=None, delete: bool = False) -> dict:
+    response = copy.deepcopy(valid_response)
+    target = response
+    for key in path[:-1]:
+        target = target[key]
+    if delete:
+        del target[path[-1]]
+    else:
+        target[path[-1]] = value
+    return response
+
+
+valid_variants = [
+    valid_response,
+    with_change(["extra"], "ignored"),
+    with_change(["rgScreenshots"], []),
+    with_change(["rgCategories"], []),
+    with_change(["ReviewSummary", "extra"], 1.5),
+]
+
+invalid_variants = [
+    None,
+    [],
+    "string",
+    {},
+    with_change(["strReleaseDate"], delete=True),
+    with_change(["strDescription"], 1),
+    with_change(["strGenres"], None),
+    with_change(["strMicroTrailerURL"], delete=True),
+    with_change(["rgScreenshots"], {}),
+    with_change(["rgScreenshots", 0], "screenshot"),
+    with_change(["rgScreenshots", 0, "appid"], "221910"),
+    with_change(["rgScreenshots", 0, "id"], 1.0),
+    with_change(["rgScreenshots", 0, "id"], True),
+    with_change(["rgScreenshots", 0, "filename"], delete=True),
+    with_change(["rgScreenshots", 0, "all_ages"], 0),
+    with_change(["rgCategories"], None),
+    with_change(["rgCategories", 0], []),
+    with_change(["rgCategories", 0, "strDisplayName"], delete=True),
+    with_change(["ReviewSummary"], "Very Positive"),
+    with_change(["ReviewSummary", "strReviewSummary"], delete=True),
+    with_change(["ReviewSummary", "cReviews"], "39046"),
+    with_change(["ReviewSummary", "cRecommendationsPositive"], None),
+    with_change(["ReviewSummary", "cRecommendationsNegative"], 1.5),
+    with_change(["ReviewSummary", "nReviewScore"], False),
+]
+
+
+def schema_accepts(instance) -> bool:
+    try:
+        validate_app_hover_response(instance)
+    except ValidationError:
+        return False
+    return True
+
+
+class TestAppHoverValidation(unittest.TestCase):
+    def test_valid(self):
+        for instance in valid_variants:
+            with self.subTest(instance=instance):
+                self.assertTrue(schema_accepts(instance))
+                self.assertTrue(is_app_hover_response(instance))
+
+    def test_invalid(self):
+        for instance in invalid_variants:
+            with self.subTest(instance=instance):
+                self.assertFalse(schema_accepts(instance))
+                self.assertFalse(is_app_hover_response(instance))
+
+
+class TestGetAppHoverFastValidation(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_request(self, mocked):
+        test_appid = 12345
+        mocked.get(
+            f"https://store.steampowered.com/apphoverpublic/{test_appid}/?l=english&json=1",
+            status=200,
+            body=json.dumps(valid_response),
+        )
+        response = await get_app_hover(test_appid, fast_validation=True)
+        self.assertEqual(response, valid_response)
+
+    @aioresponses()
+    async def test_invalid_response(self, mocked):
+        test_appid = 12345
+        mocked.get(
+            f"https://store.steampowered.com/apphoverpublic/{test_appid}/?l=english&json=1",
+            status=200,
+            body=json.dumps({"error": "some error"}),
+        )
+        with self.assertRaises(InvalidResponseError):
+            await get_app_hover(test_appid, fast_validation=True)
+
+
+class TestGetAppHoverMany(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_partial_failure(self, mocked):
+        for appid, status in [(1, 200), (2, 404), (3, 200)]:
+            mocked.get(
+                f"https://store.steampowered.com/apphoverpublic/{appid}/?l=english&json=1",
+                status=status,
+                body=json.dumps(valid_response),
+            )
+        results = {
+            appid: result async for appid, result in get_app_hover_many([1, 2, 3])
+        }
+        self.assertEqual(results[1], valid_response)
+        self.assertIsInstance(results[2], InvalidResponseError)
+        self.assertEqual(results[3], valid_response)
+
+    async def test_concurrency_limit(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_get_app_hover(appid, session=None, fast_validation=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return valid_response
+
+        with patch("steamlib.get_app_hover.get_app_hover", fake_get_app_hover):
+            results = [
+                appid
+                async for appid, _ in get_app_hover_many(range(20), concurrency=3)
+            ]
+        self.assertEqual(sorted(results), list(range(20)))
+        self.assertEqual(max_in_flight, 3)
+
+    async def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            async for _ in get_app_hover_many([1], concurrency=0):
+                pass
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import aiohttp
+import json
+from aioresponses import aioresponses
+from unittest.mock import patch
+from .get_owned_games import (
+    OwnedGamesStreamDecoder,
+    get_owned_games,
+    iter_owned_games,
+    owned_games_url,
+)
+from .error import AuthFailedError
+
+test_steam_id_64 = "76561197960287930"
+test_api_key = "key"
+
+games = [
+    {
+        "appid": 10,
+        "name": "Counter-Strike",
+        "playtime_forever": 0,
+        "img_icon_url": "6b0312cda02f5f777efa2f3318c307ff9acafbb5",
+        "has_community_visible_stats": True,
+    },
+    {
+        "appid": 220,
+        "name": "Half-Life 2 — \"Games\": [ ]",
+        "playtime_forever": 125,
+        "img_icon_url": "fcfb366051782b8ebf2aa297f3b746395858cb62",
+    },
+    {
+        "appid": 620,
+        "name": "Portal 2",
+        "playtime_forever": 30,
+        "rtime_last_played": 0,
+    },
+]
+expected_games = [
+    {
+        "name": game["name"],
+        "playtime_forever": game["playtime_forever"],
+        "appid": game["appid"],
+    }
+    for game in games
+]
+response_body = json.dumps(
+    {"response": {"game_count": len(games), "games": games}}, ensure_ascii=False
+).encode("utf-8")
+
+
+class TestOwnedGamesStreamDecoder(unittest.TestCase):
+    def test_byte_at_a_time(self):
+        decoder = OwnedGamesStreamDecoder()
+        decoded = []
+        for i in range(len(response_body)):
+            decoded.extend(decoder.feed(response_body[i : i + 1]))
+        decoded.extend(decoder.close())
+        self.assertEqual(decoded, games)
+
+    def test_games_yielded_before_end(self):
+        decoder = OwnedGamesStreamDecoder()
+        end_of_first_game = response_body.index(b"}") + 1
+        self.assertEqual(decoder.feed(response_body[:end_of_first_game]), games[:1])
+
+    def test_no_games(self):
+        decoder = OwnedGamesStreamDecoder()
+        self.assertEqual(decoder.feed(b'{"response": {}}'), [])
+        self.assertEqual(decoder.close(), [])
+
+    def test_truncated(self):
+        decoder = OwnedGamesStreamDecoder()
+        decoder.feed(response_body[:-20])
+        self.assertRaises(ValueError, decoder.close)
+
+
+class TestGetOwnedGames(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_request(self, mocked):
+        mocked.get(
+            owned_games_url(test_steam_id_64, test_api_key),
+            status=200,
+            body=response_body,
+        )
+        owned_games = await get_owned_games(test_steam_id_64, test_api_key)
+        self.assertEqual(owned_games, expected_games)
+
+    @aioresponses()
+    async def test_stream(self, mocked):
+        mocked.get(
+            owned_games_url(test_steam_id_64, test_api_key),
+            status=200,
+            body=response_body,
+        )
+        owned_games = [
+            game
+            async for game in iter_owned_games(
+                test_steam_id_64, test_api_key, chunk_size=7
+            )
+        ]
+        self.assertEqual(owned_games, expected_games)
+
+    @aioresponses()
+    async def test_empty_response(self, mocked):
+        mocked.get(
+            owned_games_url(test_steam_id_64, test_api_key),
+            status=200,
+            body=json.dumps({"response": {}}),
+        )
+        self.assertEqual(await get_owned_games(test_steam_id_64, test_api_key), [])
+
+    @aioresponses()
+    async def test_auth_failed(self, mocked):
+        mocked.get(owned_games_url(test_steam_id_64, test_api_key), status=401)
+        with self.assertRaises(AuthFailedError):
+            await get_owned_games(test_steam_id_64, test_api_key)
+
+    @aioresponses()
+    async def test_retries_server_error(self, mocked):
+        url = owned_games_url(test_steam_id_64, test_api_key)
+        mocked.get(url, status=503)
+        mocked.get(url, status=200, body=response_body)
+        with patch("steamlib.rate_limit.backoff_delay", lambda *args: 0):
+            self.assertEqual(
+                await get_owned_games(test_steam_id_64, test_api_key), expected_games
+            )
+
+    @aioresponses()
+    async def test_server_error(self, mocked):
+        url = owned_games_url(test_steam_id_64, test_api_key)
+        for _ in range(5):
+            mocked.get(url, status=500)
+        with patch("steamlib.rate_limit.backoff_delay", lambda *args: 0):
+            with self.assertRaises(aiohttp.ClientResponseError):
+                await get_owned_games(test_steam_id_64, test_api_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from .get_owned_games import OwnedGame
+from .owned_games import OwnedGames
+
+games: list[OwnedGame] = [
+    {"name": "Counter-Strike", "playtime_forever": 0, "appid": 10},
+    {"name": "Half-Life 2", "playtime_forever": 125, "appid": 220},
+    {"name": "Portal 2", "playtime_forever": 30, "appid": 620},
+    {"name": "Dota 2", "playtime_forever": 60, "appid": 570},
+]
+
+
+class TestOwnedGames(unittest.TestCase):
+    def test_round_trip(self):
+        owned_games = OwnedGames(games)
+        self.assertEqual(len(owned_games), len(games))
+        self.assertEqual(list(owned_games), games)
+        self.assertEqual(owned_games[2], games[2])
+        self.assertEqual(owned_games[-1], games[-1])
+
+    def test_names_interned(self):
+        owned_games = OwnedGames(
+            [{"name": "".join(["Portal", " 2"]), "playtime_forever": 0, "appid": 620}]
+        )
+        other_owned_games = OwnedGames(
+            [{"name": "".join(["Portal ", "2"]), "playtime_forever": 0, "appid": 620}]
+        )
+        self.assertIs(owned_games.names[0], other_owned_games.names[0])
+
+    def test_where_playtime_below(self):
+        owned_games = OwnedGames(games)
+        view = owned_games.where_playtime_below(60)
+        self.assertEqual(list(view.indices), [0, 2])
+        self.assertEqual(list(view), [games[0], games[2]])
+        self.assertEqual(view[1], games[2])
+        self.assertEqual(list(view.where_playtime_below(10)), [games[0]])
+
+    def test_where_appid_in(self):
+        owned_games = OwnedGames(games)
+        self.assertEqual(
+            list(owned_games.where_appid_in({620, 10, 999})), [games[0], games[2]]
+        )
+        view = OwnedGames(games).where_playtime_below(200)
+        self.assertEqual(list(view.where_appid_in({220, 570, 999})), [games[1], games[3]])
+
+    def test_where_playtime_at_least(self):
+        owned_games = OwnedGames(games)
+        view = owned_games.where_playtime_at_least(60)
+        self.assertEqual(list(view), [games[1], games[3]])
+        self.assertEqual(list(view.where_playtime_at_least(100)), [games[1]])
+
+    def test_slices(self):
+        owned_games = OwnedGames(games)
+        self.assertEqual(list(owned_games[1:3]), games[1:3])
+        self.assertEqual(list(owned_games.where_playtime_below(60)[1:]), [games[2]])
+
+    def test_empty(self):
+        owned_games = OwnedGames()
+        self.assertEqual(len(owned_games.where_playtime_below(60)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
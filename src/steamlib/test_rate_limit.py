@@ -0,0 +1,152 @@
+import unittest
+import aiohttp
+from aioresponses import aioresponses
+from .rate_limit import (
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+    rate_limited_get,
+    requests_total,
+    response_bytes_total,
+    retries_total,
+)
+
+test_url = "https://store.steampowered.com/apphoverpublic/10/?l=english&json=1"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_throttled(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4, burst=4, clock=clock)
+        bucket.throttled(retry_after=5)
+        self.assertEqual(bucket.rate, 2)
+        self.assertAlmostEqual(bucket.reserve(), 5)
+        # No burst after a pause.
+        self.assertAlmostEqual(bucket.reserve(), 5.5)
+        for _ in range(100):
+            bucket.succeeded()
+        self.assertEqual(bucket.rate, 4)
+
+    def test_throttled_once_per_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=8, clock=clock)
+        for _ in range(3):
+            bucket.throttled(retry_after=5)
+        self.assertEqual(bucket.rate, 4)
+        clock.now += 5
+        bucket.throttled(retry_after=5)
+        self.assertEqual(bucket.rate, 2)
+
+    def test_min_rate(self):
+        bucket = TokenBucket(rate=4, min_rate=1, clock=FakeClock())
+        for _ in range(10):
+            bucket.throttled()
+        self.assertEqual(bucket.rate, 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_per_host(self):
+        limiter = RateLimiter({"store.steampowered.com": (1, 1)})
+        self.assertIs(limiter.bucket(test_url), limiter.bucket("https://store.steampowered.com/"))
+        self.assertIsNot(limiter.bucket(test_url), limiter.bucket("https://api.steampowered.com/"))
+        self.assertEqual(limiter.bucket(test_url).rate, 1)
+        self.assertEqual(limiter.bucket("https://api.steampowered.com/").rate, 10)
+
+
+class TestRetryHelpers(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+        for value in ("nan", "inf", "-Infinity"):
+            self.assertIsNone(parse_retry_after(value))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_backoff_delay(self):
+        for attempt in range(1, 10):
+            delay = backoff_delay(attempt, 0.5, 4)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(4, 0.5 * 2 ** (attempt - 1)))
+
+
+class TestRateLimitedGet(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_retries_throttled(self, mocked):
+        mocked.get(test_url, status=429, headers={"Retry-After": "0"})
+        mocked.get(test_url, status=503)
+        mocked.get(test_url, status=200, body="ok")
+        limiter = RateLimiter()
+        retries = retries_total.value(endpoint="test")
+        throttled = requests_total.value(endpoint="test", status="429")
+        response_bytes = response_bytes_total.value(endpoint="test")
+        async with aiohttp.ClientSession() as session:
+            async with rate_limited_get(
+                session, test_url, limiter, base_delay=0, endpoint="test"
+            ) as response:
+                self.assertEqual(await response.text(), "ok")
+        self.assertEqual(retries_total.value(endpoint="test") - retries, 2)
+        self.assertEqual(requests_total.value(endpoint="test", status="429") - throttled, 1)
+        self.assertEqual(response_bytes_total.value(endpoint="test") - response_bytes, 2)
+        self.assertEqual(limiter.bucket(test_url).rate, 5 + 10 / 50)
+
+    @aioresponses()
+    async def test_gives_up(self, mocked):
+        for _ in range(2):
+            mocked.get(test_url, status=500)
+        async with aiohttp.ClientSession() as session:
+            with self.assertRaises(aiohttp.ClientResponseError):
+                async with rate_limited_get(
+                    session, test_url, RateLimiter(), max_attempts=2, base_delay=0
+                ):
+                    pass
+
+    @aioresponses()
+    async def test_no_retry_on_client_error(self, mocked):
+        mocked.get(test_url, status=404)
+        mocked.get(test_url, status=200)
+        limiter = RateLimiter()
+        limiter.bucket(test_url).throttled()
+        async with aiohttp.ClientSession() as session:
+            with self.assertRaises(aiohttp.ClientResponseError):
+                async with rate_limited_get(session, test_url, limiter):
+                    pass
+        # Failures do not count as a success to speed back up on.
+        self.assertEqual(limiter.bucket(test_url).rate, 5)
+
+    @aioresponses()
+    async def test_retry_after_capped(self, mocked):
+        mocked.get(test_url, status=503, headers={"Retry-After": "3600"})
+        mocked.get(test_url, status=200)
+        async with aiohttp.ClientSession() as session:
+            async with rate_limited_get(
+                session, test_url, RateLimiter(), max_delay=0.01
+            ) as response:
+                self.assertEqual(response.status, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import json
+import aiohttp
+from aioresponses import aioresponses
+from .session import (
+    create_session,
+    get_shared_session,
+    session_scope,
+    shared_session,
+)
+from .get_app_hover import get_app_hover
+from .get_owned_games import get_owned_games
+from .error import AuthFailedError
+from .test_get_app_hover import valid_response
+
+
+class TestSessionScope(unittest.IsolatedAsyncioTestCase):
+    async def test_temporary_session(self):
+        async with session_scope() as session:
+            self.assertFalse(session.closed)
+        self.assertTrue(session.closed)
+
+    async def test_explicit_session(self):
+        explicit_session = create_session()
+        async with shared_session():
+            async with session_scope(explicit_session) as session:
+                self.assertIs(session, explicit_session)
+        self.assertFalse(explicit_session.closed)
+        await explicit_session.close()
+
+    async def test_shared_session(self):
+        async with shared_session() as shared:
+            self.assertIs(get_shared_session(), shared)
+            async with session_scope() as session:
+                self.assertIs(session, shared)
+            self.assertFalse(shared.closed)
+        self.assertTrue(shared.closed)
+        self.assertIs(get_shared_session(), None)
+
+    async def test_provided_shared_session_not_closed(self):
+        provided = create_session()
+        async with shared_session(provided) as shared:
+            self.assertIs(shared, provided)
+        self.assertFalse(provided.closed)
+        await provided.close()
+
+
+class TestSharedSessionRequests(unittest.IsolatedAsyncioTestCase):
+    @aioresponses()
+    async def test_get_app_hover_uses_shared_session(self, mocked):
+        test_appid = 12345
+        url = f"https://store.steampowered.com/apphoverpublic/{test_appid}/?l=english&json=1"
+        mocked.get(url, status=200, body=json.dumps(valid_response))
+        mocked.get(url, status=200, body=json.dumps(valid_response))
+        async with shared_session() as shared:
+            await get_app_hover(test_appid)
+            await get_app_hover(test_appid)
+            self.assertFalse(shared.closed)
+
+    @aioresponses()
+    async def test_plain_session_still_raises(self, mocked):
+        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/?key=key&steamid=76561197960287930&include_appinfo=1"
+        mocked.get(url, status=401, body="")
+        async with aiohttp.ClientSession() as session:
+            with self.assertRaises(AuthFailedError):
+                await get_owned_games("76561197960287930", "key", session=session)
+
+
+if __name__ == "__main__":
+    unittest.main()
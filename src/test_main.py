@@ -0,0 +1,126 @@
+from os import path
+import subprocess
+import sys
+import unittest
+
+src_path = path.dirname(path.abspath(__file__))
+
+# Cumulative microseconds ``import main`` may take, as reported by
+# ``-X importtime``. Loading the HTTP client alone takes several times this.
+import_time_budget = 150_000
+
+heavy_modules = ("aiohttp", "jsonschema", "defusedxml")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=src_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times(stderr: str) -> dict[str, int]:
+    """Parse ``-X importtime`` output into the cumulative microseconds of each
+    module."""
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_time_budget(self):
+        # The best of a few runs, so a busy machine does not fail the test.
+        best = min(
+            import_times(run_python("-X", "importtime", "-c", "import main").stderr)[
+                "main"
+            ]
+            for _ in range(3)
+        )
+        self.assertLess(best, import_time_budget)
+
+    def test_import_skips_heavy_modules(self):
+        result = run_python(
+            "-c",
+            "import main, sys; print(' '.join(sorted(sys.modules)))",
+        )
+        loaded = set(result.stdout.split())
+        for module in heavy_modules:
+            self.assertNotIn(module, loaded)
+
+    def test_steam_id_64_skips_heavy_modules(self):
+        result = run_python(
+            "-c",
+            "import asyncio, main, sys;"
+            " print(asyncio.run(main.SteamID('76561197960287930').to_steam_id_64()));"
+            " print(' '.join(sorted(sys.modules)))",
+        )
+        steam_id_64, modules = result.stdout.splitlines()
+        self.assertEqual(steam_id_64, "76561197960287930")
+        loaded = set(modules.split())
+        for module in heavy_modules:
+            self.assertNotIn(module, loaded)
+
+
+class TestArguments(unittest.TestCase):
+    def test_count_must_be_positive(self):
+        for count in ("0", "-1", "two"):
+            result = subprocess.run(
+                [sys.executable, "main.py", "76561197960287930", "-n", count],
+                cwd=src_path,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("argument --count/-n", result.stderr)
+
+
+    def test_concurrency_must_be_positive(self):
+        for args in (["76561197960287930"], ["prewarm", "76561197960287930"]):
+            result = subprocess.run(
+                [sys.executable, "main.py", *args, "--concurrency", "0"],
+                cwd=src_path,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("argument --concurrency", result.stderr)
+
+    def test_ranges_are_checked(self):
+        for args, argument in (
+            (["76561197960287930", "--max-playtime", "-1"], "--max-playtime"),
+            (["prewarm", "76561197960287930", "--max-playtime", "-1"], "--max-playtime"),
+            (["76561197960287930", "--min-score", "11"], "--min-score"),
+            (["--serve", "--cache-retention", "0"], "--cache-retention"),
+            (["--serve", "--cache-retention", "nan"], "--cache-retention"),
+        ):
+            result = subprocess.run(
+                [sys.executable, "main.py", *args],
+                cwd=src_path,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn(f"argument {argument}", result.stderr)
+
+    def test_count_rejected_with_batch(self):
+        result = subprocess.run(
+            [sys.executable, "main.py", "--batch", "-", "-n", "2", "--offline"],
+            cwd=src_path,
+            capture_output=True,
+            text=True,
+            input="",
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--count only works for a single SteamID", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()